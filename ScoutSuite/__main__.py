@@ -7,11 +7,17 @@ from ScoutSuite import ERRORS_LIST
 
 from concurrent.futures import ThreadPoolExecutor
 
+from ScoutSuite.core.checkpoint import FetchJournal, get_fetch_journal, set_fetch_journal
 from ScoutSuite.core.console import set_logger_configuration, print_info, print_exception
 from ScoutSuite.core.exceptions import RuleExceptions
 from ScoutSuite.core.processingengine import ProcessingEngine
+from ScoutSuite.core.profiler import RuleProfiler
+from ScoutSuite.core.ratelimiter import RateLimiter
+from ScoutSuite.core.recorder import ResponseStore, get_response_store, set_response_store
 from ScoutSuite.core.ruleset import Ruleset
+from ScoutSuite.core.scheduler import FetchScheduler
 from ScoutSuite.core.server import Server
+from ScoutSuite.core.telemetry import FetchTelemetry, set_fetch_telemetry
 from ScoutSuite.output.html import ScoutReport
 from ScoutSuite.output.utils import get_filename
 from ScoutSuite.providers import get_provider
@@ -29,6 +35,7 @@ def run(provider,
         aws_access_key_id=None,
         aws_secret_access_key=None,
         aws_session_token=None,
+        endpoints_cache_dir=None,
         # Azure
         user_account=False,
         user_account_browser=False,
@@ -59,9 +66,14 @@ def run(provider,
         result_format='json',
         database_name=None, host_ip='127.0.0.1', host_port=8000,
         max_workers=10,
+        rule_workers=1,
+        profile_rules=False,
+        profile_rules_table=False,
+        rule_cache_dir=None,
         regions=[],
         excluded_regions=[],
-        fetch_local=False, update=False,
+        fetch_local=False, update=False, checkpoint=False, resume=False,
+        record_dir=None, replay_dir=None,
         max_rate=None,
         ip_ranges=[], ip_ranges_name_key='name',
         ruleset='default.json', exceptions=None,
@@ -80,6 +92,8 @@ def run(provider,
         loop = asyncio.new_event_loop()
     # Set the throttler within the loop so it's accessible later on
     loop.throttler = Throttler(rate_limit=max_rate if max_rate else 999999, period=1)
+    loop.rate_limiter = RateLimiter(provider, max_rate)
+    loop.scheduler = FetchScheduler(provider, max_workers)
     loop.set_default_executor(ThreadPoolExecutor(max_workers=max_workers))
     result = loop.run_until_complete(_run(**locals()))  # pass through all the parameters
     loop.close()
@@ -92,6 +106,7 @@ async def _run(provider,
                aws_access_key_id,
                aws_secret_access_key,
                aws_session_token,
+               endpoints_cache_dir,
                # Azure
                cli, user_account, user_account_browser,
                msi, service_principal, file_auth,
@@ -131,6 +146,15 @@ async def _run(provider,
                log_file,
                no_browser,
                programmatic_execution,
+               max_workers=10,
+               rule_workers=1,
+               profile_rules=False,
+               profile_rules_table=False,
+               rule_cache_dir=None,
+               record_dir=None,
+               replay_dir=None,
+               checkpoint=False,
+               resume=False,
                **kwargs):
     """
     Run a scout job.
@@ -141,6 +165,18 @@ async def _run(provider,
 
     print_info('Launching Scout')
 
+    # Record or replay the API responses, including those of the authentication
+    if replay_dir:
+        set_response_store(ResponseStore(replay_dir, replay=True))
+    elif record_dir:
+        set_response_store(ResponseStore(record_dir))
+    else:
+        set_response_store(None)
+
+    # Record the API calls, to tell where the fetch time goes
+    telemetry = FetchTelemetry(provider)
+    set_fetch_telemetry(telemetry)
+
     print_info('Authenticating to cloud provider')
     auth_strategy = get_authentication_strategy(provider)
 
@@ -188,6 +224,7 @@ async def _run(provider,
         cloud_provider = get_provider(provider=provider,
                                       # AWS
                                       profile=profile,
+                                      endpoints_cache_dir=endpoints_cache_dir,
                                       # Azure
                                       subscription_ids=subscription_ids,
                                       all_subscriptions=all_subscriptions,
@@ -206,6 +243,7 @@ async def _run(provider,
                                       services=services,
                                       skipped_services=skipped_services,
                                       programmatic_execution=programmatic_execution,
+                                      max_workers=max_workers,
                                       credentials=credentials)
     except Exception as e:
         print_exception(f'Initialization failure: {e}')
@@ -238,10 +276,38 @@ async def _run(provider,
     # Complete run, including pulling data from provider
     if not fetch_local:
 
+        # Journal the fetched services and regions, so that an interrupted run can be resumed
+        if checkpoint or resume:
+            journal = FetchJournal(os.path.join(report.encoder.report_dir, 'scoutsuite-checkpoints',
+                                                report.encoder.report_name))
+            if not resume:
+                journal.clear()
+            set_fetch_journal(journal)
+        else:
+            set_fetch_journal(None)
+
+        # Start the services that took the longest in the previous run first
+        scheduler = getattr(asyncio.get_event_loop(), 'scheduler', None)
+        costs_path = os.path.join(report.encoder.report_dir, 'scoutsuite-costs', f'{report.encoder.report_name}.json')
+        if scheduler:
+            scheduler.load_costs(costs_path)
+
         # Fetch data from provider APIs
         try:
             print_info('Gathering data from APIs')
             await cloud_provider.fetch(regions=regions, excluded_regions=excluded_regions)
+            rate_limiter = getattr(asyncio.get_event_loop(), 'rate_limiter', None)
+            if rate_limiter:
+                rate_limiter.print_stats()
+            if get_response_store():
+                get_response_store().print_stats()
+            if get_fetch_journal():
+                get_fetch_journal().print_stats()
+            if scheduler:
+                scheduler.print_stats()
+                scheduler.save_costs(costs_path)
+            telemetry.print_stats()
+            telemetry.save(os.path.join(report.encoder.report_dir, 'scoutsuite-telemetry'), report.encoder.report_name)
         except KeyboardInterrupt:
             print_info('\nCancelled by user')
             return 130
@@ -290,13 +356,20 @@ async def _run(provider,
                                 environment_name=cloud_provider.environment,
                                 filename=ruleset,
                                 ip_ranges=ip_ranges,
-                                account_id=cloud_provider.account_id)
-        processing_engine = ProcessingEngine(finding_rules)
+                                account_id=cloud_provider.account_id,
+                                cache_dir=rule_cache_dir)
+        profiler = RuleProfiler() if profile_rules or profile_rules_table else None
+        processing_engine = ProcessingEngine(finding_rules, workers=rule_workers, profiler=profiler)
         processing_engine.run(cloud_provider)
     except Exception as e:
         print_exception('Failure while running rule engine: {}'.format(e))
         return 106
 
+    if profiler:
+        report.exceptions_encoder.save_to_file(profiler.get_profile(), 'PROFILE', force_write, debug=True)
+        if profile_rules_table:
+            profiler.print_table()
+
     # Create display filters
     try:
         print_info('Applying display filters')
@@ -304,7 +377,8 @@ async def _run(provider,
                                environment_name=cloud_provider.environment,
                                filename='filters.json',
                                rule_type='filters',
-                               account_id=cloud_provider.account_id)
+                               account_id=cloud_provider.account_id,
+                               cache_dir=rule_cache_dir)
         processing_engine = ProcessingEngine(filter_rules)
         processing_engine.run(cloud_provider)
     except Exception as e:
@@ -338,5 +412,10 @@ async def _run(provider,
         print_exception('Failure while running post-processing engine: {}'.format(e))
         return 108
 
+    # The run completed, so it will not be resumed
+    if get_fetch_journal():
+        get_fetch_journal().clear()
+        set_fetch_journal(None)
+
     # Return the cloud_provider object which contains all the findings.
     return cloud_provider
@@ -11,6 +11,7 @@ def run_from_api(provider, **kwargs):
 
     _run_defaults = {
         'profile': None, 'aws_access_key_id': None, 'aws_secret_access_key': None, 'aws_session_token': None,
+        'endpoints_cache_dir': None,
         'cli': False, 'user_account': False, 'user_account_browser': False, 'msi': False, 'service_principal': False, 'file_auth': None,
         'tenant_id': None, 'subscription_ids': None, 'all_subscriptions': None, 'client_id': None, 'client_secret': None,
         'username': None, 'password': None, 'service_account': None, 'project_id': None, 'folder_id': None,
@@ -20,7 +21,8 @@ def run_from_api(provider, **kwargs):
         'access_key': None, 'access_secret': None, 'report_name': None, 'report_dir': '/tmp', 'timestamp': False,
         'services': [], 'skipped_services': [], 'list_services': None, 'result_format': 'json', 'database_name': None,
         'host_ip': '127.0.0.1', 'host_port': 8000, 'regions': [], 'excluded_regions': [], 'fetch_local': False,
-        'update': False, 'max_rate': None, 'ip_ranges': [], 'ip_ranges_name_key': 'name', 'ruleset': 'default.json',
+        'update': False, 'max_rate': None, 'rule_workers': 1, 'profile_rules': False, 'profile_rules_table': False,
+        'rule_cache_dir': None, 'record_dir': None, 'checkpoint': False, 'resume': False, 'replay_dir': None, 'ip_ranges': [], 'ip_ranges_name_key': 'name', 'ruleset': 'default.json',
         'exceptions': None, 'force_write': False, 'debug': False, 'quiet': True, 'log_file': None,
         'no_browser': True, 'programmatic_execution': True,
     }
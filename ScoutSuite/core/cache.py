@@ -0,0 +1,57 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    Bounded cache of objects built from hashable keys, evicting the least recently used ones
+    """
+
+    def __init__(self, factory, maxsize=1024):
+        """
+        :param factory:                 Callable building the cached object from the key's items
+        :param maxsize:                 Maximum number of cached objects
+        """
+        self.factory = factory
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, *key):
+        """
+        Return the cached object for a key, building it on a miss
+
+        :param key:                     Items passed to the factory
+        :return:                        The cached object
+        """
+        with self._lock:
+            if key in self._values:
+                self.hits += 1
+                self._values.move_to_end(key)
+                return self._values[key]
+        # Build outside of the lock so that a slow factory does not serialize the other lookups
+        value = self.factory(*key)
+        with self._lock:
+            self.misses += 1
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self.maxsize:
+                self._values.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        :return:                        Dict of the cache's hits, misses, evictions and size
+        """
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                    'size': len(self._values), 'maxsize': self.maxsize}
@@ -0,0 +1,115 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+
+from ScoutSuite.core.console import error_scopes, print_debug
+from ScoutSuite.output.result_encoder import ScoutJsonEncoder
+
+fetch_journal = None
+
+
+class FetchJournal:
+    """
+    On-disk journal of the services, and of the regions of the services, whose resources were entirely fetched. A
+    resumed run restores them from the journal and only fetches the others. Resources fetched while errors were logged,
+    e.g. because the credentials expired, are not journaled so that they are fetched again.
+    """
+
+    def __init__(self, directory):
+        """
+        :param directory:               Directory of the journal
+        """
+        self.directory = directory
+        self.restored = 0
+        self.saved = 0
+        # Services journaled per region, whose regions need not be journaled again as a whole
+        self.regional_services = set()
+
+    async def fetch(self, resources, fetch, service, region=None):
+        """
+        Restore resources from the journal, or fetch them and journal them if no error was logged
+
+        :param resources:               Resources dictionary, updated with the restored resources
+        :param fetch:                   Coroutine function fetching the resources into the dictionary
+        :param service:                 Service of the resources
+        :param region:                  Region of the resources, None for all the regions
+        """
+        loop = asyncio.get_event_loop()
+        if region:
+            self.regional_services.add(service)
+        # Reading and writing large services would block the fetch of the others, so it is done in the executor
+        saved_resources = await loop.run_in_executor(None, self.load, service, region)
+        if saved_resources is not None:
+            resources.update(saved_resources)
+            return
+
+        errors = []
+        token = error_scopes.set(error_scopes.get() + (errors,))
+        try:
+            await fetch()
+        finally:
+            error_scopes.reset(token)
+        if not errors and (region or service not in self.regional_services):
+            await loop.run_in_executor(None, self.save, service, region, resources)
+
+    def load(self, service, region=None):
+        """
+        :param service:                 Service of the resources
+        :param region:                  Region of the resources, None for all the regions
+        :return:                        The journaled resources, or None if they were not entirely fetched
+        """
+        try:
+            with open(self._get_path(service, region)) as f:
+                resources = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print_debug(f'Failed to load the resources from {self._get_path(service, region)}: {e}')
+            return None
+        print_debug(f'Restored the {service} resources{f" of {region}" if region else ""} from {self.directory}')
+        self.restored += 1
+        return resources
+
+    def save(self, service, region, resources):
+        """
+        :param service:                 Service of the resources
+        :param region:                  Region of the resources, None for all the regions
+        :param resources:               Resources entirely fetched
+        """
+        try:
+            content = json.dumps(resources, cls=ScoutJsonEncoder)
+            path = self._get_path(service, region)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so that an interrupted run never leaves a partial file
+            with tempfile.NamedTemporaryFile('wt', dir=os.path.dirname(path), delete=False) as f:
+                f.write(content)
+            os.replace(f.name, path)
+        except Exception as e:
+            print_debug(f'Failed to save the resources to {self.directory}: {e}')
+            return
+        self.saved += 1
+
+    def clear(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def print_stats(self):
+        print_debug(f'Restored {self.restored} and journaled {self.saved} services and regions in {self.directory}')
+
+    def _get_path(self, service, region):
+        if region:
+            return os.path.join(self.directory, service, f'{region}.json')
+        return os.path.join(self.directory, f'{service}.json')
+
+
+def set_fetch_journal(journal):
+    """
+    :param journal:                     FetchJournal used while fetching the resources, None to not journal them
+    """
+    global fetch_journal
+    fetch_journal = journal
+
+
+def get_fetch_journal():
+    return fetch_journal
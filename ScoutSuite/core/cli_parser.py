@@ -91,6 +91,11 @@ class ScoutSuiteArgumentParser:
                                            dest='ip_ranges_name_key',
                                            default='name',
                                            help='Name of the key containing the display name of a known CIDR')
+        aws_additional_parser.add_argument('--endpoints-cache-dir',
+                                           dest='endpoints_cache_dir',
+                                           default=None,
+                                           help='Directory in which to cache the services and regions known to '
+                                                'botocore, reused by scans with the same botocore version')
 
     def _init_gcp_parser(self):
         parser = self.subparsers.add_parser("gcp",
@@ -328,6 +333,16 @@ class ScoutSuiteArgumentParser:
                             default=False,
                             action='store_true',
                             help='Use local data previously fetched and re-run the analysis.')
+        parser.add_argument('--record-responses',
+                            dest='record_dir',
+                            default=None,
+                            help='Directory in which to record the raw responses of the APIs, to be replayed by '
+                                 '--replay-responses')
+        parser.add_argument('--replay-responses',
+                            dest='replay_dir',
+                            default=None,
+                            help='Directory of the raw API responses recorded by --record-responses, served instead '
+                                 'of calling the APIs')
         parser.add_argument('--max-rate',
                             dest='max_rate',
                             type=int,
@@ -349,11 +364,18 @@ class ScoutSuiteArgumentParser:
                             action='store',
                             nargs='?',
                             help='Additional output to the specified file')
-        # parser.add_argument('--resume',
-        #                     dest='resume',
-        #                     default=False,
-        #                     action='store_true',
-        #                     help='Complete a partial (throttled) run')
+        parser.add_argument('--checkpoint',
+                            dest='checkpoint',
+                            default=False,
+                            action='store_true',
+                            help='Journal the services and regions as they are fetched, so that the run can be '
+                                 'resumed with --resume if interrupted')
+        parser.add_argument('--resume',
+                            dest='resume',
+                            default=False,
+                            action='store_true',
+                            help='Resume an interrupted run, only fetching the services and regions it did not '
+                                 'entirely fetch')
         parser.add_argument('--update',
                             dest='update',
                             default=False,
@@ -374,6 +396,27 @@ class ScoutSuiteArgumentParser:
                             type=int,
                             default=10,
                             help='Maximum number of threads (workers) used by Scout Suite (default is 10)')
+        parser.add_argument('--rule-workers',
+                            dest='rule_workers',
+                            type=int,
+                            default=1,
+                            help='Number of processes used to evaluate the rules (default is 1, only supported on '
+                                 'platforms where processes can be forked)')
+        parser.add_argument('--rule-cache-dir',
+                            dest='rule_cache_dir',
+                            default=None,
+                            help='Directory in which to cache the prepared rules, reused by scans with identical '
+                                 'rulesets, rule definitions, IP ranges and account ID')
+        parser.add_argument('--profile-rules',
+                            dest='profile_rules',
+                            default=False,
+                            action='store_true',
+                            help='Record the cost of each rule and save it next to the report')
+        parser.add_argument('--profile-rules-table',
+                            dest='profile_rules_table',
+                            default=False,
+                            action='store_true',
+                            help='Record the cost of each rule and print the rules sorted by time')
         parser.add_argument('--report-dir',
                             dest='report_dir',
                             default=None,
@@ -444,6 +487,8 @@ class ScoutSuiteArgumentParser:
 
         # Test conditions
         v = vars(args)
+        if v.get('record_dir') and v.get('replay_dir'):
+            self.parser.error('--record-responses and --replay-responses are mutually exclusive options')
         # AWS
         if v.get('provider') == 'aws':
             if v.get('aws_access_keys') and not (v.get('aws_access_key_id') or v.get('aws_secret_access_key')):
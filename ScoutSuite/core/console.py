@@ -1,3 +1,4 @@
+import contextvars
 import logging
 import platform
 import os
@@ -14,6 +15,10 @@ from ScoutSuite import ERRORS_LIST
 
 verbose_exceptions = False
 logger = logging.getLogger('scout')
+# Lists collecting the errors logged by the current task and by the tasks it creates afterwards
+error_scopes = contextvars.ContextVar('error_scopes', default=())
+# List collecting instead of logging the errors of a speculative evaluation, None when the errors are logged
+suppressed_errors = contextvars.ContextVar('suppressed_errors', default=None)
 
 
 def set_logger_configuration(is_debug=False, quiet=False, output_file_path=None):
@@ -70,6 +75,10 @@ def print_debug(msg):
 
 
 def print_error(msg):
+    suppressed = suppressed_errors.get()
+    if suppressed is not None:
+        suppressed.append(msg)
+        return
     logger.error(msg)
 
 
@@ -78,6 +87,10 @@ def print_warning(msg):
 
 
 def print_exception(exception, additional_details=None):
+    suppressed = suppressed_errors.get()
+    if suppressed is not None:
+        suppressed.append(exception)
+        return
     try:
         exc = True
         exc_type, exc_obj, exc_tb = sys.exc_info()
@@ -103,11 +116,14 @@ def print_exception(exception, additional_details=None):
     else:
         logger.error(str)
 
-    ERRORS_LIST.append({'file': file_name,
-                        'line': line_number,
-                        'exception': f'{exception}',
-                        'traceback': f'{traceback_exc}',
-                        'additional_details': additional_details})
+    error = {'file': file_name,
+             'line': line_number,
+             'exception': f'{exception}',
+             'traceback': f'{traceback_exc}',
+             'additional_details': additional_details}
+    ERRORS_LIST.append(error)
+    for errors in error_scopes.get():
+        errors.append(error)
 
 
 ########################################
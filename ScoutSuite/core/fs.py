@@ -1,7 +1,9 @@
+import copy
 import datetime
 import json
 import os
 
+from ScoutSuite.core.cache import LRUCache
 from ScoutSuite.core.console import print_exception, prompt_overwrite, print_info
 from ScoutSuite.core.conditions import pass_condition
 
@@ -27,22 +29,28 @@ def load_data(data_file, key_name=None, local_file=False):
     :param local_file:
     :return:
     """
-    if local_file:
-        if data_file.startswith('/'):
-            src_file = data_file
-        else:
-            src_dir = os.getcwd()
-            src_file = os.path.join(src_dir, data_file)
-    else:
-        src_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), '../data')
-        src_file = os.path.join(src_dir, data_file)
-    with open(src_file) as f:
+    with open(get_data_file_path(data_file, local_file)) as f:
         data = json.load(f)
     if key_name:
         data = data[key_name]
     return data
 
 
+def get_data_file_path(data_file, local_file=False):
+    """
+    Returns the path of a JSON data file, relative to the working directory or to Scout's data directory
+
+    :param data_file:
+    :param local_file:
+    :return:
+    """
+    if local_file:
+        if data_file.startswith('/'):
+            return data_file
+        return os.path.join(os.getcwd(), data_file)
+    return os.path.join(os.path.dirname(os.path.realpath(__file__)), '../data', data_file)
+
+
 def read_ip_ranges(filename, local_file=True, ip_only=False, conditions=None):
     """
     Returns the list of IP prefixes from an ip-ranges file
@@ -53,8 +61,15 @@ def read_ip_ranges(filename, local_file=True, ip_only=False, conditions=None):
     :param ip_only:
     :return:
     """
-    if not conditions:
-        conditions = []
+    if local_file:
+        filename = os.path.abspath(filename)
+    # Several rules read the same files, parse and filter them once
+    ip_ranges = ip_ranges_cache.get(filename, local_file, ip_only, json.dumps(conditions if conditions else []))
+    return copy.deepcopy(ip_ranges)
+
+
+def _read_ip_ranges(filename, local_file, ip_only, conditions):
+    conditions = json.loads(conditions)
 
     targets = []
     data = load_data(filename, local_file=local_file)
@@ -85,6 +100,9 @@ def read_ip_ranges(filename, local_file=True, ip_only=False, conditions=None):
         return targets
 
 
+ip_ranges_cache = LRUCache(_read_ip_ranges, maxsize=64)
+
+
 def save_blob_as_json(filename, blob, force_write):
     """
     Creates/Modifies file and saves python object as JSON
@@ -1,7 +1,16 @@
-from ScoutSuite.core.console import print_debug, print_exception
+import multiprocessing
+import time
+
+from ScoutSuite import ERRORS_LIST
+from ScoutSuite.core.conditions import compile_conditions
+from ScoutSuite.core.console import print_debug, print_exception, print_warning
 from ScoutSuite.utils import manage_dictionary
 
-from ScoutSuite.core.utils import recurse
+from ScoutSuite.core.utils import build_rule_tree, recurse_rule_tree
+
+# Services and rule groups inherited by the forked rule workers, which read them from copy-on-write memory instead of
+# receiving a pickled copy
+_worker_state = None
 
 
 class ProcessingEngine:
@@ -9,9 +18,11 @@ class ProcessingEngine:
 
     """
 
-    def __init__(self, ruleset):
+    def __init__(self, ruleset, workers=1, profiler=None):
         # Organize rules by path
         self.ruleset = ruleset
+        self.workers = workers
+        self.profiler = profiler
         self.rules = {}
         for filename in self.ruleset.rules:
             for rule in self.ruleset.rules[filename]:
@@ -22,15 +33,39 @@ class ProcessingEngine:
                     self.rules[rule.path].append(rule)
                 except Exception as e:
                     print_exception(f'Failed to create rule {rule.filename}: {e}')
+                    continue
+                # Compile the conditions once, rules that fail to compile are interpreted at evaluation time
+                if self.profiler:
+                    rule.profile_stats = self.profiler.new_stats()
+                try:
+                    rule.compiled_conditions = compile_conditions(rule.conditions,
+                                                                  stats=getattr(rule, 'profile_stats', None))
+                except Exception as e:
+                    print_debug(f'Failed to compile conditions of rule {rule.filename}: {e}')
+                if self.profiler:
+                    self.profiler.instrument(rule)
 
     def run(self, cloud_provider, skip_dashboard=False):
         # Clean up existing findings
         for service in cloud_provider.services:
             cloud_provider.services[service][self.ruleset.rule_type] = {}
 
+        # Test all the rules
+        start = time.perf_counter()
+        rules = self._filter_rules(self.rules, cloud_provider.service_list)
+        rule_groups = [[rule for rule in rules[finding_path] if rule.enabled] for finding_path in rules]
+        if self.workers > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            results = self._evaluate_rules_in_workers(cloud_provider.services, rule_groups)
+        else:
+            if self.workers > 1:
+                print_warning('Parallel rule evaluation requires the fork start method, using a single process')
+            results = _evaluate_rules(cloud_provider.services, [rule for group in rule_groups for rule in group])
+        if self.profiler:
+            self.profiler.total_time += time.perf_counter() - start
+
         # Process each rule
-        for finding_path in self._filter_rules(self.rules, cloud_provider.service_list):
-            for rule in self.rules[finding_path]:
+        for finding_path in rules:
+            for rule in rules[finding_path]:
 
                 if not rule.enabled:  # or rule.service not in []: # TODO: handle this...
                     continue
@@ -47,9 +82,11 @@ class ProcessingEngine:
                     if hasattr(rule, attr):
                         cloud_provider.services[service][self.ruleset.rule_type][rule.key][attr] = getattr(rule, attr)
                 try:
-                    setattr(rule, 'checked_items', 0)
-                    cloud_provider.services[service][self.ruleset.rule_type][rule.key]['items'] = recurse(
-                        cloud_provider.services, cloud_provider.services, path, [], rule, True)
+                    if isinstance(results[rule], Exception):
+                        raise results[rule]
+                    cloud_provider.services[service][self.ruleset.rule_type][rule.key]['items'] = results[rule]
+                    if self.profiler:
+                        rule.profile_stats['flagged_items'] = len(results[rule])
                     if skip_dashboard:
                         continue
                     cloud_provider.services[service][self.ruleset.rule_type][rule.key]['dashboard_name'] = \
@@ -73,6 +110,67 @@ class ProcessingEngine:
                     cloud_provider.services[service][self.ruleset.rule_type][rule.key]['checked_items'] = 0
                     cloud_provider.services[service][self.ruleset.rule_type][rule.key]['flagged_items'] = 0
 
+    def _evaluate_rules_in_workers(self, services, rule_groups):
+        """
+        Test the rules across a pool of forked workers, each one walking the resources for a group of rules sharing the
+        same path. Results are merged in the order of the groups.
+        """
+        global _worker_state
+        print_debug(f'Evaluating {len(rule_groups)} rule groups with {self.workers} workers')
+        results = {}
+        _worker_state = (services, rule_groups)
+        try:
+            with multiprocessing.get_context('fork').Pool(min(self.workers, max(len(rule_groups), 1))) as pool:
+                for rule_group, (group_results, errors) in zip(rule_groups,
+                                                               pool.imap(_evaluate_rule_group, range(len(rule_groups)))):
+                    ERRORS_LIST.extend(errors)
+                    for rule, (items, checked_items, error, profile_stats) in zip(rule_group, group_results):
+                        setattr(rule, 'checked_items', checked_items)
+                        if profile_stats:
+                            rule.profile_stats.update(profile_stats)
+                        results[rule] = Exception(error) if error is not None else items
+        finally:
+            _worker_state = None
+        return results
+
     @staticmethod
     def _filter_rules(rules, services):
         return {rule_name: rule for rule_name, rule in rules.items() if rule_name.split('.')[0] in services}
+
+
+def _evaluate_rules(services, rules):
+    """
+    Test rules in a single walk of the resources.
+
+    :param services:        All of the services' data
+    :param rules:           The rules to test
+    :return:                Dict of rule to flagged items, or to the exception raised while testing the rule
+    """
+    results = {}
+    for rule in rules:
+        setattr(rule, 'checked_items', 0)
+        results[rule] = []
+    recurse_rule_tree(services, services, build_rule_tree(results), [], results, True)
+    return results
+
+
+def _evaluate_rule_group(index):
+    """
+    Test a group of rules in a forked worker.
+
+    :param index:           Index of the group in the rule groups shared with the worker
+    :return:                The (items, checked_items, error, profile_stats) of each rule, and the errors logged by the
+                            worker
+    """
+    services, rule_groups = _worker_state
+    rules = rule_groups[index]
+    errors_count = len(ERRORS_LIST)
+    results = _evaluate_rules(services, rules)
+    group_results = []
+    for rule in rules:
+        profile_stats = getattr(rule, 'profile_stats', None)
+        if isinstance(results[rule], Exception):
+            group_results.append((None, rule.checked_items, str(results[rule]), profile_stats))
+        else:
+            group_results.append((results[rule], rule.checked_items, None, profile_stats))
+    return group_results, ERRORS_LIST[errors_count:]
@@ -0,0 +1,85 @@
+import copy
+import time
+
+from ScoutSuite.core.conditions import action_cache, pass_conditions, regex_cache, statement_actions_cache, \
+    subnet_index_cache
+from ScoutSuite.core.console import print_info
+
+
+class RuleProfiler:
+    """
+    Records the cost of each rule tested by the processing engine
+    """
+
+    def __init__(self):
+        self.rules = []
+        self.total_time = 0.0
+
+    @staticmethod
+    def new_stats():
+        return {'time': 0.0, 'condition_evaluations': 0, 'get_value_at_lookups': 0, 'flagged_items': 0}
+
+    def instrument(self, rule):
+        """
+        Time the evaluations of a rule's conditions, interpreting them when they could not be compiled
+
+        :param rule:                    Rule whose conditions are compiled with the stats returned by new_stats
+        """
+        stats = rule.profile_stats
+        predicate = getattr(rule, 'compiled_conditions', None)
+        if not predicate:
+            def predicate(all_info, current_path):
+                return pass_conditions(all_info, current_path, copy.deepcopy(rule.conditions))
+
+        def timed_predicate(all_info, current_path):
+            start = time.perf_counter()
+            try:
+                return predicate(all_info, current_path)
+            finally:
+                stats['time'] += time.perf_counter() - start
+        rule.compiled_conditions = timed_predicate
+        self.rules.append(rule)
+
+    def get_profile(self):
+        """
+        :return:                        Dict of the rules' costs, sorted by decreasing time, and of the caches' stats
+        """
+        rules = []
+        for rule in self.rules:
+            checked_items = getattr(rule, 'checked_items', 0)
+            flagged_items = rule.profile_stats['flagged_items']
+            rules.append({
+                'filename': rule.filename,
+                'key': rule.key,
+                'path': rule.path,
+                'time': rule.profile_stats['time'],
+                'checked_items': checked_items,
+                'condition_evaluations': rule.profile_stats['condition_evaluations'],
+                'get_value_at_lookups': rule.profile_stats['get_value_at_lookups'],
+                'flagged_items': flagged_items,
+                'flagged_ratio': flagged_items / checked_items if checked_items else 0.0
+            })
+        rules.sort(key=lambda r: r['time'], reverse=True)
+        return {
+            'total_time': self.total_time,
+            'rules': rules,
+            'caches': {
+                'regex': regex_cache.stats(),
+                'subnet_index': subnet_index_cache.stats(),
+                'action': action_cache.stats(),
+                'statement_actions': statement_actions_cache.stats()
+            }
+        }
+
+    def print_table(self, limit=None):
+        """
+        Print the rules' costs, most expensive first
+
+        :param limit:                   Maximum number of rules to print
+        """
+        profile = self.get_profile()
+        print_info(f'Rule engine ran in {profile["total_time"]:.3f}s')
+        print_info(f'{"Time (s)":>10} {"Checked":>10} {"Evaluated":>10} {"Lookups":>10} {"Flagged":>8}  Rule')
+        for rule in profile['rules'][:limit]:
+            print_info(f'{rule["time"]:>10.3f} {rule["checked_items"]:>10} {rule["condition_evaluations"]:>10} '
+                       f'{rule["get_value_at_lookups"]:>10} {rule["flagged_ratio"]:>8.1%}  {rule["key"]}')
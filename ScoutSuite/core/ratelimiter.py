@@ -0,0 +1,137 @@
+import asyncio
+import contextvars
+import time
+from collections import deque
+
+from ScoutSuite.core.console import print_debug
+
+# Service and region whose resources are fetched by the current task, inherited by the tasks it creates
+rate_limit_scope = contextvars.ContextVar('rate_limit_scope', default=(None, None))
+
+
+def set_rate_limit_scope(service=None, region=None):
+    """
+    Scope the API calls of the current task, and of the tasks it creates afterwards, to a service and/or a region
+
+    :param service:                 Service fetched, None to keep the current one
+    :param region:                  Region fetched, None to keep the current one
+    :return:                        Token restoring the previous scope when passed to rate_limit_scope.reset
+    """
+    current_service, current_region = rate_limit_scope.get()
+    return rate_limit_scope.set((service or current_service, region or current_region))
+
+
+class TokenBucket:
+    """
+    Token bucket whose rate is adjusted by additive increase, multiplicative decrease (AIMD): the rate is halved when
+    the API throttles the calls and grows by about one call per second every second of successful calls
+    """
+
+    def __init__(self, rate=None, max_rate=None, min_rate=0.5):
+        """
+        :param rate:                    Initial number of calls per second, None for no limit until throttled
+        :param max_rate:                Maximum number of calls per second, None for no maximum
+        :param min_rate:                Minimum number of calls per second
+        """
+        self.rate = rate
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        # Start times of the calls of the last second, which set the rate when first throttled
+        self.recent_calls = deque()
+        self.calls = 0
+        self.throttles = 0
+        self.wait_time = 0.0
+        self.lowest_rate = rate
+
+    async def acquire(self):
+        """
+        Wait for a token then consume it
+        """
+        while self.rate is not None:
+            now = time.monotonic()
+            # The bucket holds at most a second worth of tokens
+            self.tokens = min(max(self.rate, 1.0), self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                break
+            delay = (1.0 - self.tokens) / self.rate
+            self.wait_time += delay
+            await asyncio.sleep(delay)
+
+        now = time.monotonic()
+        self.calls += 1
+        self.recent_calls.append(now)
+        while self.recent_calls[0] < now - 1.0:
+            self.recent_calls.popleft()
+
+    def on_success(self):
+        if self.rate is not None:
+            self.rate += 1.0 / self.rate
+            if self.max_rate:
+                self.rate = min(self.rate, self.max_rate)
+
+    def on_throttle(self):
+        self.throttles += 1
+        if self.rate is None:
+            self.rate = len(self.recent_calls) / 2
+            self.tokens = 0.0
+            self.updated = time.monotonic()
+        else:
+            self.rate /= 2
+        self.rate = max(self.rate, self.min_rate)
+        self.tokens = min(self.tokens, self.rate)
+        self.lowest_rate = min(self.lowest_rate, self.rate) if self.lowest_rate is not None else self.rate
+
+
+class RateLimiter:
+    """
+    Token buckets of each (provider, service, region), so that a throttled API does not slow down the others
+    """
+
+    def __init__(self, provider, max_rate=None):
+        """
+        :param provider:                Provider code, e.g. aws
+        :param max_rate:                Maximum number of calls per second of each bucket, None for no maximum
+        """
+        self.provider = provider
+        self.max_rate = max_rate
+        # Only accessed from the event loop's thread, so no lock is needed
+        self.buckets = {}
+
+    def get_bucket(self):
+        """
+        :return:                        Token bucket of the current task's scope
+        """
+        key = (self.provider, *rate_limit_scope.get())
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = TokenBucket(rate=self.max_rate, max_rate=self.max_rate)
+        return bucket
+
+    def get_stats(self):
+        """
+        :return:                        List of the buckets' calls, throttles, waiting time and rates
+        """
+        return [{'provider': provider,
+                 'service': service,
+                 'region': region,
+                 'calls': bucket.calls,
+                 'throttles': bucket.throttles,
+                 'wait_time': bucket.wait_time,
+                 'rate': bucket.rate,
+                 'lowest_rate': bucket.lowest_rate}
+                for (provider, service, region), bucket in self.buckets.items()]
+
+    def print_stats(self):
+        stats = self.get_stats()
+        print_debug(f'Made {sum(s["calls"] for s in stats)} API calls through {len(stats)} rate limits, '
+                    f'throttled {sum(s["throttles"] for s in stats)} times')
+        for s in sorted(stats, key=lambda s: s['throttles'], reverse=True):
+            if not s['throttles']:
+                break
+            print_debug(f'Throttled {s["throttles"]} times out of {s["calls"]} calls for the {s["service"]} service '
+                        f'in {s["region"] or "all regions"}, waited {s["wait_time"]:.1f}s, rate went down to '
+                        f'{s["lowest_rate"]:.1f}/s and ended at {s["rate"]:.1f}/s')
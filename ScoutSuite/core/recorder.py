@@ -0,0 +1,119 @@
+import base64
+import datetime
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from ScoutSuite.core.console import print_debug
+
+response_store = None
+
+
+class ResponseStore:
+    """
+    Compressed on-disk store of raw API responses, addressed by a hash of the request that returned them. In record
+    mode, the responses are saved as they are received. In replay mode, the saved responses are served instead of
+    calling the APIs, which are only called for the requests that were not recorded.
+    """
+
+    def __init__(self, directory, replay=False):
+        """
+        :param directory:               Directory of the store
+        :param replay:                  Whether to serve the saved responses rather than save them
+        """
+        self.directory = directory
+        self.replay = replay
+        self.hits = 0
+        self.misses = 0
+        self.saved = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_key(*request):
+        """
+        :param request:                 JSON serializable items identifying a request, e.g. service, region and
+                                        parameters
+        :return:                        Hex digest identifying the request
+        """
+        serialized_request = json.dumps(request, sort_keys=True, default=str)
+        return hashlib.sha256(serialized_request.encode()).hexdigest()
+
+    def load(self, key):
+        """
+        :param key:                     Key returned by get_key
+        :return:                        The saved response, or None if the request was not recorded
+        """
+        try:
+            with gzip.open(self._get_path(key), 'rt') as f:
+                response = json.load(f, object_hook=_decode_response)
+        except FileNotFoundError:
+            response = None
+        except Exception as e:
+            print_debug(f'Failed to load the response from {self._get_path(key)}: {e}')
+            response = None
+        with self._lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return response
+
+    def save(self, key, response):
+        """
+        :param key:                     Key returned by get_key
+        :param response:                Response, made of JSON serializable values, dates and bytes
+        """
+        try:
+            content = json.dumps(response, cls=_ResponseEncoder)
+            path = self._get_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so that a replay never reads a partial file
+            with tempfile.NamedTemporaryFile('wb', dir=os.path.dirname(path), delete=False) as f:
+                f.write(gzip.compress(content.encode()))
+            os.replace(f.name, path)
+        except Exception as e:
+            print_debug(f'Failed to save the response to {self.directory}: {e}')
+            return
+        with self._lock:
+            self.saved += 1
+
+    def print_stats(self):
+        if self.replay:
+            print_debug(f'Replayed {self.hits} API responses from {self.directory}, {self.misses} were not recorded')
+        else:
+            print_debug(f'Recorded {self.saved} API responses to {self.directory}')
+
+    def _get_path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}.json.gz')
+
+
+def set_response_store(store):
+    """
+    :param store:                       ResponseStore used by the facades, None to call the APIs
+    """
+    global response_store
+    response_store = store
+
+
+def get_response_store():
+    return response_store
+
+
+class _ResponseEncoder(json.JSONEncoder):
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return {'__datetime__': o.isoformat()}
+        if isinstance(o, bytes):
+            return {'__bytes__': base64.b64encode(o).decode()}
+        return super().default(o)
+
+
+def _decode_response(o):
+    if '__datetime__' in o:
+        return datetime.datetime.fromisoformat(o['__datetime__'])
+    if '__bytes__' in o:
+        return base64.b64decode(o['__bytes__'])
+    return o
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+
+from ScoutSuite import __version__
+from ScoutSuite.core.console import print_debug
+from ScoutSuite.core.fs import get_data_file_path
+
+re_include = re.compile(r'_INCLUDE_\((.*?)\)')
+re_ip_ranges = re.compile(r'_IP_RANGES_FROM_(LOCAL_)?FILE_\((.*?),')
+ip_ranges_from_args = 'ip-ranges-from-args'
+
+
+class RuleCache:
+    """
+    On-disk cache of prepared rules, keyed by a hash of the content of everything the preparation reads: the rules
+    listed in the ruleset, their definitions, the included conditions, the IP ranges files and the parameters
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+
+    def get_key(self, ruleset, attributes, ip_ranges, params):
+        """
+        :param ruleset:                 Ruleset whose rules and rule definitions are loaded but not prepared
+        :param attributes:              Attributes set by the preparation
+        :param ip_ranges:               IP ranges files passed as arguments
+        :param params:                  Special values (account ID, ...)
+        :return:                        Hex digest identifying the prepared rules
+        """
+        definitions = {filename: getattr(definition, 'string_definition', None)
+                       for filename, definition in ruleset.rule_definitions.items()}
+        rules = [[filename, [vars(rule) for rule in rules]] for filename, rules in ruleset.rules.items()]
+        inputs = {
+            'version': __version__,
+            'rule_type': ruleset.rule_type,
+            'definitions': definitions,
+            'rules': rules,
+            'attributes': attributes,
+            'ip_ranges': ip_ranges,
+            'params': params
+        }
+        serialized_inputs = json.dumps(inputs, sort_keys=True, default=str)
+
+        # Included conditions may themselves read IP ranges
+        files = {}
+        texts = [serialized_inputs]
+        for include in sorted(set(re_include.findall(serialized_inputs))):
+            path = f'{ruleset.rules_data_path}/{include}'
+            content = self._read(path)
+            files[path] = self._digest(content)
+            if content:
+                texts.append(content.decode(errors='replace'))
+        for text in texts:
+            for local, filename in re_ip_ranges.findall(text):
+                if filename == ip_ranges_from_args:
+                    for ip_ranges_filename in ip_ranges:
+                        self._add_ip_ranges_digests(files, ip_ranges_filename, True)
+                else:
+                    self._add_ip_ranges_digests(files, filename, bool(local))
+
+        return hashlib.sha256(json.dumps([serialized_inputs, files], sort_keys=True).encode()).hexdigest()
+
+    def load(self, key):
+        """
+        :param key:                     Key returned by get_key
+        :return:                        List of (rule filename, list of rule attributes), or None on a miss
+        """
+        try:
+            with open(self._get_path(key)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print_debug(f'Failed to load prepared rules from {self._get_path(key)}: {e}')
+            return None
+
+    def save(self, key, rules):
+        """
+        :param key:                     Key returned by get_key
+        :param rules:                   List of (rule filename, list of rule attributes)
+        """
+        try:
+            content = json.dumps(rules)
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write then rename so that concurrent scans never read a partial file
+            with tempfile.NamedTemporaryFile('wt', dir=self.cache_dir, delete=False) as f:
+                f.write(content)
+            os.replace(f.name, self._get_path(key))
+        except Exception as e:
+            print_debug(f'Failed to save prepared rules to {self.cache_dir}: {e}')
+
+    def _get_path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.json')
+
+    def _add_ip_ranges_digests(self, files, filename, local_file):
+        path = get_data_file_path(filename.strip(), local_file)
+        if path in files:
+            return
+        content = self._read(path)
+        files[path] = self._digest(content)
+        # Filtered IP ranges read their prefixes from another file
+        try:
+            data = json.loads(content) if content else {}
+        except ValueError:
+            return
+        if isinstance(data, dict) and 'source' in data:
+            self._add_ip_ranges_digests(files, data['source'], data.get('local_file', False))
+
+    @staticmethod
+    def _read(path):
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def _digest(content):
+        return hashlib.sha256(content).hexdigest() if content is not None else None
@@ -2,9 +2,11 @@ import json
 import os
 import tempfile
 
+from ScoutSuite import ERRORS_LIST
 from ScoutSuite.core.console import print_debug, print_error, prompt_yes_no, print_exception
 
 from ScoutSuite.core.rule import Rule
+from ScoutSuite.core.rule_cache import RuleCache
 from ScoutSuite.core.rule_definition import RuleDefinition
 
 aws_ip_ranges_filename = 'ip-ranges.json'
@@ -29,7 +31,8 @@ class Ruleset:
                  rule_type='findings',
                  ip_ranges=None,
                  account_id=None,
-                 ruleset_generator=False):
+                 ruleset_generator=False,
+                 cache_dir=None):
         rules_dir = [] if rules_dir is None else rules_dir
         ip_ranges = [] if ip_ranges is None else ip_ranges
 
@@ -44,6 +47,7 @@ class Ruleset:
             self.search_ruleset(environment_name)
         print_debug('Loading ruleset %s' % self.filename)
         self.name = os.path.basename(self.filename).replace('.json', '') if not name else name
+        self.cache = RuleCache(cache_dir) if cache_dir else None
         self.load(self.rule_type)
         self.shared_init(ruleset_generator, rules_dir, account_id, ip_ranges)
 
@@ -61,7 +65,7 @@ class Ruleset:
         if ruleset_generator:
             self.prepare_rules(attributes=['description', 'key', 'rationale'], params=params)
         else:
-            self.prepare_rules(ip_ranges=ip_ranges, params=params)
+            self.prepare_rules(ip_ranges=ip_ranges, params=params, cache=getattr(self, 'cache', None))
 
     def load(self, rule_type, quiet=False):
         """
@@ -114,15 +118,37 @@ class Ruleset:
         else:
             self.rules[filename].append(Rule(self.rules_data_path, filename, rule_type, rule))
 
-    def prepare_rules(self, attributes=None, ip_ranges=None, params=None):
+    def prepare_rules(self, attributes=None, ip_ranges=None, params=None, cache=None):
         """
         Update the ruleset's rules by duplicating fields as required by the HTML ruleset generator
 
+        :param cache:               RuleCache from which to load the prepared rules, and in which to save them
         :return:
         """
         attributes = [] if attributes is None else attributes
         ip_ranges = [] if ip_ranges is None else ip_ranges
         params = {} if params is None else params
+
+        cache_key = None
+        if cache and type(self.rules) == dict:
+            try:
+                cache_key = cache.get_key(self, attributes, ip_ranges, params)
+            except Exception as e:
+                print_debug(f'Failed to compute the cache key of ruleset {self.filename}: {e}')
+        if cache_key:
+            prepared_rules = cache.load(cache_key)
+            if prepared_rules is not None:
+                print_debug(f'Loaded prepared rules of ruleset {self.filename} from {cache.cache_dir}')
+                self.rules = {}
+                for filename, rules in prepared_rules:
+                    self.rules[filename] = []
+                    for attributes in rules:
+                        rule = Rule(self.rules_data_path, filename, self.rule_type, {})
+                        vars(rule).update(attributes)
+                        self.rules[filename].append(rule)
+                return
+        errors_count = len(ERRORS_LIST)
+
         for filename in self.rule_definitions:
             if filename in self.rules:
                 for rule in self.rules[filename]:
@@ -133,6 +159,10 @@ class Ruleset:
                 new_rule.set_definition(self.rule_definitions, attributes, ip_ranges, params)
                 self.rules[filename].append(new_rule)
 
+        # Rules that failed to be prepared must report their errors again on the next run
+        if cache_key and len(ERRORS_LIST) == errors_count:
+            cache.save(cache_key, [[filename, [vars(rule) for rule in rules]] for filename, rules in self.rules.items()])
+
     def load_rule_definitions(self, ruleset_generator=False, rule_dirs=None):
         """
         Load definition of rules declared in the ruleset
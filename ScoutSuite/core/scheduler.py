@@ -0,0 +1,155 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import json
+import math
+import os
+import tempfile
+import time
+from collections import Counter
+
+from ScoutSuite.core.console import print_debug
+from ScoutSuite.core.ratelimiter import rate_limit_scope
+
+# Rough durations in seconds of the services known to be slow, used until a run measured them
+DEFAULT_COSTS = {
+    'aws': {'s3': 180, 'iam': 120, 'ec2': 120, 'rds': 60, 'cloudwatch': 60, 'awslambda': 60},
+    # The enabled services of the GCP projects are fetched before any of their resources
+    'gcp': {'serviceusage': 3600, 'computeengine': 120, 'iam': 60, 'cloudstorage': 60, 'kubernetesengine': 60},
+    'azure': {'virtualmachines': 60, 'storageaccounts': 60, 'network': 60},
+}
+
+
+class FetchScheduler:
+    """
+    Shares the executor's workers between the services fetched concurrently, so that the run lasts about as long as
+    its slowest service. The services, and the regions of each service, that took the longest in the previous run are
+    started first and get the workers first. While services compete, each one runs at most its share of the workers,
+    so that a high fan-out service does not queue its calls ahead of the others; the shares grow as services complete.
+    """
+
+    def __init__(self, provider, max_workers):
+        """
+        :param provider:                Provider code, e.g. aws
+        :param max_workers:             Number of workers of the executor
+        """
+        self.provider = provider
+        self.max_workers = max_workers
+        # Estimated durations of the services and of their regions, keyed by service or by service/region
+        self.costs = dict(DEFAULT_COSTS.get(provider, {}))
+        self.durations = Counter()
+        self.started = {}
+        self.running = Counter()
+        self.workers = 0
+        # Calls waiting for a worker, in a heap for each service
+        self.waiters = {}
+        self._sequence = itertools.count()
+
+    def load_costs(self, path):
+        """
+        :param path:                    File of the durations measured by a previous run
+        """
+        try:
+            with open(path) as f:
+                self.costs.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print_debug(f'Failed to load the fetch durations from {path}: {e}')
+
+    def save_costs(self, path):
+        """
+        :param path:                    File in which to save the durations measured by this run
+        """
+        try:
+            content = json.dumps({**self.costs, **self.durations})
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Write then rename so that concurrent scans never read a partial file
+            with tempfile.NamedTemporaryFile('wt', dir=os.path.dirname(path), delete=False) as f:
+                f.write(content)
+            os.replace(f.name, path)
+        except Exception as e:
+            print_debug(f'Failed to save the fetch durations to {path}: {e}')
+
+    def get_cost(self, service, region=None):
+        """
+        :return:                        Estimated duration of the service, or of the service's region
+        """
+        if service is None:
+            # Calls made outside the services, e.g. to list the regions, hold up all of them
+            return math.inf
+        return self.costs.get(f'{service}/{region}' if region else service, 0)
+
+    def sort_services(self, services):
+        """
+        :param services:                Names of the services to fetch
+        :return:                        The services, the longest first
+        """
+        return sorted(services, key=self.get_cost, reverse=True)
+
+    def start_service(self, service):
+        self.started[service] = time.monotonic()
+
+    def complete_service(self, service):
+        self.durations[service] = time.monotonic() - self.started.pop(service)
+        # The service's share of the workers goes to the services still running
+        self._grant_workers()
+
+    @contextlib.asynccontextmanager
+    async def worker(self):
+        """
+        Wait for a worker of the executor, serving first the calls of the service and region of the current task's
+        scope expected to take the longest
+        """
+        service, region = rate_limit_scope.get()
+        if self.workers < self.max_workers and not self.waiters:
+            self._take_worker(service)
+        else:
+            waiter = asyncio.get_event_loop().create_future()
+            heapq.heappush(self.waiters.setdefault(service, []),
+                           (-self.get_cost(service, region), next(self._sequence), waiter))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                # The worker may have been granted before the task was cancelled
+                if waiter.done() and not waiter.cancelled():
+                    self._release_worker(service)
+                raise
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            if region:
+                self.durations[f'{service}/{region}'] += time.monotonic() - start
+            self._release_worker(service)
+
+    def print_stats(self):
+        slowest = sorted(((d, s) for s, d in self.durations.items() if '/' not in s), reverse=True)[:5]
+        if slowest:
+            print_debug('Slowest services: ' + ', '.join(f'{s} ({d:.1f}s)' for d, s in slowest))
+
+    def _take_worker(self, service):
+        self.workers += 1
+        self.running[service] += 1
+
+    def _release_worker(self, service):
+        self.workers -= 1
+        self.running[service] -= 1
+        self._grant_workers()
+
+    def _grant_workers(self):
+        while self.workers < self.max_workers and self.waiters:
+            share = max(1, math.ceil(self.max_workers / max(1, len(self.started))))
+            # Serve the longest service below its share, or the longest one if all reached theirs
+            service = max(self.waiters,
+                          key=lambda s: (self.running[s] < share, self.get_cost(s)))
+            waiters = self.waiters[service]
+            _, _, waiter = heapq.heappop(waiters)
+            if not waiters:
+                del self.waiters[service]
+            if waiter.cancelled():
+                continue
+            self._take_worker(service)
+            waiter.set_result(None)
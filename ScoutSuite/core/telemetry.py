@@ -0,0 +1,178 @@
+import bisect
+import json
+import os
+import tempfile
+import threading
+
+from ScoutSuite.core.console import print_debug
+
+# The web application exports the default registry of prometheus_client, so that its scans expose the counters live
+try:
+    from prometheus_client import Counter, Histogram
+except ImportError:
+    Counter = Histogram = None
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+LABELS = ('provider', 'service', 'operation', 'region')
+METRICS = {
+    'calls': ('scoutsuite_api_calls_total', 'API calls made while fetching the resources'),
+    'errors': ('scoutsuite_api_call_errors_total', 'API calls that failed'),
+    'retries': ('scoutsuite_api_call_retries_total', 'Retries of the API calls'),
+    'throttles': ('scoutsuite_api_call_throttles_total', 'API calls throttled by the provider'),
+    'bytes': ('scoutsuite_api_response_bytes_total', 'Size of the API responses'),
+}
+LATENCY_METRIC = ('scoutsuite_api_call_duration_seconds', 'Time spent in the API calls, retries included')
+
+if Counter:
+    live_counters = {key: Counter(name, documentation, LABELS) for key, (name, documentation) in METRICS.items()}
+    live_latency = Histogram(*LATENCY_METRIC, LABELS, buckets=LATENCY_BUCKETS)
+
+fetch_telemetry = None
+response_bytes = threading.local()
+
+
+class FetchTelemetry:
+    """
+    Number, latency, response size, retries and throttles of the API calls made while fetching the resources, for each
+    service, operation and region
+    """
+
+    def __init__(self, provider):
+        """
+        :param provider:                Provider code, e.g. aws
+        """
+        self.provider = provider
+        self.operations = {}
+        self._lock = threading.Lock()
+
+    def record(self, service, operation, region, latency, size=0, retries=0, throttles=0, failed=False):
+        """
+        :param service:                 Service called, None if outside the services
+        :param operation:               Operation called, e.g. the paginator or the facade method making the call
+        :param region:                  Region called, None if the API is global
+        :param latency:                 Time spent in the call in seconds, retries included
+        :param size:                    Size of the responses in bytes, 0 if unknown
+        :param retries:                 Number of retries of the call
+        :param throttles:               Number of times the call was throttled
+        :param failed:                  Whether the call eventually failed
+        """
+        labels = (self.provider, service or '', operation, region or '')
+        with self._lock:
+            stats = self.operations.get(labels)
+            if stats is None:
+                stats = self.operations[labels] = {'calls': 0, 'errors': 0, 'retries': 0, 'throttles': 0, 'bytes': 0,
+                                                   'latency': 0.0, 'max_latency': 0.0,
+                                                   'buckets': [0] * (len(LATENCY_BUCKETS) + 1)}
+            stats['calls'] += 1
+            stats['errors'] += failed
+            stats['retries'] += retries
+            stats['throttles'] += throttles
+            stats['bytes'] += size
+            stats['latency'] += latency
+            stats['max_latency'] = max(stats['max_latency'], latency)
+            stats['buckets'][bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+        if Counter:
+            for key in METRICS:
+                value = {'calls': 1, 'errors': failed, 'retries': retries, 'throttles': throttles, 'bytes': size}[key]
+                if value:
+                    live_counters[key].labels(*labels).inc(value)
+            live_latency.labels(*labels).observe(latency)
+
+    def get_summary(self):
+        """
+        :return:                        List of the statistics of each operation, the longest first
+        """
+        with self._lock:
+            summary = [{**dict(zip(LABELS, labels)),
+                        **{key: value for key, value in stats.items() if key != 'buckets'}}
+                       for labels, stats in self.operations.items()]
+        return sorted(summary, key=lambda s: s['latency'], reverse=True)
+
+    def get_prometheus_text(self):
+        """
+        :return:                        The statistics in the Prometheus text exposition format
+        """
+        with self._lock:
+            operations = {labels: dict(stats, buckets=list(stats['buckets']))
+                          for labels, stats in self.operations.items()}
+
+        lines = []
+        for key, (name, documentation) in METRICS.items():
+            lines += [f'# HELP {name} {documentation}', f'# TYPE {name} counter']
+            lines += [f'{name}{_format_labels(labels)} {stats[key]}' for labels, stats in operations.items()]
+        name, documentation = LATENCY_METRIC
+        lines += [f'# HELP {name} {documentation}', f'# TYPE {name} histogram']
+        for labels, stats in operations.items():
+            count = 0
+            for bound, bucket_count in zip((*LATENCY_BUCKETS, '+Inf'), stats['buckets']):
+                count += bucket_count
+                lines.append(f'{name}_bucket{_format_labels(labels, le=bound)} {count}')
+            lines.append(f'{name}_sum{_format_labels(labels)} {stats["latency"]}')
+            lines.append(f'{name}_count{_format_labels(labels)} {stats["calls"]}')
+        return '\n'.join(lines) + '\n'
+
+    def save(self, directory, name):
+        """
+        Save the JSON summary and the Prometheus text file of the statistics
+
+        :param directory:               Directory of the files
+        :param name:                    Name of the files, without extension
+        """
+        try:
+            os.makedirs(directory, exist_ok=True)
+            for extension, content in [('json', json.dumps(self.get_summary(), indent=2)),
+                                       ('prom', self.get_prometheus_text())]:
+                # Write then rename so that a metrics collector never reads a partial file
+                with tempfile.NamedTemporaryFile('wt', dir=directory, delete=False) as f:
+                    f.write(content)
+                os.replace(f.name, os.path.join(directory, f'{name}.{extension}'))
+        except Exception as e:
+            print_debug(f'Failed to save the API call statistics to {directory}: {e}')
+
+    def print_stats(self):
+        summary = self.get_summary()
+        print_debug(f'Spent {sum(s["latency"] for s in summary):.1f}s in {sum(s["calls"] for s in summary)} API calls, '
+                    f'received {sum(s["bytes"] for s in summary) / 2 ** 20:.1f} MiB')
+        for s in summary[:5]:
+            print_debug(f'Spent {s["latency"]:.1f}s in {s["calls"]} calls of {s["operation"]} for the {s["service"]} '
+                        f'service in {s["region"] or "all regions"}')
+
+
+def set_fetch_telemetry(telemetry):
+    """
+    :param telemetry:                   FetchTelemetry recording the API calls, None to not record them
+    """
+    global fetch_telemetry
+    fetch_telemetry = telemetry
+
+
+def get_fetch_telemetry():
+    return fetch_telemetry
+
+
+def add_response_bytes(size):
+    """
+    Count the size of a response received by the current thread, attributed to the call it is making
+
+    :param size:                        Size of the response in bytes
+    """
+    response_bytes.size = getattr(response_bytes, 'size', 0) + size
+
+
+def measure_response_bytes(function):
+    """
+    :param function:                    Function making API calls, run in the current thread
+    :return:                            Function returning the function's result and the size of the responses
+    """
+    def measured_function():
+        response_bytes.size = 0
+        result = function()
+        return result, response_bytes.size
+    return measured_function
+
+
+def _format_labels(labels, **extra_labels):
+    values = {**dict(zip(LABELS, labels)), **extra_labels}
+    escaped = {k: str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for k, v in values.items()}
+    return '{' + ','.join(f'{k}="{v}"' for k, v in escaped.items()) + '}'
@@ -31,57 +31,177 @@ def recurse(all_info, current_info, target_path, current_path, config, add_suffi
     :return:
     """
     results = []
-    if len(target_path) == 0:
+    for path, _ in walk(current_info, target_path, current_path):
         # Dashboard: count the number of processed resources here
         setattr(config, 'checked_items', getattr(config, 'checked_items') + 1)
         # Test for conditions...
-        if pass_conditions(all_info, current_path, copy.deepcopy(config.conditions)):
-            # id_suffix
-            if add_suffix and hasattr(config, 'id_suffix'):
-                suffix = fix_path_string(all_info, current_path, config.id_suffix)
-                current_path.append(suffix)
-            # class_suffix
-            if add_suffix and hasattr(config, 'class_suffix'):
-                suffix = fix_path_string(all_info, current_path, config.class_suffix)
-                current_path.append(suffix)
-            results.append('.'.join(current_path))
-        # Return the flagged items...
-        return results
-    target_path = copy.deepcopy(target_path)
-    dbg_target_path = copy.deepcopy(target_path)
-    current_path = copy.deepcopy(current_path)
-    attribute = target_path.pop(0)
+        flagged_item = evaluate_conditions(all_info, path, config, add_suffix)
+        if flagged_item is not None:
+            results.append(flagged_item)
+    # Return the flagged items...
+    return results
+
+
+def walk(current_info, target_path, current_path=()):
+    """
+    Iterate over the resources targeted by a path, following the `id` semantics described in `recurse`. Strings are
+    returned as is, whatever the remaining path.
+
+    The walk uses a single stack and immutable paths, so no path is copied on the way down.
+
+    :param current_info:    The resource the walk starts from
+    :param target_path:     The path that is being walked
+    :param current_path:    The path of `current_info`
+    :return:                Generator of (current_path, resource), where `current_path` is a tuple
+    """
+    target_path = tuple(target_path)
+    stack = [(0, iter([(tuple(current_path), current_info)]))]
+    while stack:
+        depth, children = stack[-1]
+        for current_path, current_info in children:
+            break
+        else:
+            stack.pop()
+            continue
+        if depth == len(target_path) or isinstance(current_info, str):
+            yield current_path, current_info
+        else:
+            stack.append((depth + 1, __iter_children(current_path, current_info, target_path[depth])))
+
+
+def walk_rule_tree(current_info, rule_tree, current_path=()):
+    """
+    Iterate over the resources targeted by the paths of a rule tree, with the same semantics as `walk`.
+
+    :param current_info:    The resource the walk starts from
+    :param rule_tree:       The node of the rule tree matching `current_info`, as built by `build_rule_tree`
+    :param current_path:    The path of `current_info`
+    :return:                Generator of (current_path, resource, rules), where `rules` target the resource
+    """
+    stack = [iter([(tuple(current_path), current_info, rule_tree)])]
+    while stack:
+        for current_path, current_info, rule_tree in stack[-1]:
+            break
+        else:
+            stack.pop()
+            continue
+        if rule_tree['rules']:
+            yield current_path, current_info, rule_tree['rules']
+        if rule_tree['children']:
+            stack.append(__iter_rule_tree_children(current_path, current_info, rule_tree))
+
+
+def __iter_children(current_path, current_info, attribute):
     if type(current_info) == dict:
         if attribute in current_info:
-            split_path = copy.deepcopy(current_path)
-            split_path.append(attribute)
-            results = results + recurse(all_info, current_info[attribute], target_path, split_path, config, add_suffix)
+            yield current_path + (attribute,), current_info[attribute]
         elif attribute == 'id':
-            for key in current_info:
-                split_target_path = copy.deepcopy(target_path)
-                split_current_path = copy.deepcopy(current_path)
-                split_current_path.append(key)
-                split_current_info = current_info[key]
-                results = results + recurse(all_info, split_current_info, split_target_path, split_current_path,
-                                            config, add_suffix)
+            for key, value in current_info.items():
+                yield current_path + (key,), value
     # To handle lists properly, I would have to make sure the list is properly ordered and I can use the index to
     # consistently access an object... Investigate (or do not use lists)
     elif type(current_info) == list:
-        for index, split_current_info in enumerate(current_info):
-            split_current_path = copy.deepcopy(current_path)
-            split_current_path.append(str(index))
-            results = results + recurse(all_info, split_current_info, copy.deepcopy(target_path), split_current_path,
-                                        config, add_suffix)
-    # Python 2-3 compatible way to check for string type
-    elif isinstance(current_info, str):
-        split_current_path = copy.deepcopy(current_path)
-        results = results + recurse(all_info, current_info, [], split_current_path,
-                                    config, add_suffix)
+        for index, value in enumerate(current_info):
+            yield current_path + (str(index),), value
     else:
         print_exception('Unable to recursively test condition for path {}: '
-                        'unhandled case for \"{}\" type'.format(current_path,
+                        'unhandled case for \"{}\" type'.format(list(current_path),
                                                                 type(current_info)),
-                        additional_details={'current_path': current_path,
+                        additional_details={'current_path': list(current_path),
                                             'current_info': current_info,
-                                            'dbg_target_path': dbg_target_path})
-    return results
+                                            'attribute': attribute})
+
+
+def __iter_rule_tree_children(current_path, current_info, rule_tree):
+    for attribute, subtree in rule_tree['children'].items():
+        # Strings are tested as is by every rule below this node
+        if isinstance(current_info, str):
+            yield current_path, current_info, {'rules': __get_rule_tree_rules(subtree), 'children': {}}
+        else:
+            for child_path, child_info in __iter_children(current_path, current_info, attribute):
+                yield child_path, child_info, subtree
+
+
+def evaluate_conditions(all_info, current_path, config, add_suffix=False):
+    """
+    Test the conditions of a rule on the resource located at a given path.
+
+    :param all_info:        All of the services' data
+    :param current_path:    The path of the resource being tested
+    :param config:          The Rule object that is being tested
+    :param add_suffix:      Whether the rule's `id_suffix` and `class_suffix` should be appended to the flagged item
+    :return:                The flagged item if the conditions are passed, None otherwise
+    """
+    # Use the compiled predicate when the processing engine provides one
+    compiled_conditions = getattr(config, 'compiled_conditions', None)
+    if compiled_conditions:
+        passed = compiled_conditions(all_info, current_path)
+    else:
+        passed = pass_conditions(all_info, current_path, copy.deepcopy(config.conditions))
+    if not passed:
+        return None
+    # id_suffix
+    if add_suffix and hasattr(config, 'id_suffix'):
+        suffix = fix_path_string(all_info, current_path, config.id_suffix)
+        current_path = [*current_path, suffix]
+    # class_suffix
+    if add_suffix and hasattr(config, 'class_suffix'):
+        suffix = fix_path_string(all_info, current_path, config.class_suffix)
+        current_path = [*current_path, suffix]
+    return '.'.join(current_path)
+
+
+def build_rule_tree(rules):
+    """
+    Build a prefix tree of the rules' paths, so that resources targeted by several rules are only walked once.
+
+    :param rules:           The Rule objects to organize
+    :return:                The root node, a dict holding the `rules` whose path ends at this node and the `children`
+                            nodes keyed by path attribute
+    """
+    rule_tree = {'rules': [], 'children': {}}
+    for rule in rules:
+        node = rule_tree
+        for attribute in rule.path.split('.'):
+            node = node['children'].setdefault(attribute, {'rules': [], 'children': {}})
+        node['rules'].append(rule)
+    return rule_tree
+
+
+def recurse_rule_tree(all_info, current_info, rule_tree, current_path, results, add_suffix=False):
+    """
+    Walk the resources once and test every rule of a tree on the resources targeted by its path. The `id` semantics
+    are the same as in `recurse`.
+
+    :param all_info:        All of the services' data
+    :param current_info:    The resource being walked
+    :param rule_tree:       The node of the rule tree matching `current_info`, as built by `build_rule_tree`
+    :param current_path:    The path of `current_info`
+    :param results:         Dict of rule to flagged items, updated in place. A rule that raised an exception is mapped
+                            to the exception and is not tested any further
+    :param add_suffix:      Whether the rules' suffixes should be appended to the flagged items
+    :return:
+    """
+    for path, _, rules in walk_rule_tree(current_info, rule_tree, current_path):
+        for rule in rules:
+            __evaluate_rule(all_info, path, rule, results, add_suffix)
+
+
+def __evaluate_rule(all_info, current_path, rule, results, add_suffix):
+    if isinstance(results[rule], Exception):
+        return
+    try:
+        # Dashboard: count the number of processed resources here
+        setattr(rule, 'checked_items', getattr(rule, 'checked_items') + 1)
+        flagged_item = evaluate_conditions(all_info, current_path, rule, add_suffix)
+        if flagged_item is not None:
+            results[rule].append(flagged_item)
+    except Exception as e:
+        results[rule] = e
+
+
+def __get_rule_tree_rules(rule_tree):
+    rules = list(rule_tree['rules'])
+    for subtree in rule_tree['children'].values():
+        rules += __get_rule_tree_rules(subtree)
+    return rules
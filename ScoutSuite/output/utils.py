@@ -69,6 +69,14 @@ def get_filename(file_type, file_name=None, file_dir=None, relative_path=False,
             directory = DEFAULT_REPORT_RESULTS_DIRECTORY
         extension = 'json'
         first_line = None
+    elif file_type == 'PROFILE':
+        name = f'scoutsuite_profile_{file_name}' if file_name else 'scoutsuite_profile'
+        if not relative_path:
+            directory = os.path.join(file_dir if file_dir else DEFAULT_REPORT_DIRECTORY, DEFAULT_REPORT_RESULTS_DIRECTORY)
+        else:
+            directory = DEFAULT_REPORT_RESULTS_DIRECTORY
+        extension = 'json'
+        first_line = None
     else:
         raise Exception(f'Invalid file type provided: {file_type}')
 
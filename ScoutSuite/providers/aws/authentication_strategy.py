@@ -2,7 +2,7 @@ import boto3
 import logging
 
 from ScoutSuite import __version__
-from ScoutSuite.providers.aws.utils import get_caller_identity
+from ScoutSuite.providers.aws.utils import get_caller_identity, measure_responses, record_responses
 from ScoutSuite.providers.base.authentication_strategy import AuthenticationStrategy, AuthenticationException
 
 
@@ -46,6 +46,9 @@ class AWSAuthenticationStrategy(AuthenticationStrategy):
             else:
                 session = boto3.Session()
 
+            record_responses(session)
+            measure_responses(session)
+
             # Test querying for current user
             get_caller_identity(session)
 
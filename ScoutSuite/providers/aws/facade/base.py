@@ -1,4 +1,4 @@
-from boto3.session import Session
+import asyncio
 
 from ScoutSuite.providers.aws.facade.acm import AcmFacade
 from ScoutSuite.providers.aws.facade.awslambda import LambdaFacade
@@ -17,6 +17,7 @@ from ScoutSuite.providers.aws.facade.elasticache import ElastiCacheFacade
 from ScoutSuite.providers.aws.facade.elb import ELBFacade
 from ScoutSuite.providers.aws.facade.elbv2 import ELBv2Facade
 from ScoutSuite.providers.aws.facade.emr import EMRFacade
+from ScoutSuite.providers.aws.facade.endpoints import AWSEndpoints
 from ScoutSuite.providers.aws.facade.iam import IAMFacade
 from ScoutSuite.providers.aws.facade.kms import KMSFacade
 from ScoutSuite.providers.aws.facade.rds import RDSFacade
@@ -27,6 +28,7 @@ from ScoutSuite.providers.aws.facade.ses import SESFacade
 from ScoutSuite.providers.aws.facade.sns import SNSFacade
 from ScoutSuite.providers.aws.facade.sqs import SQSFacade
 from ScoutSuite.providers.aws.facade.secretsmanager import SecretsManagerFacade
+from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
 from ScoutSuite.providers.aws.utils import get_aws_account_id, get_partition_name
 from ScoutSuite.providers.utils import run_concurrently
 
@@ -69,6 +71,8 @@ class AWSFacade(AWSBaseFacade):
         self.owner_id = get_aws_account_id(credentials.session)
         self.partition = get_partition_name(credentials.session)
         self.session = credentials.session
+        self._not_opted_in_regions = None
+        self._not_opted_in_regions_lock = asyncio.Lock()
         self._instantiate_facades()
 
     async def build_region_list(self, service: str, chosen_regions=None, excluded_regions=None, partition_name='aws'):
@@ -76,13 +80,13 @@ class AWSFacade(AWSBaseFacade):
         available_services = None
         try:
             available_services = await run_concurrently(
-                lambda: Session(region_name='us-east-1').get_available_services())
+                lambda: AWSEndpoints.get_available_services('us-east-1'))
         except Exception as e:
             # see https://github.com/nccgroup/ScoutSuite/issues/548
             # If failed with the us-east-1 region, we'll try to use the region from the profile
             try:
                 available_services = await run_concurrently(
-                    lambda: Session(region_name=self.session.region_name).get_available_services())
+                    lambda: AWSEndpoints.get_available_services(self.session.region_name))
             except Exception as e:
                 # see https://github.com/nccgroup/ScoutSuite/issues/685
                 # If above failed, and regions were explicitly specified, will try with those until one works
@@ -90,7 +94,7 @@ class AWSFacade(AWSBaseFacade):
                     for region in chosen_regions:
                         try:
                             available_services = await run_concurrently(
-                                lambda: Session(region_name=region).get_available_services())
+                                lambda: AWSEndpoints.get_available_services(region))
                             break
                         except Exception as e:
                             exception = e
@@ -114,15 +118,12 @@ class AWSFacade(AWSBaseFacade):
             # the cognito service is a composition of two boto3 services
             if service != "cognito":
                 regions = await run_concurrently(
-                    lambda: Session(region_name='us-east-1').get_available_regions(service,
-                                                                                   partition_name))
+                    lambda: AWSEndpoints.get_available_regions(service, partition_name, 'us-east-1'))
             else:
                 idp_regions = await run_concurrently(
-                    lambda: Session(region_name='us-east-1').get_available_regions("cognito-idp",
-                                                                                   partition_name))
+                    lambda: AWSEndpoints.get_available_regions("cognito-idp", partition_name, 'us-east-1'))
                 identity_regions = await run_concurrently(
-                    lambda: Session(region_name='us-east-1').get_available_regions("cognito-identity",
-                                                                                   partition_name))
+                    lambda: AWSEndpoints.get_available_regions("cognito-identity", partition_name, 'us-east-1'))
                 regions = [value for value in idp_regions if value in identity_regions]
         except Exception as e:
             # see https://github.com/nccgroup/ScoutSuite/issues/548
@@ -131,15 +132,14 @@ class AWSFacade(AWSBaseFacade):
                 # the cognito service is a composition of two boto3 services
                 if service != "cognito":
                     regions = await run_concurrently(
-                        lambda: Session(region_name=self.session.region_name).get_available_regions(service,
-                                                                                                    partition_name))
+                        lambda: AWSEndpoints.get_available_regions(service, partition_name, self.session.region_name))
                 else:
                     idp_regions = await run_concurrently(
-                        lambda: Session(region_name=self.session.region_name).get_available_regions("cognito-idp",
-                                                                                                    partition_name))
+                        lambda: AWSEndpoints.get_available_regions(
+                            "cognito-idp", partition_name, self.session.region_name))
                     identity_regions = await run_concurrently(
-                        lambda: Session(region_name=self.session.region_name).get_available_regions("cognito-identity",
-                                                                                                    partition_name))
+                        lambda: AWSEndpoints.get_available_regions(
+                            "cognito-identity", partition_name, self.session.region_name))
                     regions = [value for value in idp_regions if value in identity_regions]
             except Exception as e:
                 # see https://github.com/nccgroup/ScoutSuite/issues/685
@@ -150,17 +150,14 @@ class AWSFacade(AWSBaseFacade):
                             # the cognito service is a composition of two boto3 services
                             if service != "cognito":
                                 regions = await run_concurrently(
-                                    lambda: Session(region_name=region).get_available_regions(service,
-                                                                                              partition_name))
+                                    lambda: AWSEndpoints.get_available_regions(service, partition_name, region))
                             else:
                                 idp_regions = await run_concurrently(
-                                    lambda: Session(region_name=region).get_available_regions(
-                                        "cognito-idp",
-                                        partition_name))
+                                    lambda: AWSEndpoints.get_available_regions(
+                                        "cognito-idp", partition_name, region))
                                 identity_regions = await run_concurrently(
-                                    lambda: Session(region_name=region).get_available_regions(
-                                        "cognito-identity",
-                                        partition_name))
+                                    lambda: AWSEndpoints.get_available_regions(
+                                        "cognito-identity", partition_name, region))
                                 regions = [value for value in idp_regions if value in identity_regions]
                             break
                         except Exception as e:
@@ -195,43 +192,8 @@ class AWSFacade(AWSBaseFacade):
                 print_error('"get_available_regions" returned an empty array for service "{}", '
                             'something is wrong'.format(service))
 
-        # identify regions that are not opted-in
-        ec2_not_opted_in_regions = None
-        try:
-            ec2_not_opted_in_regions = self.session.client('ec2', 'us-east-1') \
-                .describe_regions(AllRegions=True, Filters=[{'Name': 'opt-in-status', 'Values': ['not-opted-in']}])
-        except Exception as e:
-            # see https://github.com/nccgroup/ScoutSuite/issues/548
-            # If failed with the us-east-1 region, we'll try to use the region from the profile
-            try:
-                ec2_not_opted_in_regions = \
-                    self.session.client('ec2', self.session.region_name). \
-                        describe_regions(AllRegions=True,
-                                         Filters=[{'Name': 'opt-in-status',
-                                                   'Values': ['not-opted-in']}])
-            except Exception as e:
-                # see https://github.com/nccgroup/ScoutSuite/issues/685
-                # If above failed, and regions were explicitly specified, will try with those until
-                # one works
-                if chosen_regions:
-                    for region in chosen_regions:
-                        try:
-                            ec2_not_opted_in_regions = self.session.client('ec2', region).describe_regions(
-                                AllRegions=True,
-                                Filters=[{'Name': 'opt-in-status',
-                                          'Values': ['not-opted-in']}])
-                            break
-                        except Exception as e:
-                            exception = e
-                    if not ec2_not_opted_in_regions:
-                        raise exception
-                else:
-                    raise e
-
-        not_opted_in_regions = []
-        if ec2_not_opted_in_regions['Regions']:
-            for r in ec2_not_opted_in_regions['Regions']:
-                not_opted_in_regions.append(r['RegionName'])
+        # exclude not opted in regions, identified once for all the services
+        not_opted_in_regions = await self._get_not_opted_in_regions(chosen_regions)
 
         # include specific regions
         if chosen_regions:
@@ -239,12 +201,50 @@ class AWSFacade(AWSBaseFacade):
         # exclude specific regions
         if excluded_regions:
             regions = [r for r in regions if r not in excluded_regions]
-        # exclude not opted in regions
         if not_opted_in_regions:
             regions = [r for r in regions if r not in not_opted_in_regions]
 
         return regions
 
+    async def _get_not_opted_in_regions(self, chosen_regions=None):
+        async with self._not_opted_in_regions_lock:
+            if self._not_opted_in_regions is not None:
+                return self._not_opted_in_regions
+
+            filters = [{'Name': 'opt-in-status', 'Values': ['not-opted-in']}]
+            ec2_not_opted_in_regions = None
+            try:
+                ec2_client = AWSFacadeUtils.get_client('ec2', self.session, 'us-east-1')
+                ec2_not_opted_in_regions = await run_concurrently(
+                    lambda: ec2_client.describe_regions(AllRegions=True, Filters=filters))
+            except Exception as e:
+                # see https://github.com/nccgroup/ScoutSuite/issues/548
+                # If failed with the us-east-1 region, we'll try to use the region from the profile
+                try:
+                    ec2_client = AWSFacadeUtils.get_client('ec2', self.session, self.session.region_name)
+                    ec2_not_opted_in_regions = await run_concurrently(
+                        lambda: ec2_client.describe_regions(AllRegions=True, Filters=filters))
+                except Exception as e:
+                    # see https://github.com/nccgroup/ScoutSuite/issues/685
+                    # If above failed, and regions were explicitly specified, will try with those until
+                    # one works
+                    if chosen_regions:
+                        for region in chosen_regions:
+                            try:
+                                ec2_client = AWSFacadeUtils.get_client('ec2', self.session, region)
+                                ec2_not_opted_in_regions = await run_concurrently(
+                                    lambda: ec2_client.describe_regions(AllRegions=True, Filters=filters))
+                                break
+                            except Exception as e:
+                                exception = e
+                        if not ec2_not_opted_in_regions:
+                            raise exception
+                    else:
+                        raise e
+
+            self._not_opted_in_regions = [r['RegionName'] for r in ec2_not_opted_in_regions['Regions']]
+            return self._not_opted_in_regions
+
     def _instantiate_facades(self):
         self.ec2 = EC2Facade(self.session, self.owner_id)
         self.acm = AcmFacade(self.session)
@@ -16,6 +16,9 @@ class EC2Facade(AWSBaseFacade):
 
     def __init__(self, session: boto3.session.Session, owner_id: str):
         self.owner_id = owner_id
+        # Unlike flow logs, VPC resources are modified by their parsers so they are not shared between facades
+        self.regional_vpc_resources_cache_locks = {}
+        self.vpc_resources_cache = {}
 
         super().__init__(session)
 
@@ -57,11 +60,12 @@ class EC2Facade(AWSBaseFacade):
                 return value.decode('latin-1')
 
     async def get_instances(self, region: str, vpc: str):
-        filters = [{'Name': 'vpc-id', 'Values': [vpc]}]
+        return await self._get_vpc_resources(region, vpc, self._get_regional_instances)
+
+    async def _get_regional_instances(self, region: str):
         try:
             reservations = \
-                await AWSFacadeUtils.get_all_pages(
-                    'ec2', region, self.session, 'describe_instances', 'Reservations', Filters=filters)
+                await AWSFacadeUtils.get_all_pages('ec2', region, self.session, 'describe_instances', 'Reservations')
 
             instances = []
             for reservation in reservations:
@@ -76,10 +80,12 @@ class EC2Facade(AWSBaseFacade):
             return []
 
     async def get_security_groups(self, region: str, vpc: str):
-        filters = [{'Name': 'vpc-id', 'Values': [vpc]}]
+        return await self._get_vpc_resources(region, vpc, self._get_regional_security_groups)
+
+    async def _get_regional_security_groups(self, region: str):
         try:
             return await AWSFacadeUtils.get_all_pages(
-                'ec2', region, self.session, 'describe_security_groups', 'SecurityGroups', Filters=filters)
+                'ec2', region, self.session, 'describe_security_groups', 'SecurityGroups')
         except Exception as e:
             print_exception(f'Failed to describe EC2 security groups: {e}')
             return []
@@ -92,20 +98,27 @@ class EC2Facade(AWSBaseFacade):
             print_exception(f'Failed to describe EC2 VPC: {e}')
             return []
 
-    async def get_images(self, region: str):
+    async def get_image_pages(self, region: str):
         filters = [{'Name': 'owner-id', 'Values': [self.owner_id]}]
         client = AWSFacadeUtils.get_client('ec2', self.session, region)
         try:
-            return await run_concurrently(lambda: client.describe_images(Filters=filters)['Images'])
+            # Botocore only ships the DescribeImages paginator since 1.29.34, older versions list the images in one call
+            if not client.can_paginate('describe_images'):
+                yield await run_concurrently(lambda: client.describe_images(Filters=filters)['Images'])
+                return
+            async for images in AWSFacadeUtils.get_pages(
+                    'ec2', region, self.session, 'describe_images', 'Images', Filters=filters):
+                yield images
         except Exception as e:
             print_exception(f'Failed to get EC2 images: {e}')
-            return []
 
     async def get_network_interfaces(self, region: str, vpc: str):
-        filters = [{'Name': 'vpc-id', 'Values': [vpc]}]
+        return await self._get_vpc_resources(region, vpc, self._get_regional_network_interfaces)
+
+    async def _get_regional_network_interfaces(self, region: str):
         try:
             return await AWSFacadeUtils.get_all_pages(
-                'ec2', region, self.session, 'describe_network_interfaces', 'NetworkInterfaces', Filters=filters)
+                'ec2', region, self.session, 'describe_network_interfaces', 'NetworkInterfaces')
         except Exception as e:
             print_exception(f'Failed to get EC2 network interfaces: {e}')
             return []
@@ -135,19 +148,17 @@ class EC2Facade(AWSBaseFacade):
         else:
             volume['KeyManager'] = None
 
-    async def get_snapshots(self, region: str):
+    async def get_snapshot_pages(self, region: str):
         filters = [{'Name': 'owner-id', 'Values': [self.owner_id]}]
 
         try:
-            snapshots = await AWSFacadeUtils.get_all_pages(
-                'ec2', region, self.session, 'describe_snapshots', 'Snapshots', Filters=filters)
+            async for snapshots in AWSFacadeUtils.get_pages(
+                    'ec2', region, self.session, 'describe_snapshots', 'Snapshots', Filters=filters):
+                # The next page is fetched while the attributes of this one are
+                await get_and_set_concurrently([self._get_and_set_snapshot_attributes], snapshots, region=region)
+                yield snapshots
         except Exception as e:
             print_exception(f'Failed to get snapshots: {e}')
-            snapshots = []
-        else:
-            await get_and_set_concurrently([self._get_and_set_snapshot_attributes], snapshots, region=region)
-        finally:
-            return snapshots
 
     async def _get_and_set_snapshot_attributes(self, snapshot: {}, region: str):
         ec2_client = AWSFacadeUtils.get_client('ec2', self.session, region)
@@ -162,10 +173,12 @@ class EC2Facade(AWSBaseFacade):
                 print_exception(f'Failed to describe EC2 snapshot attributes: {e}')
 
     async def get_network_acls(self, region: str, vpc: str):
-        filters = [{'Name': 'vpc-id', 'Values': [vpc]}]
+        return await self._get_vpc_resources(region, vpc, self._get_regional_network_acls)
+
+    async def _get_regional_network_acls(self, region: str):
         try:
             return await AWSFacadeUtils.get_all_pages(
-                'ec2', region, self.session, 'describe_network_acls', 'NetworkAcls', Filters=filters)
+                'ec2', region, self.session, 'describe_network_acls', 'NetworkAcls')
         except Exception as e:
             print_exception(f'Failed to get EC2 network ACLs: {e}')
             return []
@@ -187,17 +200,38 @@ class EC2Facade(AWSBaseFacade):
                 await AWSFacadeUtils.get_all_pages('ec2', region, self.session, 'describe_flow_logs', 'FlowLogs')
 
     async def get_subnets(self, region: str, vpc: str):
-        ec2_client = AWSFacadeUtils.get_client('ec2', self.session, region)
-        filters = [{'Name': 'vpc-id', 'Values': [vpc]}]
+        return await self._get_vpc_resources(region, vpc, self._get_regional_subnets)
+
+    async def _get_regional_subnets(self, region: str):
         try:
-            subnets = await run_concurrently(lambda: ec2_client.describe_subnets(Filters=filters)['Subnets'])
+            subnets = await AWSFacadeUtils.get_all_pages('ec2', region, self.session, 'describe_subnets', 'Subnets')
         except Exception as e:
             print_exception(f'Failed to describe EC2 subnets: {e}')
-            return None
+            return []
         else:
             await get_and_set_concurrently([self._get_and_set_subnet_flow_logs], subnets, region=region)
             return subnets
 
+    async def _get_vpc_resources(self, region: str, vpc: str, get_regional_resources):
+        """
+        Fetches the resources of all the VPCs of a region in a single pagination sequence on the first call, and
+        returns those of the VPC from the cache on the following calls
+
+        :param region:                  Region
+        :param vpc:                     VPC ID
+        :param get_regional_resources:  Coroutine function returning the resources of a region
+        :return:                        List of the resources of the VPC
+        """
+        key = (region, get_regional_resources.__name__)
+        async with self.regional_vpc_resources_cache_locks.setdefault(key, asyncio.Lock()):
+            if key not in self.vpc_resources_cache:
+                resources_per_vpc = {}
+                for resource in await get_regional_resources(region):
+                    resources_per_vpc.setdefault(resource.get('VpcId'), []).append(resource)
+                self.vpc_resources_cache[key] = resources_per_vpc
+
+        return self.vpc_resources_cache[key].get(vpc, [])
+
     async def _get_and_set_subnet_flow_logs(self, subnet: {}, region: str):
         await self.cache_flow_logs(region)
         subnet['flow_logs'] = \
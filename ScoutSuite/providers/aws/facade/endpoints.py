@@ -0,0 +1,105 @@
+import json
+import os
+import tempfile
+import threading
+
+import botocore
+from boto3.session import Session
+
+from ScoutSuite.core.console import print_debug
+
+
+class AWSEndpoints:
+    """
+    Services and regions known to botocore, read from its endpoint data with a single session and optionally cached on
+    disk between runs. The data only depends on botocore's version, so it is shared by all the facades.
+    """
+    _session = None
+    _data = None
+    _lock = threading.Lock()
+    _cache_dir = None
+
+    @staticmethod
+    def get_available_services(region_name: str = None):
+        """
+        :param region_name: Region of the session reading the endpoint data, if none was created yet
+        :return: List of the names of the services, e.g. ec2
+        """
+
+        with AWSEndpoints._lock:
+            data = AWSEndpoints._get_data()
+            if 'services' not in data:
+                data['services'] = AWSEndpoints._get_session(region_name).get_available_services()
+                AWSEndpoints._save()
+            return data['services']
+
+    @staticmethod
+    def get_available_regions(service: str, partition_name: str = 'aws', region_name: str = None):
+        """
+        :param service: Name of the service, e.g. ec2
+        :param partition_name: Name of the partition, e.g. aws
+        :param region_name: Region of the session reading the endpoint data, if none was created yet
+        :return: List of the names of the regions
+        """
+
+        with AWSEndpoints._lock:
+            regions = AWSEndpoints._get_data().setdefault('regions', {}).setdefault(partition_name, {})
+            if service not in regions:
+                regions[service] = AWSEndpoints._get_session(region_name).get_available_regions(service, partition_name)
+                AWSEndpoints._save()
+            return regions[service]
+
+    @staticmethod
+    def set_cache_dir(cache_dir: str):
+        """
+        :param cache_dir: Directory in which to cache the endpoint data between runs, None to only cache it in memory
+        """
+
+        with AWSEndpoints._lock:
+            if cache_dir != AWSEndpoints._cache_dir:
+                AWSEndpoints._cache_dir = cache_dir
+                AWSEndpoints._data = None
+
+    @staticmethod
+    def _get_session(region_name: str):
+        # Only kept once created, so that a failure with a region can be retried with another one
+        if AWSEndpoints._session is None:
+            AWSEndpoints._session = Session(region_name=region_name)
+        return AWSEndpoints._session
+
+    @staticmethod
+    def _get_data():
+        if AWSEndpoints._data is None:
+            AWSEndpoints._data = AWSEndpoints._load() or {}
+        return AWSEndpoints._data
+
+    @staticmethod
+    def _get_path():
+        return os.path.join(AWSEndpoints._cache_dir, f'aws-endpoints-{botocore.__version__}.json')
+
+    @staticmethod
+    def _load():
+        if not AWSEndpoints._cache_dir:
+            return None
+        try:
+            with open(AWSEndpoints._get_path()) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print_debug(f'Failed to load the endpoint data from {AWSEndpoints._get_path()}: {e}')
+            return None
+
+    @staticmethod
+    def _save():
+        if not AWSEndpoints._cache_dir:
+            return
+        try:
+            content = json.dumps(AWSEndpoints._data)
+            os.makedirs(AWSEndpoints._cache_dir, exist_ok=True)
+            # Write then rename so that concurrent scans never read a partial file
+            with tempfile.NamedTemporaryFile('wt', dir=AWSEndpoints._cache_dir, delete=False) as f:
+                f.write(content)
+            os.replace(f.name, AWSEndpoints._get_path())
+        except Exception as e:
+            print_debug(f'Failed to save the endpoint data to {AWSEndpoints._cache_dir}: {e}')
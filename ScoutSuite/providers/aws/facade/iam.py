@@ -10,6 +10,12 @@ from ScoutSuite.providers.utils import get_non_provider_id, run_concurrently, ge
 
 
 class IAMFacade(AWSBaseFacade):
+    def __init__(self, session):
+        self._authorization_details = None
+        self._authorization_details_lock = asyncio.Lock()
+
+        super().__init__(session)
+
     async def get_credential_reports(self):
         client = AWSFacadeUtils.get_client('iam', self.session)
         # When no credential report exists, we first need to initiate the creation of a new report by calling
@@ -57,16 +63,59 @@ class IAMFacade(AWSBaseFacade):
             return []
 
     async def get_groups(self):
-        groups = await AWSFacadeUtils.get_all_pages('iam', None, self.session, 'list_groups', 'Groups')
-        await get_and_set_concurrently(
-            [self._get_and_set_group_users,
-             functools.partial(self._get_and_set_inline_policies, iam_resource_type='group')], groups)
+        authorization_details = await self._get_authorization_details()
+        if authorization_details is None:
+            groups = await AWSFacadeUtils.get_all_pages('iam', None, self.session, 'list_groups', 'Groups')
+            await get_and_set_concurrently(
+                [self._get_and_set_group_users,
+                 functools.partial(self._get_and_set_inline_policies, iam_resource_type='group')], groups)
+            return groups
+
+        group_users = {}
+        for user_details in authorization_details['UserDetailList']:
+            for group_name in user_details.get('GroupList', []):
+                group_users.setdefault(group_name, []).append(user_details['UserId'])
+
+        groups = []
+        for group_details in authorization_details['GroupDetailList']:
+            group = {key: group_details[key] for key in ['Path', 'GroupName', 'GroupId', 'Arn', 'CreateDate']}
+            group['Users'] = group_users.get(group['GroupName'], [])
+            self._set_inline_policies(group, group_details.get('GroupPolicyList', []))
+            groups.append(group)
         return groups
 
     async def get_policies(self):
-        policies = await AWSFacadeUtils.get_all_pages(
-            'iam', None, self.session, 'list_policies', 'Policies', OnlyAttached=True)
-        await get_and_set_concurrently([self._get_and_set_policy_details], policies)
+        authorization_details = await self._get_authorization_details()
+        if authorization_details is None:
+            policies = await AWSFacadeUtils.get_all_pages(
+                'iam', None, self.session, 'list_policies', 'Policies', OnlyAttached=True)
+            await get_and_set_concurrently([self._get_and_set_policy_details], policies)
+            return policies
+
+        # Entities to which each policy is attached, as a permissions policy or as a permissions boundary
+        attached_entities = {}
+        for resource_type in ['group', 'role', 'user']:
+            for entity_details in authorization_details[f'{resource_type.title()}DetailList']:
+                attached_policies = list(entity_details.get('AttachedManagedPolicies', []))
+                if 'PermissionsBoundary' in entity_details:
+                    attached_policies.append(
+                        {'PolicyArn': entity_details['PermissionsBoundary']['PermissionsBoundaryArn']})
+                entity = {'name': entity_details[f'{resource_type.title()}Name'],
+                          'id': entity_details[f'{resource_type.title()}Id']}
+                for policy_arn in {policy['PolicyArn'] for policy in attached_policies}:
+                    attached_entities.setdefault(policy_arn, {}).setdefault(resource_type + 's', []).append(entity)
+
+        policies = []
+        for policy_details in authorization_details['Policies']:
+            # As when listing the policies, only those attached as permissions policies are kept
+            if not policy_details.get('AttachmentCount'):
+                continue
+            policy = {key: value for key, value in policy_details.items()
+                      if key not in ['PolicyVersionList', 'Description']}
+            policy['PolicyDocument'] = next(version['Document'] for version in policy_details['PolicyVersionList']
+                                            if version['IsDefaultVersion'])
+            policy['attached_to'] = attached_entities.get(policy['Arn'], {})
+            policies.append(policy)
         return policies
 
     async def _get_and_set_policy_details(self, policy):
@@ -99,14 +148,29 @@ class IAMFacade(AWSBaseFacade):
 
     async def get_users(self):
         users = await AWSFacadeUtils.get_all_pages('iam', None, self.session, 'list_users', 'Users')
-        await get_and_set_concurrently(
-            [functools.partial(self._get_and_set_inline_policies, iam_resource_type='user'),
-             self._get_and_set_user_groups,
-             self._get_and_set_user_tags,
-             self._get_and_set_user_login_profile,
-             self._get_and_set_user_access_keys,
-             self._get_and_set_user_mfa_devices],
-            users)
+        authorization_details = await self._get_authorization_details()
+        users_details = {user['UserId']: user for user in (authorization_details or {}).get('UserDetailList', [])}
+
+        for user in users:
+            user_details = users_details.get(user['UserId'])
+            if user_details:
+                self._set_inline_policies(user, user_details.get('UserPolicyList', []))
+                user['groups'] = user_details.get('GroupList', [])
+                user['tags'] = {'Tags': user_details.get('Tags', [])}
+
+        await asyncio.gather(
+            # The login profiles, access keys and MFA devices are not part of the authorization details
+            get_and_set_concurrently(
+                [self._get_and_set_user_login_profile,
+                 self._get_and_set_user_access_keys,
+                 self._get_and_set_user_mfa_devices],
+                users),
+            # Users created after the authorization details were fetched
+            get_and_set_concurrently(
+                [functools.partial(self._get_and_set_inline_policies, iam_resource_type='user'),
+                 self._get_and_set_user_groups,
+                 self._get_and_set_user_tags],
+                [user for user in users if user['UserId'] not in users_details]))
         return users
 
     async def _get_and_set_user_login_profile(self, user: {}):
@@ -134,16 +198,25 @@ class IAMFacade(AWSBaseFacade):
 
     async def get_roles(self):
         roles = await AWSFacadeUtils.get_all_pages('iam', None, self.session, 'list_roles', 'Roles')
+        authorization_details = await self._get_authorization_details()
+        roles_details = {role['RoleId']: role for role in (authorization_details or {}).get('RoleDetailList', [])}
         for role in roles:
             role['instances_count'] = 'N/A'
             # Get trust relationship
             role['assume_role_policy'] = {}
             role['assume_role_policy']['PolicyDocument'] = role.pop(
                 'AssumeRolePolicyDocument')
+
+            role_details = roles_details.get(role['RoleId'])
+            if role_details:
+                self._set_inline_policies(role, role_details.get('RolePolicyList', []))
+                self._set_role_profiles(role, role_details.get('InstanceProfileList', []))
+                role['tags'] = {'Tags': role_details.get('Tags', [])}
+        # Roles created after the authorization details were fetched
         await get_and_set_concurrently(
             [functools.partial(self._get_and_set_inline_policies, iam_resource_type='role'),
              self._get_and_set_role_profiles,
-             self._get_and_set_role_tags], roles)
+             self._get_and_set_role_tags], [role for role in roles if role['RoleId'] not in roles_details])
 
         return roles
 
@@ -155,6 +228,9 @@ class IAMFacade(AWSBaseFacade):
         profiles = await AWSFacadeUtils.get_all_pages(
             'iam', None, self.session, 'list_instance_profiles_for_role', 'InstanceProfiles',
             RoleName=role['RoleName'])
+        self._set_role_profiles(role, profiles)
+
+    def _set_role_profiles(self, role: {}, profiles: []):
         role.setdefault('instance_profiles', {})
         for profile in profiles:
             profile_id = profile['InstanceProfileId']
@@ -247,6 +323,38 @@ class IAMFacade(AWSBaseFacade):
                     resource['inline_policies'][policy_id]['name'] = policy_name
                 resource['inline_policies_count'] = len(resource['inline_policies'])
 
+    def _set_inline_policies(self, resource, policies):
+        resource['inline_policies'] = {}
+        for policy in policies:
+            resource['inline_policies'][get_non_provider_id(policy['PolicyName'])] = {
+                'PolicyDocument': self._normalize_statements(policy['PolicyDocument']),
+                'name': policy['PolicyName']
+            }
+        resource['inline_policies_count'] = len(resource['inline_policies'])
+
+    async def _get_authorization_details(self):
+        """
+        Gets in a few pages the users, groups and roles with their inline policies, and the managed policies with
+        their versions, once for all the IAM resources
+
+        :return: A dictionary of the entity lists, or None if the account authorization details could not be fetched,
+        in which case the resources are fetched one by one.
+        """
+        async with self._authorization_details_lock:
+            if self._authorization_details is None:
+                client = AWSFacadeUtils.get_client('iam', self.session)
+                paginator = client.get_paginator('get_account_authorization_details').paginate()
+                try:
+                    self._authorization_details = await run_concurrently(
+                        lambda: AWSFacadeUtils._get_all_pages_from_paginator(
+                            paginator, ['UserDetailList', 'GroupDetailList', 'RoleDetailList', 'Policies']),
+                        operation='get_account_authorization_details')
+                except Exception as e:
+                    print_warning(f'Failed to get the account authorization details, fetching the IAM resources one '
+                                  f'by one: {e}')
+                    self._authorization_details = {}
+            return self._authorization_details or None
+
     def _normalize_statements(self, policy_document):
         if policy_document:
             if type(policy_document['Statement']) == list:
@@ -1,12 +1,23 @@
+import asyncio
+import threading
+import weakref
+
 import boto3
+from botocore.config import Config
 from botocore.exceptions import ClientError
+from botocore.paginate import TokenEncoder
 
 from ScoutSuite.core.conditions import print_exception
 from ScoutSuite.providers.utils import run_concurrently
 
 
 class AWSFacadeUtils:
-    _clients = {}
+    # Clients of each session, released with the session when its scan ends
+    _clients = weakref.WeakKeyDictionary()
+    _clients_lock = threading.Lock()
+    _clients_hits = 0
+    _clients_misses = 0
+    _max_pool_connections = None
 
     @staticmethod
     async def get_all_pages(service: str, region: str, session: boto3.session.Session, paginator_name: str,
@@ -54,7 +65,8 @@ class AWSFacadeUtils:
 
         # Getting all pages from a paginator requires API calls so we need to do it concurrently:
         try:
-            return await run_concurrently(lambda: AWSFacadeUtils._get_all_pages_from_paginator(paginator, entities))
+            return await run_concurrently(lambda: AWSFacadeUtils._get_all_pages_from_paginator(paginator, entities),
+                                          operation=paginator_name)
         except ClientError as e:
             if e.response['Error']['Code'] in ['AccessDenied',
                                                'AccessDeniedException',
@@ -65,6 +77,75 @@ class AWSFacadeUtils:
             else:
                 raise
 
+    @staticmethod
+    async def get_pages(service: str, region: str, session: boto3.session.Session, paginator_name: str,
+                        entity: str, **paginator_args):
+        """
+        Yields the entities of each page of a paginator as soon as the page is fetched, fetching the next page while
+        the caller processes the current one
+
+        :param service:str: Name of the AWS service (ec2, iam, etc.)
+        :param region:str: Region
+        :param session:boto3.session.Session: Boto3 session used to authenticate the client
+        :param paginator_name:str: Name of the paginator
+        :param entity:str: Key used to retreive the entities in the paginator's response
+        :param **paginator_args: Arguments passed to the paginator
+
+        :return: An async iterator over the lists of entities of each page.
+        """
+
+        client = AWSFacadeUtils.get_client(service, session, region)
+        paginator = client.get_paginator(paginator_name)
+        page_iterator = paginator.paginate(**paginator_args)
+        pages = iter(page_iterator)
+        last_page = None
+
+        def fetch_next_page():
+            nonlocal page_iterator, pages, last_page
+            if pages is None:
+                # A page iterator cannot be resumed once an API call failed, so the throttled calls are retried with a
+                # new one, starting from the token of the last page fetched
+                pagination_args = paginator_args
+                if last_page is not None:
+                    starting_token = TokenEncoder().encode(page_iterator._get_next_token(last_page))
+                    pagination_config = {**paginator_args.get('PaginationConfig', {}), 'StartingToken': starting_token}
+                    pagination_args = {**paginator_args, 'PaginationConfig': pagination_config}
+                page_iterator = paginator.paginate(**pagination_args)
+                pages = iter(page_iterator)
+            try:
+                page = next(pages, None)
+            except Exception:
+                pages = None
+                raise
+            if page is not None:
+                last_page = page
+            return page
+
+        def get_next_page():
+            return run_concurrently(fetch_next_page, operation=paginator_name)
+
+        next_page = asyncio.ensure_future(get_next_page())
+        try:
+            while True:
+                try:
+                    page = await next_page
+                except ClientError as e:
+                    if e.response['Error']['Code'] in ['AccessDenied',
+                                                       'AccessDeniedException',
+                                                       'UnauthorizedOperation',
+                                                       'AuthorizationError']:
+                        print_exception(f'Failed to get all pages from paginator for the {service} service: {e}')
+                        return
+                    else:
+                        raise
+                if page is None:
+                    return
+                next_page = asyncio.ensure_future(get_next_page())
+                yield page[entity]
+        finally:
+            # The caller stopped iterating or failed, the page being fetched is not needed anymore
+            next_page.cancel()
+
     @staticmethod
     def _get_all_pages_from_paginator(paginator, entities: list):
         resources = {entity: [] for entity in entities}
@@ -79,7 +160,7 @@ class AWSFacadeUtils:
     @staticmethod
     def get_client(service: str, session: boto3.session.Session, region: str = None):
         """
-        Instantiates an AWS API client
+        Returns the AWS API client of a session for a service and region, instantiating it on the first call
 
         :param service: Service targeted, e.g. ec2
         :param session: The aws session
@@ -88,10 +169,42 @@ class AWSFacadeUtils:
         :return:
         """
 
-        try:
-            return AWSFacadeUtils._clients.setdefault(
-                (service, region),
-                session.client(service, region_name=region) if region else session.client(service))
-        except Exception as e:
-            print_exception(f'Failed to create client for the {service} service: {e}')
-            return None
+        key = (service, region)
+        # Sessions are not thread-safe, so clients are also instantiated under the lock
+        with AWSFacadeUtils._clients_lock:
+            clients = AWSFacadeUtils._clients.setdefault(session, {})
+            client = clients.get(key)
+            if client is not None:
+                AWSFacadeUtils._clients_hits += 1
+                return client
+            try:
+                config = Config(max_pool_connections=AWSFacadeUtils._max_pool_connections) \
+                    if AWSFacadeUtils._max_pool_connections else None
+                client = session.client(service, region_name=region, config=config)
+            except Exception as e:
+                print_exception(f'Failed to create client for the {service} service: {e}')
+                return None
+            AWSFacadeUtils._clients_misses += 1
+            clients[key] = client
+            return client
+
+    @staticmethod
+    def set_max_pool_connections(max_pool_connections: int):
+        """
+        Sets the size of the connection pool of the clients instantiated afterwards
+
+        :param max_pool_connections: Maximum number of connections of each client, e.g. the number of workers
+        """
+
+        AWSFacadeUtils._max_pool_connections = max_pool_connections
+
+    @staticmethod
+    def get_clients_stats():
+        """
+        :return: Dict of the number of clients reused (hits), instantiated (misses) and pooled (size)
+        """
+
+        with AWSFacadeUtils._clients_lock:
+            return {'hits': AWSFacadeUtils._clients_hits,
+                    'misses': AWSFacadeUtils._clients_misses,
+                    'size': sum(len(clients) for clients in AWSFacadeUtils._clients.values())}
@@ -2,6 +2,8 @@ import copy
 import os
 
 from ScoutSuite.core.console import print_error, print_exception, print_warning, print_debug
+from ScoutSuite.providers.aws.facade.endpoints import AWSEndpoints
+from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
 from ScoutSuite.providers.aws.services import AWSServicesConfig
 from ScoutSuite.providers.aws.resources.vpc.base import put_cidr_name
 from ScoutSuite.providers.aws.utils import ec2_classic, get_aws_account_id, get_partition_name
@@ -35,6 +37,10 @@ class AWSProvider(BaseProvider):
 
         self.credentials = kwargs['credentials']
 
+        # Size the connection pool of the API clients to the number of threads sharing them
+        AWSFacadeUtils.set_max_pool_connections(kwargs.get('max_workers'))
+        AWSEndpoints.set_cache_dir(kwargs.get('endpoints_cache_dir'))
+
         self.partition = get_partition_name(self.credentials.session)
 
         self.account_id = get_aws_account_id(self.credentials.session)
@@ -12,10 +12,10 @@ class AmazonMachineImages(AWSResources):
         self.resource_type = 'amazon-machine-image'
 
     async def fetch_all(self):
-        raw_images = await self.facade.ec2.get_images(self.region)
-        for raw_image in raw_images:
-            name, resource = self._parse_image(raw_image)
-            self[name] = resource
+        async for raw_images in self.facade.ec2.get_image_pages(self.region):
+            for raw_image in raw_images:
+                name, resource = self._parse_image(raw_image)
+                self[name] = resource
 
     def _parse_image(self, raw_image):
         raw_image['id'] = raw_image.get('ImageId')
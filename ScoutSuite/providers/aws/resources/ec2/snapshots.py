@@ -12,10 +12,10 @@ class Snapshots(AWSResources):
         self.resource_type = 'snapshot'
 
     async def fetch_all(self):
-        raw_snapshots = await self.facade.ec2.get_snapshots(self.region)
-        for raw_snapshot in raw_snapshots:
-            name, resource = self._parse_snapshot(raw_snapshot)
-            self[name] = resource
+        async for raw_snapshots in self.facade.ec2.get_snapshot_pages(self.region):
+            for raw_snapshot in raw_snapshots:
+                name, resource = self._parse_snapshot(raw_snapshot)
+                self[name] = resource
 
     def _parse_snapshot(self, raw_snapshot):
         snapshot_dict = {}
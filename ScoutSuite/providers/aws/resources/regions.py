@@ -1,5 +1,8 @@
 import abc
+import asyncio
+from functools import partial
 
+from ScoutSuite.core.checkpoint import get_fetch_journal
 from ScoutSuite.providers.aws.resources.base import AWSCompositeResources
 from ScoutSuite.providers.aws.facade.base import AWSFacade
 
@@ -18,10 +21,23 @@ class Regions(AWSCompositeResources, metaclass=abc.ABCMeta):
                 'name': region
             }
 
-        await self._fetch_children_of_all_resources(
-            resources=self['regions'],
-            scopes={region: {'region': region} for region in self['regions']}
-        )
+        journal = get_fetch_journal()
+        if journal:
+            # Journal each region once fetched, so that a resumed run only fetches the remaining regions
+            tasks = {
+                asyncio.ensure_future(
+                    journal.fetch(self['regions'][region],
+                                  partial(self._fetch_children, self['regions'][region], {'region': region}),
+                                  self.service, region)
+                ) for region in self['regions']
+            }
+            if tasks:
+                await asyncio.wait(tasks)
+        else:
+            await self._fetch_children_of_all_resources(
+                resources=self['regions'],
+                scopes={region: {'region': region} for region in self['regions']}
+            )
 
         self._set_counts()
 
@@ -1,4 +1,6 @@
+from ScoutSuite.core.console import print_debug
 from ScoutSuite.providers.aws.facade.base import AWSFacade
+from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
 from ScoutSuite.providers.aws.resources.acm.base import Certificates
 from ScoutSuite.providers.aws.resources.awslambda.base import Lambdas
 from ScoutSuite.providers.aws.resources.cloudformation.base import CloudFormation
@@ -147,5 +149,10 @@ class AWSServicesConfig(BaseServicesConfig):
         except NameError as _:
             pass
 
+    async def fetch(self, services: list, regions: list, excluded_regions: list):
+        await super().fetch(services, regions, excluded_regions)
+        stats = AWSFacadeUtils.get_clients_stats()
+        print_debug(f'Reused API clients {stats["hits"]} times, instantiated {stats["misses"]} clients')
+
     def _is_provider(self, provider_name):
         return provider_name == 'aws'
@@ -1,16 +1,93 @@
 import re
+import threading
+import weakref
+
+from botocore.awsrequest import AWSResponse
+from botocore.exceptions import ClientError
 
 from ScoutSuite.core.console import print_exception
+from ScoutSuite.core.recorder import ResponseStore, get_response_store
+from ScoutSuite.core.telemetry import add_response_bytes, get_fetch_telemetry
 
 ec2_classic = "EC2-Classic"
 
+# Identities of the sessions' credentials, released with the sessions
+caller_identities = weakref.WeakKeyDictionary()
+caller_identities_lock = threading.Lock()
+
 
 def get_caller_identity(session):
-    sts_client = session.client("sts")
-    identity = sts_client.get_caller_identity()
+    """
+    Returns the identity of a session's credentials, calling STS only once per session
+
+    :param session:                     Boto3 session
+    :return:                            Response of sts.get_caller_identity
+    """
+    with caller_identities_lock:
+        identity = caller_identities.get(session)
+    if identity is None:
+        sts_client = session.client("sts")
+        identity = sts_client.get_caller_identity()
+        with caller_identities_lock:
+            caller_identities[session] = identity
     return identity
 
 
+def record_responses(session):
+    """
+    Records the responses of the API calls made by the clients of a session, or replays them, when a response store is
+    set. Must be called before the clients are created.
+
+    :param session:                     Boto3 session
+    """
+    store = get_response_store()
+    if not store:
+        return
+    session.events.register('before-parameter-build', _set_response_key, unique_id='scout-response-key')
+    if store.replay:
+        session.events.register('before-call', _replay_response, unique_id='scout-replay-response')
+    else:
+        session.events.register('after-call', _record_response, unique_id='scout-record-response')
+
+
+def measure_responses(session):
+    """
+    Counts the size of the responses of the API calls made by the clients of a session in the fetch telemetry, when
+    set. Must be called before the clients are created.
+
+    :param session:                     Boto3 session
+    """
+    if not get_fetch_telemetry():
+        return
+    session.events.register('after-call', _measure_response, unique_id='scout-measure-response')
+
+
+def _measure_response(http_response, model, **kwargs):
+    # Streamed bodies are left for the caller to read, and replayed responses have no body
+    if not model.has_streaming_output and http_response.raw is not None:
+        add_response_bytes(len(http_response.content))
+
+
+def _set_response_key(params, model, context, **kwargs):
+    context['scout_response_key'] = ResponseStore.get_key(
+        'aws', model.service_model.service_name, context.get('client_region'), model.name, params)
+
+
+def _replay_response(context, **kwargs):
+    response = get_response_store().load(context['scout_response_key'])
+    if response is None:
+        return None
+    return AWSResponse(None, response['status_code'], {}, None), response['parsed']
+
+
+def _record_response(http_response, parsed, model, context, **kwargs):
+    # Throttling and server errors would be replayed on every retry
+    status_code = http_response.status_code
+    if status_code >= 500 or (status_code >= 300 and is_throttled(ClientError(parsed, model.name))):
+        return
+    get_response_store().save(context['scout_response_key'], {'status_code': status_code, 'parsed': parsed})
+
+
 def get_aws_account_id(session):
     caller_identity = get_caller_identity(session)
     account_id = caller_identity["Arn"].split(":")[4]
@@ -1,5 +1,7 @@
 import json
 import logging
+import threading
+import time
 from getpass import getpass
 
 import requests
@@ -21,6 +23,8 @@ class AzureCredentials:
                  context=None):
 
         self.identity_credentials = identity_credentials  # Azure Resource Manager API credentials
+        # Credentials shared by all the clients, so that they do not each request their own tokens
+        self.cached_credentials = CachedTokenCredential(identity_credentials)
         self.tenant_id = tenant_id
         self.default_subscription_id = default_subscription_id
         self.context = context
@@ -44,7 +48,37 @@ class AzureCredentials:
                 return None
 
     def get_credentials(self):
-        return self.identity_credentials
+        return self.cached_credentials
+
+
+class CachedTokenCredential:
+    """
+    Wraps credentials to share their access tokens between the clients until they are about to expire, e.g. rather
+    than running the Azure CLI for each client authenticated by the CLI
+    """
+
+    # Tokens are renewed when they expire in less than this number of seconds, as the clients' own cache does
+    refresh_margin = 300
+
+    def __init__(self, credential):
+        """
+        :param credential:              Credentials implementing get_token, e.g. from azure.identity
+        """
+        self.credential = credential
+        self.tokens = {}
+        self._lock = threading.Lock()
+
+    def get_token(self, *scopes, **kwargs):
+        # Tokens requested with claims answer a challenge of the API, so they cannot come from the cache
+        if kwargs.get('claims'):
+            return self.credential.get_token(*scopes, **kwargs)
+
+        key = (scopes, kwargs.get('tenant_id'))
+        with self._lock:
+            token = self.tokens.get(key)
+            if token is None or token.expires_on - time.time() < self.refresh_margin:
+                token = self.tokens[key] = self.credential.get_token(*scopes, **kwargs)
+        return token
 
 
 class AzureAuthenticationStrategy(AuthenticationStrategy):
@@ -2,8 +2,8 @@ from azure.mgmt.web import WebSiteManagementClient
 
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.azure.utils import get_resource_group_name
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently
-from ScoutSuite.utils import get_user_agent
 
 
 class AppServiceFacade:
@@ -12,9 +12,7 @@ class AppServiceFacade:
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = WebSiteManagementClient(self.credentials.get_credentials(),
-                                         subscription_id=subscription_id, user_agent=get_user_agent())
-        return client
+        return AzureFacadeUtils.get_client(WebSiteManagementClient, self.credentials, subscription_id)
 
     async def get_web_apps(self, subscription_id: str):
         try:
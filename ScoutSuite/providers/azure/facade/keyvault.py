@@ -1,8 +1,8 @@
 from azure.mgmt.keyvault import KeyVaultManagementClient
 
 from ScoutSuite.core.console import print_exception
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.providers.utils import run_concurrently
-from ScoutSuite.utils import get_user_agent
 
 
 class KeyVaultFacade:
@@ -11,9 +11,7 @@ class KeyVaultFacade:
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = KeyVaultManagementClient(self.credentials.get_credentials(),
-                                          subscription_id=subscription_id, user_agent=get_user_agent())
-        return client
+        return AzureFacadeUtils.get_client(KeyVaultManagementClient, self.credentials, subscription_id)
 
     async def get_key_vaults(self, subscription_id: str):
         try:
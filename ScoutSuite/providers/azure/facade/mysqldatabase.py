@@ -1,7 +1,7 @@
 from azure.mgmt.rdbms.mysql import MySQLManagementClient
 from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.utils import get_user_agent
 
 
 class MySQLDatabaseFacade:
@@ -10,10 +10,7 @@ class MySQLDatabaseFacade:
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = MySQLManagementClient(self.credentials.get_credentials(),
-                                       subscription_id=subscription_id,
-                                       user_agent=get_user_agent())
-        return client
+        return AzureFacadeUtils.get_client(MySQLManagementClient, self.credentials, subscription_id)
 
     async def get_servers(self, subscription_id: str):
         try:
@@ -1,8 +1,8 @@
 from azure.mgmt.network import NetworkManagementClient
 
 from ScoutSuite.core.console import print_exception
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.providers.utils import run_concurrently
-from ScoutSuite.utils import get_user_agent
 
 
 class NetworkFacade:
@@ -11,10 +11,7 @@ class NetworkFacade:
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = NetworkManagementClient(self.credentials.get_credentials(),
-                                         subscription_id=subscription_id,
-                                         user_agent=get_user_agent())
-        return client
+        return AzureFacadeUtils.get_client(NetworkManagementClient, self.credentials, subscription_id)
 
     async def get_network_watchers(self, subscription_id: str):
         try:
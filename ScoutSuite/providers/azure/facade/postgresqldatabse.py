@@ -1,7 +1,7 @@
 from azure.mgmt.rdbms.postgresql import PostgreSQLManagementClient
 from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.utils import get_user_agent
 
 
 class PostgreSQLDatabaseFacade:
@@ -10,10 +10,7 @@ class PostgreSQLDatabaseFacade:
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = PostgreSQLManagementClient(self.credentials.get_credentials(),
-                                            subscription_id=subscription_id,
-                                            user_agent=get_user_agent())
-        return client
+        return AzureFacadeUtils.get_client(PostgreSQLManagementClient, self.credentials, subscription_id)
 
     async def get_servers(self, subscription_id: str):
         try:
@@ -1,8 +1,8 @@
 from azure.mgmt.authorization import AuthorizationManagementClient
 
 from ScoutSuite.core.console import print_exception
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.providers.utils import run_concurrently
-from ScoutSuite.utils import get_user_agent
 
 
 class RBACFacade:
@@ -11,10 +11,7 @@ class RBACFacade:
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = AuthorizationManagementClient(self.credentials.get_credentials(),
-                                               subscription_id=subscription_id,
-                                               user_agent=get_user_agent())
-        return client
+        return AzureFacadeUtils.get_client(AuthorizationManagementClient, self.credentials, subscription_id)
 
     async def get_roles(self, subscription_id: str):
         try:
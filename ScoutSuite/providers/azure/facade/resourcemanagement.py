@@ -1,6 +1,6 @@
 from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.utils import get_user_agent
 from azure.mgmt.resource import ResourceManagementClient
 
 
@@ -10,10 +10,7 @@ class ResourceManagementFacade:
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = ResourceManagementClient(self.credentials.get_credentials(),
-                                          subscription_id=subscription_id,
-                                          user_agent=get_user_agent())
-        return client
+        return AzureFacadeUtils.get_client(ResourceManagementClient, self.credentials, subscription_id)
 
     async def get_specific_type_resources_with_filter(self, subscription_id: str, resource_type_filter: str):
         try:
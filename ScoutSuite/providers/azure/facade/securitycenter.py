@@ -1,8 +1,8 @@
 from azure.mgmt.security import SecurityCenter
 
 from ScoutSuite.core.console import print_exception, print_debug
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.providers.utils import run_concurrently
-from ScoutSuite.utils import get_user_agent
 
 
 class SecurityCenterFacade:
@@ -11,10 +11,7 @@ class SecurityCenterFacade:
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = SecurityCenter(self.credentials.get_credentials(),
-                                subscription_id, '',
-                                user_agent=get_user_agent())
-        return client
+        return AzureFacadeUtils.get_client(SecurityCenter, self.credentials, subscription_id, '')
 
     async def get_pricings(self, subscription_id: str):
         try:
@@ -1,8 +1,8 @@
 
 from azure.mgmt.sql import SqlManagementClient
 from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.core.console import print_exception
-from ScoutSuite.utils import get_user_agent
 
 
 class SQLDatabaseFacade:
@@ -11,11 +11,7 @@ class SQLDatabaseFacade:
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = SqlManagementClient(self.credentials.get_credentials(),
-                                     subscription_id=subscription_id,
-                                     user_agent=get_user_agent())
-
-        return client
+        return AzureFacadeUtils.get_client(SqlManagementClient, self.credentials, subscription_id)
 
     async def get_database_blob_auditing_policies(self, resource_group_name, server_name, database_name,
                                                   subscription_id: str):
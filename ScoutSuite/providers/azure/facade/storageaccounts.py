@@ -3,8 +3,8 @@ from azure.mgmt.monitor import MonitorManagementClient
 from azure.mgmt.storage import StorageManagementClient
 
 from ScoutSuite.core.console import print_exception
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.providers.utils import run_concurrently, get_and_set_concurrently
-from ScoutSuite.utils import get_user_agent
 
 
 class StorageAccountsFacade:
@@ -13,10 +13,7 @@ class StorageAccountsFacade:
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-        client = StorageManagementClient(self.credentials.get_credentials(),
-                                         subscription_id=subscription_id,
-                                         user_agent=get_user_agent())
-        return client
+        return AzureFacadeUtils.get_client(StorageManagementClient, self.credentials, subscription_id)
 
     async def get_storage_accounts(self, subscription_id: str):
         try:
@@ -60,7 +57,7 @@ class StorageAccountsFacade:
             return blob_services
 
     async def _get_and_set_activity_logs(self, storage_account, subscription_id: str):
-        client = MonitorManagementClient(self.credentials.get_credentials(), subscription_id, user_agent=get_user_agent())
+        client = AzureFacadeUtils.get_client(MonitorManagementClient, self.credentials, subscription_id)
 
         # Time format used by Azure API:
         time_format = "%Y-%m-%dT%H:%M:%S.%f"
@@ -0,0 +1,85 @@
+import threading
+import weakref
+
+import requests
+from azure.core.pipeline.transport import RequestsTransport
+from urllib3.util.retry import Retry
+
+from ScoutSuite.utils import get_user_agent
+
+
+class AzureFacadeUtils:
+    # Clients of each AzureCredentials, released with the credentials when their scan ends
+    _clients = weakref.WeakKeyDictionary()
+    _clients_lock = threading.Lock()
+    _clients_hits = 0
+    _clients_misses = 0
+    _max_pool_connections = None
+    _session = None
+
+    @staticmethod
+    def get_client(client_class, credentials, subscription_id: str, *args):
+        """
+        Returns the management client of a subscription, instantiated on the first call and shared by all the facades
+        and threads using the same credentials afterwards. The clients share the credentials' tokens and a single pool
+        of connections.
+
+        :param client_class: Class of the management client, e.g. StorageManagementClient
+        :param credentials: AzureCredentials used to authenticate the client
+        :param subscription_id: Subscription ID
+        :param args: Additional arguments of the client, following the subscription ID
+
+        :return:
+        """
+
+        key = (client_class, subscription_id, *args)
+        with AzureFacadeUtils._clients_lock:
+            clients = AzureFacadeUtils._clients.setdefault(credentials, {})
+            client = clients.get(key)
+            if client is not None:
+                AzureFacadeUtils._clients_hits += 1
+                return client
+            # The transport does not close the shared session when a client is closed
+            transport = RequestsTransport(session=AzureFacadeUtils._get_session(), session_owner=False)
+            client = client_class(credentials.get_credentials(), subscription_id, *args,
+                                  user_agent=get_user_agent(), transport=transport)
+            AzureFacadeUtils._clients_misses += 1
+            clients[key] = client
+            return client
+
+    @staticmethod
+    def set_max_pool_connections(max_pool_connections: int):
+        """
+        Sets the size of the connection pool shared by the clients instantiated afterwards
+
+        :param max_pool_connections: Maximum number of connections to each endpoint, e.g. the number of workers
+        """
+
+        with AzureFacadeUtils._clients_lock:
+            AzureFacadeUtils._max_pool_connections = max_pool_connections
+            AzureFacadeUtils._session = None
+
+    @staticmethod
+    def get_clients_stats():
+        """
+        :return: Dict of the number of clients reused (hits), instantiated (misses) and pooled (size)
+        """
+
+        with AzureFacadeUtils._clients_lock:
+            return {'hits': AzureFacadeUtils._clients_hits,
+                    'misses': AzureFacadeUtils._clients_misses,
+                    'size': sum(len(clients) for clients in AzureFacadeUtils._clients.values())}
+
+    @staticmethod
+    def _get_session():
+        if AzureFacadeUtils._session is None:
+            session = requests.Session()
+            # Configured as the sessions of the transports, which let the pipelines retry the requests
+            adapter_args = {'pool_maxsize': AzureFacadeUtils._max_pool_connections} \
+                if AzureFacadeUtils._max_pool_connections else {}
+            adapter = requests.adapters.HTTPAdapter(
+                max_retries=Retry(total=False, redirect=False, raise_on_status=False), **adapter_args)
+            for protocol in ['http://', 'https://']:
+                session.mount(protocol, adapter)
+            AzureFacadeUtils._session = session
+        return AzureFacadeUtils._session
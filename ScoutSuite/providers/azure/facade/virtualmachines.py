@@ -1,8 +1,8 @@
 from azure.mgmt.compute import ComputeManagementClient
 
 from ScoutSuite.core.console import print_exception
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.providers.utils import run_concurrently
-from ScoutSuite.utils import get_user_agent
 
 
 class VirtualMachineFacade:
@@ -11,11 +11,7 @@ class VirtualMachineFacade:
         self.credentials = credentials
 
     def get_client(self, subscription_id: str):
-
-        client = ComputeManagementClient(self.credentials.get_credentials(),
-                                         subscription_id=subscription_id,
-                                         user_agent=get_user_agent())
-        return client
+        return AzureFacadeUtils.get_client(ComputeManagementClient, self.credentials, subscription_id)
 
     async def get_instances(self, subscription_id: str):
         try:
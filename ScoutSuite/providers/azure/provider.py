@@ -3,6 +3,7 @@ import os
 from ScoutSuite.core.console import print_exception
 
 from ScoutSuite.providers.base.provider import BaseProvider
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.providers.azure.services import AzureServicesConfig
 
 
@@ -28,6 +29,9 @@ class AzureProvider(BaseProvider):
         self.programmatic_execution = kwargs['programmatic_execution']
         self.credentials = kwargs['credentials']
 
+        # Size the connection pool of the API clients to the number of threads sharing them
+        AzureFacadeUtils.set_max_pool_connections(kwargs.get('max_workers'))
+
         if subscription_ids:
             self.subscription_ids = subscription_ids
         elif self.credentials.default_subscription_id:
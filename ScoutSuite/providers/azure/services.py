@@ -1,5 +1,7 @@
 from ScoutSuite.providers.azure.authentication_strategy import AzureCredentials
+from ScoutSuite.core.console import print_debug
 from ScoutSuite.providers.azure.facade.base import AzureFacade
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.providers.azure.resources.aad.base import AAD
 from ScoutSuite.providers.azure.resources.rbac.base import RBAC
 from ScoutSuite.providers.azure.resources.keyvault.base import KeyVaults
@@ -82,3 +84,6 @@ class AzureServicesConfig(BaseServicesConfig):
         if 'rbac' in services and 'aad' in services:
             user_list = self.rbac.get_user_id_list()
             await self.aad.fetch_additional_users(user_list)
+
+        stats = AzureFacadeUtils.get_clients_stats()
+        print_debug(f'Reused API clients {stats["hits"]} times, instantiated {stats["misses"]} clients')
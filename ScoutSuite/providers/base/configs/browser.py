@@ -1,5 +1,3 @@
-import copy
-
 from ScoutSuite.core.console import print_exception
 
 
@@ -81,7 +79,7 @@ def get_value_at(all_info, current_path, key, to_string=False):
             if len(keys) > len(current_path):
                 target_path = target_path + keys[len(target_path):]
         else:
-            target_path = copy.deepcopy(current_path)
+            target_path = list(current_path)
             target_path.append(key)
         target_obj = all_info
         for p in target_path:
@@ -294,110 +294,114 @@ class BaseProvider:
 
     def _go_to_and_do(self, current_config, path, current_path, callback, callback_args=None):
         """
-        Recursively go to a target and execute a callback
+        Go to a target and execute a callback
         """
-        try:
-            key = path.pop(0)
-            if not current_config and hasattr(self, 'config'):
-                current_config = self.config
-            if not current_path:
-                current_path = []
-            keys = key.split('.')
-            if len(keys) > 1:
-                while True:
-                    key = keys.pop(0)
-                    if not len(keys):
-                        break
-                    current_path.append(key)
-                    current_config = current_config[key]
-            if key in current_config:
-                current_path.append(key)
-                current_config_key = current_config[key]
-                for (i, value) in enumerate(list(current_config_key)):
-                    if len(path) == 0:
-                        if type(current_config_key == dict) and type(value) != dict and type(value) != list:
-                            callback(current_config_key[value], path, current_path, value, callback_args)
-                        else:
-                            callback(current_config, path, current_path, value, callback_args)
+        for current_config, key, current_path in self._iter_go_to(current_config, path, current_path):
+            try:
+                for value in list(current_config[key]):
+                    if type(value) != dict and type(value) != list:
+                        callback(current_config[key][value], [], current_path, value, callback_args)
                     else:
-                        tmp = copy.deepcopy(current_path)
-                        try:
-                            tmp.append(value)
-                            self._go_to_and_do(current_config_key[value], copy.deepcopy(path), tmp, callback,
-                                               callback_args)
-                        except:
-                            tmp.pop()
-                            tmp.append(i)
-                            self._go_to_and_do(current_config_key[i], copy.deepcopy(path), tmp, callback,
-                                               callback_args)
-
-        except Exception as e:
-            print_exception(e, {'current path': f'{current_path}',
-                                'key': '{}'.format(key if 'key' in locals() else 'not defined'),
-                                'value': '{}'.format(value if 'value' in locals() else 'not defined'),
-                                'path': f'{path}',
-                                }
-                            )
+                        callback(current_config, [], current_path, value, callback_args)
+            except Exception as e:
+                print_exception(e, {'current path': f'{current_path}',
+                                    'key': f'{key}',
+                                    'value': '{}'.format(value if 'value' in locals() else 'not defined'),
+                                    'path': '[]',
+                                    }
+                                )
 
     def _new_go_to_and_do(self, current_config, path, current_path, callbacks):
         """
-        Recursively go to a target and execute a callback
+        Go to a target and execute callbacks
         """
-        try:
-            key = path.pop(0)
-            if not current_config:
-                current_config = self.config
-            if not current_path:
-                current_path = []
-            keys = key.split('.')
-            if len(keys) > 1:
-                while True:
-                    key = keys.pop(0)
-                    if not len(keys):
-                        break
-                    current_path.append(key)
+        for current_config, key, current_path in self._iter_go_to(current_config, path, current_path):
+            try:
+                values = list(current_config[key])
+            except Exception as e:
+                print_exception(e, {'current path': f'{current_path}', 'key': f'{key}', 'path': '[]'})
+                continue
+            for value in values:
+                for callback_info in callbacks:
+                    callback_name = callback_info[0]
+                    try:
+                        callback = getattr(self, callback_name)
+
+                        callback_args = callback_info[1]
+                        if type(value) != dict and type(value) != list:
+                            callback(current_config[key][value],
+                                     [],
+                                     current_path,
+                                     value,
+                                     callback_args)
+                        else:
+                            callback(current_config, [], current_path, value, callback_args)
+                    except Exception as e:
+                        print_exception(f'Error when calling callback {callback_name} with value {value}: {e}',
+                                        {'callback': callback_name,
+                                         'callback arguments': callback_args,
+                                         'current path': f'{current_path}',
+                                         'key': f'{key}',
+                                         'value': f'{value}',
+                                         'path': '[]'})
+
+    def _iter_go_to(self, current_config, path, current_path):
+        """
+        Iterate over the configs targeted by a path, as expected by the `_go_to_and_do` callbacks. Each key of the path
+        selects an attribute, and every value of that attribute is walked through. The walk uses a single stack and
+        immutable paths, so no path is copied on the way down.
+
+        :param current_config:              The config the walk starts from
+        :param path:                        The keys to walk through, a key may be a dotted path
+        :param current_path:                The path of `current_config`
+        :return:                            Generator of (config, key, current_path), where the callbacks apply to
+                                            every value of config[key]
+        """
+        path = tuple(path)
+        stack = [(0, iter([(tuple(current_path) if current_path else (), current_config)]))]
+        while stack:
+            depth, children = stack[-1]
+            try:
+                for current_path, current_config in children:
+                    break
+                else:
+                    stack.pop()
+                    continue
+            except Exception as e:
+                stack.pop()
+                print_exception(e, {'current path': f'{list(current_path)}', 'path': f'{list(path[depth:])}'})
+                continue
+            try:
+                key = path[depth]
+                if not current_config and hasattr(self, 'config'):
+                    current_config = self.config
+                keys = key.split('.')
+                for key in keys[:-1]:
+                    current_path += (key,)
                     current_config = current_config[key]
-            if key in current_config:
-                current_path.append(key)
-                for (i, value) in enumerate(list(current_config[key])):
-                    if len(path) == 0:
-                        for callback_info in callbacks:
-                            callback_name = callback_info[0]
-                            try:
-                                callback = getattr(self, callback_name)
-
-                                callback_args = callback_info[1]
-                                if type(current_config[key] == dict) and type(value) != dict and type(value) != list:
-                                    callback(current_config[key][value],
-                                             path,
-                                             current_path,
-                                             value,
-                                             callback_args)
-                                else:
-                                    callback(current_config, path, current_path, value, callback_args)
-                            except Exception as e:
-                                print_exception(f'Error when calling callback {callback_name} with value {value}: {e}',
-                                                {'callback': callback_name,
-                                                 'callback arguments': callback_args,
-                                                 'current path': f'{current_path}',
-                                                 'key': '{}'.format(key if 'key' in locals() else 'not defined'),
-                                                 'value': '{}'.format(
-                                                     value if 'value' in locals() else 'not defined'),
-                                                 'path': f'{path}'})
-                    else:
-                        tmp = copy.deepcopy(current_path)
-                        try:
-                            tmp.append(value)
-                            self._new_go_to_and_do(current_config[key][value], copy.deepcopy(path), tmp,
-                                                   callbacks)
-                        except:
-                            tmp.pop()
-                            tmp.append(i)
-                            self._new_go_to_and_do(current_config[key][i], copy.deepcopy(path), tmp, callbacks)
-        except Exception as e:
-            print_exception(e, {'current path': f'{current_path}',
-                                'key': '{}'.format(key if 'key' in locals() else 'not defined'),
-                                'value': '{}'.format(value if 'value' in locals() else 'not defined'),
-                                'path': f'{path}',
-                                }
-                            )
+                key = keys[-1]
+                if key not in current_config:
+                    continue
+                current_path += (key,)
+            except Exception as e:
+                print_exception(e, {'current path': f'{list(current_path)}',
+                                    'key': '{}'.format(key if 'key' in locals() else 'not defined'),
+                                    'path': f'{list(path[depth + 1:])}',
+                                    }
+                                )
+                continue
+            if depth == len(path) - 1:
+                yield current_config, key, list(current_path)
+            else:
+                stack.append((depth + 1, self._iter_go_to_children(current_path, current_config[key])))
+
+    @staticmethod
+    def _iter_go_to_children(current_path, children):
+        for (i, value) in enumerate(list(children)):
+            try:
+                child = children[value]
+                child_path = current_path + (value,)
+            except Exception:
+                child = children[i]
+                child_path = current_path + (i,)
+            yield child_path, child
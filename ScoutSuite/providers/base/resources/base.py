@@ -8,6 +8,7 @@ used to reflect that.
 import abc
 import asyncio
 from ScoutSuite.core.console import print_exception
+from ScoutSuite.core.ratelimiter import rate_limit_scope, set_rate_limit_scope
 
 
 async def call(child_name, child):
@@ -84,11 +85,16 @@ class CompositeResources(Resources, metaclass=abc.ABCMeta):
         children = [(child_class(self.facade, **scope), child_name)
                     for (child_class, child_name) in self._children]
 
-        tasks = []
-        for (child, child_name) in children:
-            task = asyncio.create_task(call(child_name, child.fetch_all))
-            tasks.append(task)
-            
+        # The children's tasks inherit the rate limit of the resource's region
+        scope_token = set_rate_limit_scope(region=scope.get('region'))
+        try:
+            tasks = []
+            for (child, child_name) in children:
+                task = asyncio.create_task(call(child_name, child.fetch_all))
+                tasks.append(task)
+        finally:
+            rate_limit_scope.reset(scope_token)
+
         await asyncio.wait(tasks)
 
         # Update parent content:
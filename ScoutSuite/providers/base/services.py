@@ -1,6 +1,8 @@
 import asyncio
 
+from ScoutSuite.core.checkpoint import get_fetch_journal
 from ScoutSuite.core.console import print_exception, print_debug, print_info
+from ScoutSuite.core.ratelimiter import set_rate_limit_scope
 from ScoutSuite.providers.aws.utils import get_partition_name
 from ScoutSuite.utils import format_service_name
 
@@ -27,16 +29,24 @@ class BaseServicesConfig:
                 if service not in services and service != 'credentials':
                     print_debug('Skipping the {} service'.format(format_service_name(service)))
 
-            # Then, fetch concurrently all services:
+            # Then, fetch concurrently all services, starting with those expected to take the longest:
             if services:
-                tasks = {
+                scheduler = getattr(asyncio.get_event_loop(), 'scheduler', None)
+                if scheduler:
+                    services = scheduler.sort_services(services)
+                tasks = [
                     asyncio.ensure_future(
                         self._fetch(service, regions, excluded_regions)
                     ) for service in services
-                }
+                ]
                 await asyncio.wait(tasks)
 
     async def _fetch(self, service, regions=None, excluded_regions=None):
+        # Each service is fetched in its own task, so the scope only applies to the service's API calls
+        set_rate_limit_scope(service=service)
+        scheduler = getattr(asyncio.get_event_loop(), 'scheduler', None)
+        if scheduler:
+            scheduler.start_service(service)
         try:
             print_info('Fetching resources for the {} service'.format(format_service_name(service)))
             service_config = getattr(self, service)
@@ -53,11 +63,21 @@ class BaseServicesConfig:
                     if service != 'iam':
                         method_args['partition_name'] = get_partition_name(self.credentials.session)
 
-                await service_config.fetch_all(**method_args)                
-                if hasattr(service_config, 'finalize'):
-                    await service_config.finalize()
+                async def fetch_service():
+                    await service_config.fetch_all(**method_args)
+                    if hasattr(service_config, 'finalize'):
+                        await service_config.finalize()
+
+                journal = get_fetch_journal()
+                if journal:
+                    await journal.fetch(service_config, fetch_service, service)
+                else:
+                    await fetch_service()
             else:
                 print_debug(f'No method to fetch service {service}.')
         except Exception as e:
             print(e) # for debugging
             print_exception(f'Could not fetch {format_service_name(service)} configuration: {e}')
+        finally:
+            if scheduler:
+                scheduler.complete_service(service)
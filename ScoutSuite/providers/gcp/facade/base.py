@@ -2,6 +2,7 @@ import json
 import asyncio
 
 from ScoutSuite.core.console import print_exception, print_info, print_warning, print_debug
+from ScoutSuite.core.ratelimiter import set_rate_limit_scope
 from ScoutSuite.providers.gcp.facade.basefacade import GCPBaseFacade
 from ScoutSuite.providers.gcp.facade.cloudresourcemanager import CloudResourceManagerFacade
 from ScoutSuite.providers.gcp.facade.cloudsql import CloudSQLFacade
@@ -19,6 +20,9 @@ from ScoutSuite.providers.gcp.facade.bigquery import BigQueryFacade
 from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
 from ScoutSuite.utils import format_service_name
 
+# Projects whose enabled services are fetched at the same time
+MAX_CONCURRENT_SERVICES_FETCHES = 10
+
 
 class GCPFacade(GCPBaseFacade):
     def __init__(self,
@@ -44,9 +48,9 @@ class GCPFacade(GCPBaseFacade):
         self.stackdriverlogging = StackdriverLoggingFacade()
         self.stackdrivermonitoring = StackdriverMonitoringFacade()
 
-        # lock to minimize concurrent calls to get_services()
-        self.projects_services_lock = False
+        # Fetches of the enabled services of each project, shared by all the services
         self.projects_services = {}
+        self.projects_services_semaphore = asyncio.Semaphore(MAX_CONCURRENT_SERVICES_FETCHES)
 
         # Instantiate facades for proprietary services
         try:
@@ -152,47 +156,28 @@ class GCPFacade(GCPBaseFacade):
         finally:
             return projects
 
-    async def get_enabled_services(self, project_id, attempt=1, has_lock=False):
-        timeout = 60*attempt
+    async def get_enabled_services(self, project_id):
+        """
+        Returns the services enabled in a project, fetched once for all the GCP services: concurrent callers await the
+        same fetch, and the projects are fetched concurrently
+        """
         if project_id not in self.projects_services:
-            # not locked, make query
-            if has_lock or not self.projects_services_lock:
-                self.projects_services_lock = True
-                try:
-                    serviceusage_client = self._build_arbitrary_client('serviceusage', 'v1', force_new=True)
-                    services = serviceusage_client.services()
-                    request = services.list(parent=f'projects/{project_id}', pageSize=200, filter="state:ENABLED")
-                    services_response = await GCPFacadeUtils.get_all('services', request, services)
-                    self.projects_services[project_id] = services_response
-                    self.projects_services_lock = False
-                    return self.projects_services[project_id]
-                except Exception as e:
-                    # hit quota, wait and retry
-                    if ('API_SHARED_QUOTA_EXHAUSTED' in str(e) or 'RATE_LIMIT_EXCEEDED' in str(e)) and attempt <= 10:
-                        print_warning(f"Service Usage quotas exceeded for project \"{project_id}\", retrying in {timeout}s")
-                        await asyncio.sleep(timeout)
-                        return await self.get_enabled_services(project_id, attempt + 1, has_lock=True)
-                    # unknown error
-                    else:
-                        print_warning(f"Could not fetch the state of services for project \"{project_id}\": {e}")
-                        self.projects_services_lock = False
-                        return None
-            # locked, wait and retry
-            else:
-                if attempt <= 10:  # need to set a limit to ensure we don't hit recursion limits
-                    if attempt != 1:
-                        print_debug(f"Lock already acquired for get_services() on project \"{project_id}\", retrying in {timeout}s")
-                        await asyncio.sleep(timeout)
-                    # set a lower threshold for the first attempt so that execution runs faster when there aren't any issues
-                    else:
-                        await asyncio.sleep(10)
-                    return await self.get_enabled_services(project_id, attempt + 1)
-                else:
-                    print_warning(f"Could not fetch the state of services for project \"{project_id}\", "
-                                  f"exiting before hitting maximum recursion")
-                    return None
-        else:
-            return self.projects_services[project_id]
+            self.projects_services[project_id] = asyncio.ensure_future(self._get_enabled_services(project_id))
+        # A cancelled caller must not cancel the fetch awaited by the others
+        return await asyncio.shield(self.projects_services[project_id])
+
+    async def _get_enabled_services(self, project_id):
+        # The Service Usage quota is shared by all the projects, so are the rate limit and its backoff when throttled
+        set_rate_limit_scope(service='serviceusage')
+        async with self.projects_services_semaphore:
+            try:
+                serviceusage_client = self._build_arbitrary_client('serviceusage', 'v1', force_new=True)
+                services = serviceusage_client.services()
+                request = services.list(parent=f'projects/{project_id}', pageSize=200, filter="state:ENABLED")
+                return await GCPFacadeUtils.get_all('services', request, services)
+            except Exception as e:
+                print_warning(f"Could not fetch the state of services for project \"{project_id}\": {e}")
+                return None
 
     async def is_api_enabled(self, project_id, service):
         """
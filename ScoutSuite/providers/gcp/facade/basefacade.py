@@ -6,17 +6,34 @@
 import httplib2shim
 httplib2shim.patch()
 
+import asyncio
+
+import httplib2
+from googleapiclient import errors
 from googleapiclient import http
 from googleapiclient import discovery
 
+from ScoutSuite.core.recorder import ResponseStore, get_response_store
+from ScoutSuite.core.telemetry import add_response_bytes, get_fetch_telemetry
+from ScoutSuite.providers.gcp.utils import is_throttled
+from ScoutSuite.providers.utils import run_concurrently
 from ScoutSuite.utils import get_user_agent
 
+# Most Google APIs reject the batches of more than 100 requests
+MAX_BATCH_SIZE = 100
+# Time during which the requests made concurrently by a facade are collected in the same batch
+BATCH_DELAY = 0.01
+
 
 class GCPBaseFacade:
     def __init__(self, client_name: str, client_version: str):
         self._client_name = client_name
         self._client_version = client_version
         self._client = None
+        self._batch = []
+        self._batch_timer = None
+        # The event loop only keeps weak references to the tasks, so the batches being sent are kept until they are done
+        self._batch_tasks = set()
 
     def _build_client(self) -> discovery.Resource:
         return self._build_arbitrary_client(self._client_name, self._client_version)
@@ -32,17 +49,127 @@ class GCPBaseFacade:
         if force_new:
             client = discovery.build(client_name, client_version, cache_discovery=False, cache=MemoryCache())
             http.set_user_agent(client._http, get_user_agent())  # force set custom user agent
+            self._record_responses(client)
             return client
         else:
             if not self._client:
                 client = discovery.build(client_name, client_version, cache_discovery=False, cache=MemoryCache())
                 http.set_user_agent(client._http, get_user_agent())  # force set custom user agent
+                self._record_responses(client)
                 self._client = client
             return self._client
 
     def _get_client(self) -> discovery.Resource:
         return self._build_client()
 
+    async def _execute_batched(self, request):
+        """
+        Executes a request in a batch with the other requests made by the facade at the same time, e.g. the IAM
+        policies of all the keys of a project. The batch is sent once it is full, or BATCH_DELAY seconds after its
+        first request.
+
+        :param request: Request built by the facade's client
+        :return: The response of the request.
+        """
+        # The utils import this module
+        from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
+
+        if get_response_store():
+            # The boundaries of the batches are random, so the batched responses could not be replayed
+            return await GCPFacadeUtils.execute(request)
+
+        response = asyncio.get_event_loop().create_future()
+        self._batch.append((request, response))
+        if len(self._batch) >= MAX_BATCH_SIZE:
+            self._send_batch()
+        elif self._batch_timer is None:
+            self._batch_timer = asyncio.get_event_loop().call_later(BATCH_DELAY, self._send_batch)
+
+        try:
+            return await response
+        except errors.HttpError as e:
+            if not is_throttled(e):
+                raise
+        # The throttled requests are retried on their own, with the backoff of the rate limiter
+        return await GCPFacadeUtils.execute(request)
+
+    def _send_batch(self):
+        if self._batch_timer:
+            self._batch_timer.cancel()
+            self._batch_timer = None
+        batch, self._batch = self._batch, []
+        task = asyncio.ensure_future(self._execute_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._batch_tasks.discard)
+
+    async def _execute_batch(self, batch):
+        """
+        :param batch: List of the requests to execute in a single batch request, and of the futures of their responses
+        """
+        from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
+
+        # The callback runs in the executor's thread, the responses are dispatched once the batch is executed
+        results = {}
+        batch_request = self._get_client().new_batch_http_request(
+            callback=lambda request_id, result, exception: results.update({request_id: (result, exception)}))
+        for request_id, (request, _) in enumerate(batch):
+            batch_request.add(request, request_id=str(request_id))
+        first_request = batch[0][0]
+        try:
+            await run_concurrently(
+                lambda: batch_request.execute(http=GCPFacadeUtils._get_thread_http(first_request.http)),
+                operation=f'{first_request.methodId} (batch)')
+        except Exception as e:
+            results = {str(request_id): (None, e) for request_id in range(len(batch))}
+
+        for request_id, (_, response) in enumerate(batch):
+            # The task awaiting the response may have been cancelled
+            if response.done():
+                continue
+            result, exception = results[str(request_id)]
+            if exception:
+                response.set_exception(exception)
+            else:
+                response.set_result(result)
+
+    @staticmethod
+    def _record_responses(client: discovery.Resource):
+        if get_response_store() or get_fetch_telemetry():
+            client._http = RecordedHttp(client._http)
+
+
+class RecordedHttp:
+    """
+    Wraps the HTTP object of a client to record the responses of its requests in the response store, or replay them,
+    and their size in the fetch telemetry
+    """
+
+    def __init__(self, http):
+        self._http = http
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        store = get_response_store()
+        if not store:
+            resp, content = self._http.request(uri, method, body=body, headers=headers, **kwargs)
+            add_response_bytes(len(content or b''))
+            return resp, content
+
+        key = ResponseStore.get_key('gcp', method, uri, body)
+        if store.replay:
+            response = store.load(key)
+            if response is not None:
+                return httplib2.Response(response['headers']), response['content']
+
+        resp, content = self._http.request(uri, method, body=body, headers=headers, **kwargs)
+        add_response_bytes(len(content or b''))
+        # Throttling and server errors would be replayed on every retry
+        if not store.replay and resp.status < 500 and resp.status != 429:
+            store.save(key, {'headers': {**resp, 'status': str(resp.status)}, 'content': content})
+        return resp, content
+
+    def __getattr__(self, name):
+        return getattr(self._http, name)
+
 
 class MemoryCache:
     """
@@ -1,7 +1,7 @@
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.gcp.facade.basefacade import GCPBaseFacade
 from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
-from ScoutSuite.providers.utils import map_concurrently, run_concurrently
+from ScoutSuite.providers.utils import map_concurrently
 
 
 class BigQueryFacade(GCPBaseFacade):
@@ -30,9 +30,7 @@ class BigQueryFacade(GCPBaseFacade):
             bigquery_client = self._get_client()
             datasets = bigquery_client.datasets()
             request = datasets.get(projectId=project_id, datasetId=dataset_id)
-            return await run_concurrently(
-                lambda: request.execute()
-            )
+            return await self._execute_batched(request)
         except Exception as e:
             print_exception(f'Failed to retrieve BigQuery datasets {dataset_id}: {e}')
             return {}
@@ -1,7 +1,6 @@
 from ScoutSuite.core.console import print_exception
 from ScoutSuite.providers.gcp.facade.basefacade import GCPBaseFacade
 from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
-from ScoutSuite.providers.utils import run_concurrently
 
 class CloudSQLFacade(GCPBaseFacade):
     def __init__(self):
@@ -30,9 +29,8 @@ class CloudSQLFacade(GCPBaseFacade):
     async def get_users(self, project_id: str, instance_name: str):
         try:
             cloudsql_client = self._get_client()
-            response = await run_concurrently(
-                    lambda: cloudsql_client.users().list(project=project_id, instance=instance_name).execute()
-            )
+            response = await self._execute_batched(
+                cloudsql_client.users().list(project=project_id, instance=instance_name))
             return response.get('items', [])
         except Exception as e:
             if 'The requested operation is not valid for an on-premises instance.' in str(e):
@@ -1,3 +1,5 @@
+import asyncio
+
 from ScoutSuite.core.console import print_exception, print_warning
 from ScoutSuite.providers.gcp.facade.basefacade import GCPBaseFacade
 from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
@@ -7,16 +9,23 @@ from ScoutSuite.providers.utils import run_concurrently
 class GCEFacade(GCPBaseFacade):
     def __init__(self):
         super().__init__('compute', 'v1')
+        self.zonal_resources_cache_locks = {}
+        self.zonal_resources_cache = {}
+        self.common_instance_metadata_cache_locks = {}
+        self.common_instance_metadata_cache = {}
 
     async def get_disks(self, project_id, zone):
+        return await self._get_zonal_resources(project_id, zone, self._get_aggregated_disks)
+
+    async def _get_aggregated_disks(self, project_id):
         try:
             gce_client = self._get_client()
-            request = gce_client.disks().list(project=project_id, zone=zone)
+            request = gce_client.disks().aggregatedList(project=project_id)
             disks_group = gce_client.disks()
-            return await GCPFacadeUtils.get_all('items', request, disks_group)
+            return await GCPFacadeUtils.get_all_aggregated('disks', request, disks_group)
         except Exception as e:
             print_exception(f'Failed to retrieve disks: {e}')
-            return []
+            return {}
 
     async def get_firewalls(self, project_id):
         try:
@@ -29,26 +38,55 @@ class GCEFacade(GCPBaseFacade):
             return []
 
     async def get_instances(self, project_id, zone):
+        return await self._get_zonal_resources(project_id, zone, self._get_aggregated_instances)
+
+    async def _get_aggregated_instances(self, project_id):
         try:
-            instances = []
+            instances = {}
             gce_client = self._get_client()
-            request = gce_client.instances().list(project=project_id, zone=zone)
+            request = gce_client.instances().aggregatedList(project=project_id)
             instances_group = gce_client.instances()
-            instances = await GCPFacadeUtils.get_all('items', request, instances_group)
+            instances = await GCPFacadeUtils.get_all_aggregated('instances', request, instances_group)
         except Exception as e:
             print_exception(f'Failed to retrieve compute instances: {e}')
         else:
-            await self._add_metadata(project_id, instances)
+            for zone_instances in instances.values():
+                await self._add_metadata(project_id, zone_instances)
         finally:
             return instances
 
+    async def _get_zonal_resources(self, project_id, zone, get_aggregated_resources):
+        """
+        Fetches the resources of all the zones of a project in a single aggregated list on the first call, and
+        returns those of the zone from the cache on the following calls
+
+        :param project_id:                  Project ID
+        :param zone:                        Zone name
+        :param get_aggregated_resources:    Coroutine function returning the resources of a project keyed by zone
+        :return:                            List of the resources of the zone
+        """
+        key = (project_id, get_aggregated_resources.__name__)
+        async with self.zonal_resources_cache_locks.setdefault(key, asyncio.Lock()):
+            if key not in self.zonal_resources_cache:
+                self.zonal_resources_cache[key] = await get_aggregated_resources(project_id)
+
+        return self.zonal_resources_cache[key].get(zone, [])
+
     async def _add_metadata(self, project_id, instances):
-        project = await self.get_project(project_id)
-        common_instance_metadata = self.metadata_to_dict(project['commonInstanceMetadata'])
+        common_instance_metadata = await self._get_common_instance_metadata(project_id)
         for instance in instances:
             instance['metadata'] = self.metadata_to_dict(instance['metadata'])
             instance['commonInstanceMetadata'] = common_instance_metadata
 
+    async def _get_common_instance_metadata(self, project_id):
+        async with self.common_instance_metadata_cache_locks.setdefault(project_id, asyncio.Lock()):
+            if project_id not in self.common_instance_metadata_cache:
+                project = await self.get_project(project_id)
+                self.common_instance_metadata_cache[project_id] = \
+                    self.metadata_to_dict(project['commonInstanceMetadata']) if project else {}
+
+        return self.common_instance_metadata_cache[project_id]
+
     def metadata_to_dict(self, metadata):
         return {item['key']: item['value'] for item in metadata['items']} if 'items' in metadata else {}
 
@@ -22,9 +22,8 @@ class IAMFacade(GCPBaseFacade):
         try:
             resource = f'projects/{project_id}/serviceAccounts/{service_account_email}'
             iam_client = self._get_client()
-            response = await run_concurrently(
-                    lambda: iam_client.projects().serviceAccounts().getIamPolicy(resource=resource).execute()
-            )
+            response = await self._execute_batched(
+                iam_client.projects().serviceAccounts().getIamPolicy(resource=resource))
             return response.get('bindings', [])
         except Exception as e:
             print_exception(f'Failed to retrieve service account IAM policy bindings: {e}')
@@ -34,10 +33,8 @@ class IAMFacade(GCPBaseFacade):
         try:
             name = f'projects/{project_id}/serviceAccounts/{service_account_email}'
             iam_client = self._get_client()
-            response = await run_concurrently(
-                    lambda: iam_client.projects().serviceAccounts().keys().list(name=name,
-                                                                                keyTypes=key_types).execute()
-            )
+            response = await self._execute_batched(
+                iam_client.projects().serviceAccounts().keys().list(name=name, keyTypes=key_types))
             return response.get('keys', [])
         except Exception as e:
             print_exception(f'Failed to retrieve service account keys: {e}')
@@ -60,18 +57,12 @@ class IAMFacade(GCPBaseFacade):
             role = role.split("_withcond_")[0] # remove the condition key to get the actual role
             iam_client = self._get_client()
             if 'projects/' in role:
-                response = await run_concurrently(
-                    lambda: iam_client.projects().roles().get(name=role).execute()
-                )
+                request = iam_client.projects().roles().get(name=role)
             elif 'organizations/' in role:
-                response = await run_concurrently(
-                    lambda: iam_client.organizations().roles().get(name=role).execute()
-                )
+                request = iam_client.organizations().roles().get(name=role)
             else:
-                response = await run_concurrently(
-                    lambda: iam_client.roles().get(name=role).execute()
-                )
-            return response
+                request = iam_client.roles().get(name=role)
+            return await self._execute_batched(request)
         except Exception as e:
             print_exception(f'Failed to retrieve IAM role definition for role {role}: {e}')
             return {}
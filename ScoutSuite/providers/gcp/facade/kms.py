@@ -61,8 +61,8 @@ class KMSFacade(GCPBaseFacade):
             parent = self.cloud_client.crypto_key_path(project_id, location, keyring_name, key_name)
             kms_client = self._get_client()
             cryptokeys = kms_client.projects().locations().keyRings().cryptoKeys()
-            request = cryptokeys.getIamPolicy(resource=parent)
-            return await GCPFacadeUtils.get_all('bindings', request, cryptokeys)
+            response = await self._execute_batched(cryptokeys.getIamPolicy(resource=parent))
+            return response.get('bindings', [])
         except Exception as e:
             print_exception(f'Failed to retrieve KMS binding policy for key {key_name}: {e}')
             return []
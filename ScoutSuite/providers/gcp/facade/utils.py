@@ -1,18 +1,105 @@
+import asyncio
+import threading
+import weakref
+
+import google_auth_httplib2
+from googleapiclient import http
+
+from ScoutSuite.providers.gcp.facade.basefacade import RecordedHttp
 from ScoutSuite.providers.utils import run_concurrently
+from ScoutSuite.utils import get_user_agent
 
 
 class GCPFacadeUtils:
+    # HTTP objects of each worker thread, keyed by the clients' HTTP objects they replace
+    _thread_https = threading.local()
+
     @staticmethod
-    async def _get_all(resources, resource_key: str, request, resources_group):
-        while request is not None:
-            response = request.execute()
-            resources.extend(response.get(resource_key, []))
-            request = await run_concurrently(
-                lambda: resources_group.list_next(previous_request=request, previous_response=response)
-            )
+    async def get_pages(resource_key: str, request, resources_group, list_next='list_next'):
+        """
+        Yields the resources of each page of a list request as soon as the page is fetched, fetching the next page
+        while the caller processes the current one
+
+        :param resource_key: Key of the resources in the responses, e.g. items
+        :param request: First list request
+        :param resources_group: Resources group of the client that created the request, building the next requests
+        :param list_next: Name of the method of the resources group building the next requests, e.g.
+        aggregatedList_next
+        :return: An async iterator over the lists of resources of each page.
+        """
+
+        next_response = asyncio.ensure_future(GCPFacadeUtils.execute(request))
+        try:
+            while True:
+                response = await next_response
+                # Building the next request does not call the API
+                request = getattr(resources_group, list_next)(previous_request=request, previous_response=response)
+                if request is not None:
+                    next_response = asyncio.ensure_future(GCPFacadeUtils.execute(request))
+                yield response.get(resource_key, [])
+                if request is None:
+                    return
+        finally:
+            # The caller stopped iterating or failed, the page being fetched is not needed anymore
+            next_response.cancel()
 
     @staticmethod
     async def get_all(resource_key: str, request, resources_group):
         resources = []
-        await GCPFacadeUtils._get_all(resources, resource_key, request, resources_group)
+        async for page in GCPFacadeUtils.get_pages(resource_key, request, resources_group):
+            resources.extend(page)
+        return resources
+
+    @staticmethod
+    async def get_all_aggregated(resource_key: str, request, resources_group):
+        """
+        :param resource_key: Key of the resources in the scopes of the responses, e.g. instances
+        :param request: First aggregatedList request
+        :param resources_group: Resources group of the client that created the request, building the next requests
+        :return: A dictionary of the resources of each scope, keyed by the scope's name, e.g. us-east1-b. The scopes
+        without resources are left out.
+        """
+        resources = {}
+        async for page in GCPFacadeUtils.get_pages('items', request, resources_group, 'aggregatedList_next'):
+            # The scopes are named after their collection, e.g. zones/us-east1-b
+            for scope, scoped_resources in page.items():
+                if resource_key in scoped_resources:
+                    resources.setdefault(scope.split('/')[-1], []).extend(scoped_resources[resource_key])
         return resources
+
+    @staticmethod
+    async def execute(request):
+        """
+        Executes a request in the default executor, with the HTTP object of the executing thread
+
+        :param request: Request built by a client
+        :return: The response of the request.
+        """
+        return await run_concurrently(
+            lambda: request.execute(http=GCPFacadeUtils._get_thread_http(request.http)),
+            operation=request.methodId)
+
+    @staticmethod
+    def _get_thread_http(client_http):
+        """
+        :param client_http: HTTP object of a client
+        :return: An equivalent HTTP object only used by the current thread, or the client's HTTP object if it cannot
+        be copied
+        """
+        thread_https = getattr(GCPFacadeUtils._thread_https, 'https', None)
+        if thread_https is None:
+            thread_https = GCPFacadeUtils._thread_https.https = weakref.WeakKeyDictionary()
+        thread_http = thread_https.get(client_http)
+        if thread_http is None:
+            thread_http = thread_https[client_http] = GCPFacadeUtils._copy_http(client_http)
+        return thread_http
+
+    @staticmethod
+    def _copy_http(client_http):
+        authorized_http = client_http._http if isinstance(client_http, RecordedHttp) else client_http
+        # Only the HTTP objects authorized with google-auth credentials can be rebuilt
+        if not isinstance(authorized_http, google_auth_httplib2.AuthorizedHttp):
+            return client_http
+        thread_http = google_auth_httplib2.AuthorizedHttp(authorized_http.credentials, http=http.build_http())
+        http.set_user_agent(thread_http, get_user_agent())
+        return RecordedHttp(thread_http) if isinstance(client_http, RecordedHttp) else thread_http
@@ -1,3 +1,5 @@
+import asyncio
+
 from ScoutSuite.providers.gcp.resources.base import GCPCompositeResources
 
 
@@ -17,9 +19,10 @@ class Projects(GCPCompositeResources):
 
         self['projects'] = {}
         # For each project, validate that the corresponding service API is enabled before including it in the execution.
-        for p in raw_projects:
-            enabled = await self.facade.is_api_enabled(p['projectId'], self.__class__.__name__)
-            if enabled:
+        enabled = await asyncio.gather(*[self.facade.is_api_enabled(p['projectId'], self.__class__.__name__)
+                                         for p in raw_projects])
+        for p, is_enabled in zip(raw_projects, enabled):
+            if is_enabled:
                 self['projects'][p['projectId']] = {}
 
         await self._fetch_children_of_all_resources(
@@ -1,3 +1,4 @@
+import time
 from json import dumps, loads
 from yaml import safe_dump
 
@@ -5,6 +6,9 @@ from google.auth.credentials import Credentials as GCPCredentials
 from kubernetes.client.exceptions import ApiException
 
 from ScoutSuite.core.console import print_error, print_info
+from ScoutSuite.core.ratelimiter import rate_limit_scope
+from ScoutSuite.core.recorder import ResponseStore, get_response_store
+from ScoutSuite.core.telemetry import get_fetch_telemetry
 from ScoutSuite.providers.aws.authentication_strategy import AWSCredentials
 from ScoutSuite.providers.azure.authentication_strategy import AzureCredentials
 from ScoutSuite.providers.kubernetes.authentication_strategy import ClusterProvider, KubernetesCredentials
@@ -50,11 +54,34 @@ class KubernetesBaseFacade:
             path = '/' + path
         print_info(f'GET {path}')
 
+        store = get_response_store()
+        if store:
+            key = ResponseStore.get_key('kubernetes', self.api_client.configuration.host, path)
+            if store.replay:
+                response = store.load(key)
+                if response is not None:
+                    return response['data']
+
+        start = time.monotonic()
         try:
-            return loads(self.api_client.call_api(path, 'GET', auth_settings=['BearerToken'], response_type='json', _preload_content=False)[0].data)
+            content = self.api_client.call_api(path, 'GET', auth_settings=['BearerToken'], response_type='json', _preload_content=False)[0].data
+            data = loads(content)
         except:
+            self._record_call(path, start, failed=True)
             print_error(f'Failed to get {path}')
             return None
+        self._record_call(path, start, len(content))
+
+        if store and not store.replay:
+            store.save(key, {'data': data})
+        return data
+
+    @staticmethod
+    def _record_call(path, start, size=0, failed=False):
+        telemetry = get_fetch_telemetry()
+        if telemetry:
+            service, _ = rate_limit_scope.get()
+            telemetry.record(service, f'GET {path}', None, time.monotonic() - start, size, failed=failed)
 
     @classmethod
     def parse_data(self, raw_resources):
@@ -1,9 +1,13 @@
 import asyncio
 import inspect
+import random
 import re
+import time
 from hashlib import sha1
 
 from ScoutSuite.core.console import print_info, print_warning
+from ScoutSuite.core.ratelimiter import rate_limit_scope
+from ScoutSuite.core.telemetry import get_fetch_telemetry, measure_response_bytes
 from ScoutSuite.providers.aws.utils import is_throttled as aws_is_throttled
 from ScoutSuite.providers.gcp.utils import is_throttled as gcp_is_throttled
 
@@ -21,24 +25,70 @@ def get_non_provider_id(name):
     return f'scoutid-{name_hash.hexdigest()}'
 
 
-async def run_concurrently(function, backoff_seconds=15):
-    try:
-        async with asyncio.get_event_loop().throttler:
-            return await run_function_concurrently(function)
-    except Exception as e:
-        raise
-        """
-        Commented out so this does not trigger errors from is_throttled, which is not fully implemented
-        # Determine whether the exception is due to API throttling
-        if is_throttled(e):
+async def run_concurrently(function, backoff_seconds=1, max_retries=5, operation=None):
+    """
+    Runs function `function` in the default executor once a token of the current scope's rate limit and a worker
+    granted by the loop's scheduler are available, retrying it with a jittered exponential backoff while the API
+    throttles the calls. The call is recorded by the fetch telemetry, if set.
+
+    :param function: function to be executed concurrently, in a dedicated thread.
+    :param backoff_seconds: maximum delay before the first retry, doubled at each retry.
+    :param max_retries: maximum number of retries once throttled.
+    :param operation: name of the operation recorded by the telemetry, defaults to the function's caller.
+    :return: the value returned by function `function`.
+    """
+    loop = asyncio.get_event_loop()
+    rate_limiter = getattr(loop, 'rate_limiter', None)
+    bucket = rate_limiter.get_bucket() if rate_limiter else None
+    scheduler = getattr(loop, 'scheduler', None)
+    telemetry = get_fetch_telemetry()
+    measured_function = measure_response_bytes(function)
+    latency = 0.0
+    size = 0
+    for retry in range(max_retries + 1):
+        if bucket:
+            await bucket.acquire()
+        start = time.monotonic()
+        try:
+            async with loop.throttler:
+                if scheduler:
+                    async with scheduler.worker():
+                        result, call_size = await run_function_concurrently(measured_function)
+                else:
+                    result, call_size = await run_function_concurrently(measured_function)
+        except Exception as e:
+            latency += time.monotonic() - start
+            # Determine whether the exception is due to API throttling
+            throttled = is_throttled(e)
+            if throttled and bucket:
+                bucket.on_throttle()
+            if not throttled or retry == max_retries:
+                if telemetry:
+                    _record_call(telemetry, function, operation, latency, size, retry, retry + throttled, True)
+                raise
+            delay = random.uniform(0, backoff_seconds * 2 ** retry)
             source_file = inspect.getsourcefile(function)
             source_file_line = inspect.getsourcelines(function)[1]
-            print_warning(f'Hitting API rate limiting ({"/".join(source_file.split("/")[-2:])} L{source_file_line}), will retry in {backoff_seconds}s')
-            await asyncio.sleep(backoff_seconds)
-            return await run_concurrently(function, backoff_seconds + 15)
+            print_warning(f'Hitting API rate limiting ({"/".join(source_file.split("/")[-2:])} L{source_file_line}), '
+                          f'will retry in {delay:.1f}s')
+            await asyncio.sleep(delay)
         else:
-            raise
-        """
+            latency += time.monotonic() - start
+            size += call_size
+            if bucket:
+                bucket.on_success()
+            if telemetry:
+                _record_call(telemetry, function, operation, latency, size, retry, retry, False)
+            return result
+
+
+def _record_call(telemetry, function, operation, latency, size, retries, throttles, failed):
+    if not operation:
+        # e.g. EC2Facade.get_instances.<locals>.<lambda> is recorded as EC2Facade.get_instances
+        function = getattr(function, 'func', function)
+        operation = getattr(function, '__qualname__', repr(function)).split('.<locals>')[0]
+    service, region = rate_limit_scope.get()
+    telemetry.record(service, operation, region, latency, size, retries, throttles, failed)
 
 
 def run_function_concurrently(function):
@@ -1,11 +1,25 @@
+import asyncio
+import gc
+import tempfile
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from unittest import mock
 
+import boto3
 import pytest
+from asyncio_throttle import Throttler
+from botocore.stub import Stubber
 
+from ScoutSuite.core.recorder import ResponseStore, set_response_store
 from ScoutSuite.providers import get_provider
 from ScoutSuite.providers.aws.authentication_strategy import AWSCredentials
+from ScoutSuite.providers.aws.facade.ec2 import EC2Facade
+from ScoutSuite.providers.aws.facade.endpoints import AWSEndpoints
+from ScoutSuite.providers.aws.facade.iam import IAMFacade
+from ScoutSuite.providers.aws.facade.utils import AWSFacadeUtils
+from ScoutSuite.providers.aws.utils import record_responses
 from ScoutSuite.providers.base.authentication_strategy import AuthenticationException
+from ScoutSuite.providers.utils import get_non_provider_id
 from ScoutSuite.providers.base.authentication_strategy_factory import get_authentication_strategy
 from ScoutSuite.providers.aws.resources.ec2.instances import EC2Instances
 
@@ -173,3 +187,265 @@ hats off to TRON: HereIsSomethingThatAppearsAtEndOfLineMCP
             "0000000000/1111111111/2222222222/3333333",
             "HereIsSomethingThatAppearsAtEndOfLineMCP"
         ]
+
+    def test_get_client(self):
+        session = mock.MagicMock()
+        session.client.side_effect = lambda *args, **kwargs: mock.MagicMock()
+        other_session = mock.MagicMock()
+        other_session.client.side_effect = lambda *args, **kwargs: mock.MagicMock()
+        stats = AWSFacadeUtils.get_clients_stats()
+
+        AWSFacadeUtils.set_max_pool_connections(20)
+        try:
+            client = AWSFacadeUtils.get_client("ec2", session, "us-east-1")
+            assert AWSFacadeUtils.get_client("ec2", session, "us-east-1") is client
+            assert session.client.call_count == 1
+            assert session.client.call_args[1]["config"].max_pool_connections == 20
+
+            # Clients are not shared between sessions nor regions
+            assert AWSFacadeUtils.get_client("ec2", other_session, "us-east-1") is not client
+            assert AWSFacadeUtils.get_client("ec2", session, "us-west-2") is not client
+
+            # Concurrent calls instantiate a single client
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                clients = list(executor.map(lambda _: AWSFacadeUtils.get_client("s3", session), range(32)))
+            assert all(c is clients[0] for c in clients)
+            assert session.client.call_count == 3
+        finally:
+            AWSFacadeUtils.set_max_pool_connections(None)
+
+        new_stats = AWSFacadeUtils.get_clients_stats()
+        assert new_stats["misses"] - stats["misses"] == 4
+        assert new_stats["hits"] - stats["hits"] == 32
+
+        # The clients of a session are released with the session
+        del session, other_session, client, clients
+        gc.collect()
+        assert AWSFacadeUtils.get_clients_stats()["size"] == new_stats["size"] - 4
+
+    @mock.patch("ScoutSuite.providers.aws.facade.ec2.AWSFacadeUtils.get_all_pages")
+    def test_get_vpc_resources(self, mock_get_all_pages):
+        security_groups = [
+            {"GroupId": "sg-1", "VpcId": "vpc-1"},
+            {"GroupId": "sg-2", "VpcId": "vpc-2"},
+            {"GroupId": "sg-3", "VpcId": "vpc-1"},
+        ]
+        mock_get_all_pages.return_value = security_groups
+        facade = EC2Facade(None, "123456789012")
+
+        async def get_security_groups():
+            return await asyncio.gather(*[facade.get_security_groups("us-east-1", vpc)
+                                          for vpc in ["vpc-1", "vpc-2", "vpc-3"]])
+
+        assert asyncio.run(get_security_groups()) == [
+            [security_groups[0], security_groups[2]],
+            [security_groups[1]],
+            [],
+        ]
+        # The region is fetched once, without a VPC filter
+        mock_get_all_pages.assert_called_once_with(
+            "ec2", "us-east-1", None, "describe_security_groups", "SecurityGroups")
+
+        asyncio.run(facade.get_security_groups("us-west-2", "vpc-1"))
+        assert mock_get_all_pages.call_count == 2
+
+    def test_get_image_pages(self):
+        images = [{"ImageId": "ami-1"}, {"ImageId": "ami-2"}]
+        client = mock.MagicMock()
+        client.can_paginate.return_value = False
+        client.describe_images.return_value = {"Images": images}
+
+        async def get_images():
+            return [page async for page in EC2Facade(None, "123456789012").get_image_pages("us-east-1")]
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.throttler = Throttler(rate_limit=999999, period=1)
+            with mock.patch.object(AWSFacadeUtils, "get_client", return_value=client):
+                pages = loop.run_until_complete(get_images())
+        finally:
+            loop.close()
+
+        # Botocore versions without the DescribeImages paginator list the images in a single call
+        assert pages == [images]
+        client.describe_images.assert_called_once_with(
+            Filters=[{"Name": "owner-id", "Values": ["123456789012"]}])
+        client.get_paginator.assert_not_called()
+
+    def test_get_iam_authorization_details(self):
+        statement = {"Effect": "Allow", "Action": "s3:*", "Resource": "*"}
+        authorization_details = {
+            "UserDetailList": [{"UserName": "alice", "UserId": "AIDA1", "GroupList": ["admins"],
+                                "UserPolicyList": [{"PolicyName": "s3",
+                                                    "PolicyDocument": {"Statement": dict(statement)}}],
+                                "AttachedManagedPolicies": [{"PolicyArn": "arn:policy1"}],
+                                "Tags": [{"Key": "team", "Value": "security"}]}],
+            "GroupDetailList": [{"Path": "/", "GroupName": "admins", "GroupId": "AGPA1", "Arn": "arn:group",
+                                 "CreateDate": None, "GroupPolicyList": []}],
+            "RoleDetailList": [{"RoleName": "role", "RoleId": "AROA1",
+                                "InstanceProfileList": [{"InstanceProfileId": "AIPA1", "Arn": "arn:profile",
+                                                         "InstanceProfileName": "profile"}],
+                                "PermissionsBoundary": {"PermissionsBoundaryArn": "arn:policy1"}}],
+            "Policies": [{"PolicyName": "policy1", "PolicyId": "ANPA1", "Arn": "arn:policy1", "AttachmentCount": 1,
+                          "PolicyVersionList": [{"Document": {"Statement": [statement]}, "IsDefaultVersion": True}]},
+                         {"PolicyName": "policy2", "PolicyId": "ANPA2", "Arn": "arn:policy2", "AttachmentCount": 0,
+                          "PolicyVersionList": []}],
+        }
+        pages = {
+            "get_account_authorization_details": [authorization_details],
+            "list_users": [{"Users": [{"UserName": "alice", "UserId": "AIDA1"},
+                                      {"UserName": "bob", "UserId": "AIDA2"}]}],
+            "list_roles": [{"Roles": [{"RoleName": "role", "RoleId": "AROA1", "AssumeRolePolicyDocument": {}}]}],
+            "list_groups_for_user": [{"Groups": [{"GroupName": "devs"}]}],
+        }
+        client = mock.MagicMock()
+        client.get_paginator.side_effect = lambda name: mock.MagicMock(**{"paginate.return_value": pages[name]})
+        client.get_login_profile.return_value = {"LoginProfile": {"UserName": "alice"}}
+        client.list_user_policies.return_value = {"PolicyNames": []}
+        client.list_user_tags.return_value = {"Tags": []}
+
+        async def get_resources(facade):
+            return await asyncio.gather(facade.get_users(), facade.get_groups(), facade.get_roles(),
+                                        facade.get_policies())
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.throttler = Throttler(rate_limit=999999, period=1)
+            with mock.patch.object(AWSFacadeUtils, "get_client", return_value=client):
+                users, groups, roles, policies = loop.run_until_complete(get_resources(IAMFacade(None)))
+        finally:
+            loop.close()
+
+        # The authorization details are fetched once for all the resources
+        assert [c.args for c in client.get_paginator.call_args_list].count(("get_account_authorization_details",)) \
+            == 1
+        assert users[0]["inline_policies"] == {get_non_provider_id("s3"): {
+            "PolicyDocument": {"Statement": {"Effect": "Allow", "Action": ["s3:*"], "Resource": ["*"]}}, "name": "s3"}}
+        assert users[0]["inline_policies_count"] == 1
+        assert (users[0]["groups"], users[0]["tags"]) == (["admins"], {"Tags": [{"Key": "team", "Value": "security"}]})
+        assert users[0]["LoginProfile"] == {"UserName": "alice"}
+        # Users missing from the authorization details are fetched one by one
+        assert (users[1]["groups"], users[1]["inline_policies_count"]) == (["devs"], 0)
+        assert groups == [{"Path": "/", "GroupName": "admins", "GroupId": "AGPA1", "Arn": "arn:group",
+                           "CreateDate": None, "Users": ["AIDA1"], "inline_policies": {}, "inline_policies_count": 0}]
+        assert roles[0]["instance_profiles"] == {"AIPA1": {"arn": "arn:profile", "name": "profile"}}
+        assert [policy["Arn"] for policy in policies] == ["arn:policy1"]
+        assert policies[0]["PolicyDocument"] == {"Statement": [statement]}
+        assert policies[0]["attached_to"] == {"roles": [{"name": "role", "id": "AROA1"}],
+                                              "users": [{"name": "alice", "id": "AIDA1"}]}
+
+    def test_endpoints(self):
+        with tempfile.TemporaryDirectory() as cache_dir, \
+                mock.patch.object(AWSEndpoints, "_session", None), \
+                mock.patch("ScoutSuite.providers.aws.facade.endpoints.Session") as mock_session:
+            session = mock_session.return_value
+            session.get_available_services.return_value = ["ec2", "iam"]
+            session.get_available_regions.return_value = ["us-east-1", "us-west-2"]
+            try:
+                AWSEndpoints.set_cache_dir(cache_dir)
+                for _ in range(3):
+                    assert AWSEndpoints.get_available_services("us-east-1") == ["ec2", "iam"]
+                    assert AWSEndpoints.get_available_regions("ec2", "aws", "us-east-1") == ["us-east-1", "us-west-2"]
+                # A single session reads the endpoint data once
+                mock_session.assert_called_once_with(region_name="us-east-1")
+                session.get_available_services.assert_called_once_with()
+                session.get_available_regions.assert_called_once_with("ec2", "aws")
+
+                # The next runs read it from the disk
+                AWSEndpoints.set_cache_dir(None)
+                AWSEndpoints.set_cache_dir(cache_dir)
+                assert AWSEndpoints.get_available_services() == ["ec2", "iam"]
+                assert AWSEndpoints.get_available_regions("ec2") == ["us-east-1", "us-west-2"]
+                session.get_available_services.assert_called_once_with()
+                session.get_available_regions.assert_called_once_with("ec2", "aws")
+            finally:
+                AWSEndpoints.set_cache_dir(None)
+
+    def test_get_pages(self):
+        events = []
+
+        def paginate(**kwargs):
+            for i in range(3):
+                events.append(f"fetched {i}")
+                yield {"Snapshots": [{"SnapshotId": f"snap-{i}"}]}
+
+        session = mock.MagicMock()
+        session.client.return_value.get_paginator.return_value.paginate.side_effect = paginate
+
+        async def get_pages():
+            pages = []
+            async for snapshots in AWSFacadeUtils.get_pages(
+                    "ec2", "eu-west-3", session, "describe_snapshots", "Snapshots", OwnerIds=["self"]):
+                # Let the next page be fetched
+                await asyncio.sleep(0.01)
+                events.append(f"parsed {len(pages)}")
+                pages.append(snapshots)
+            return pages
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.throttler = Throttler(rate_limit=999999, period=1)
+            pages = loop.run_until_complete(get_pages())
+        finally:
+            loop.close()
+
+        assert pages == [[{"SnapshotId": f"snap-{i}"}] for i in range(3)]
+        session.client.return_value.get_paginator.return_value.paginate.assert_called_once_with(OwnerIds=["self"])
+        # Each page is fetched while the previous one is parsed
+        assert events == ["fetched 0", "fetched 1", "parsed 0", "fetched 2", "parsed 1", "parsed 2"]
+
+    def test_get_pages_throttled(self):
+        client = boto3.client("ec2", region_name="eu-west-3", aws_access_key_id="id", aws_secret_access_key="secret")
+        with Stubber(client) as stubber:
+            stubber.add_response("describe_snapshots", {"Snapshots": [{"SnapshotId": "snap-0"}], "NextToken": "token"},
+                                 {"OwnerIds": ["self"]})
+            stubber.add_client_error("describe_snapshots", service_error_code="RequestLimitExceeded",
+                                     expected_params={"OwnerIds": ["self"], "NextToken": "token"})
+            stubber.add_response("describe_snapshots", {"Snapshots": [{"SnapshotId": "snap-1"}]},
+                                 {"OwnerIds": ["self"], "NextToken": "token"})
+
+            async def get_pages():
+                return [snapshots async for snapshots in AWSFacadeUtils.get_pages(
+                    "ec2", "eu-west-3", None, "describe_snapshots", "Snapshots", OwnerIds=["self"])]
+
+            loop = asyncio.new_event_loop()
+            try:
+                loop.throttler = Throttler(rate_limit=999999, period=1)
+                with mock.patch.object(AWSFacadeUtils, "get_client", return_value=client), \
+                        mock.patch("ScoutSuite.providers.utils.random.uniform", return_value=0):
+                    pages = loop.run_until_complete(get_pages())
+            finally:
+                loop.close()
+
+            # The throttled page is fetched again, without fetching the previous pages again
+            assert pages == [[{"SnapshotId": "snap-0"}], [{"SnapshotId": "snap-1"}]]
+            stubber.assert_no_pending_responses()
+
+    def test_record_responses(self):
+        def get_session():
+            session = boto3.Session(aws_access_key_id="id", aws_secret_access_key="secret", region_name="us-east-1")
+            record_responses(session)
+            return session
+
+        with tempfile.TemporaryDirectory() as directory:
+            try:
+                set_response_store(ResponseStore(directory))
+                client = get_session().client("ec2")
+                with Stubber(client) as stubber:
+                    stubber.add_response("describe_vpcs", {"Vpcs": [{"VpcId": "vpc-1"}]})
+                    stubber.add_client_error("describe_flow_logs", "UnauthorizedOperation", http_status_code=403)
+                    assert client.describe_vpcs()["Vpcs"] == [{"VpcId": "vpc-1"}]
+                    with self.assertRaises(client.exceptions.ClientError):
+                        client.describe_flow_logs()
+
+                # The responses, errors included, are replayed without calling the API
+                store = ResponseStore(directory, replay=True)
+                set_response_store(store)
+                client = get_session().client("ec2")
+                assert client.describe_vpcs()["Vpcs"] == [{"VpcId": "vpc-1"}]
+                with self.assertRaises(client.exceptions.ClientError) as context:
+                    client.describe_flow_logs()
+                assert context.exception.response["Error"]["Code"] == "UnauthorizedOperation"
+                assert store.hits == 2
+            finally:
+                set_response_store(None)
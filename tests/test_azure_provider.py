@@ -1,9 +1,13 @@
+import time
 import unittest
 from unittest import mock
 
 import pytest
+from azure.core.credentials import AccessToken
+from azure.mgmt.storage import StorageManagementClient
 
 from ScoutSuite.providers.azure.authentication_strategy import AzureCredentials
+from ScoutSuite.providers.azure.facade.utils import AzureFacadeUtils
 from ScoutSuite.providers.base.authentication_strategy import AuthenticationException
 from ScoutSuite.providers.base.authentication_strategy_factory import get_authentication_strategy
 
@@ -49,3 +53,38 @@ class TestAzureProviderClass(unittest.TestCase):
         # exception test
         with pytest.raises(AuthenticationException):
             result = azure_authentication_strategy.authenticate(None, None, None, None)
+
+    def test_get_client(self):
+        identity_credentials = mock.MagicMock()
+        identity_credentials.get_token.return_value = AccessToken('some-token', int(time.time()) + 3600)
+        credentials = AzureCredentials(identity_credentials)
+        AzureFacadeUtils.set_max_pool_connections(32)
+        stats = AzureFacadeUtils.get_clients_stats()
+
+        client = AzureFacadeUtils.get_client(StorageManagementClient, credentials, 'some-subscription-id')
+        assert AzureFacadeUtils.get_client(StorageManagementClient, credentials, 'some-subscription-id') is client
+        other_client = AzureFacadeUtils.get_client(StorageManagementClient, credentials, 'other-subscription-id')
+        assert other_client is not client
+        # Clients are not shared between the scans of different credentials
+        other_credentials = AzureCredentials(mock.MagicMock())
+        other_credentials_client = \
+            AzureFacadeUtils.get_client(StorageManagementClient, other_credentials, 'some-subscription-id')
+        assert other_credentials_client is not client
+        assert other_credentials_client._config.credential is other_credentials.get_credentials()
+        new_stats = AzureFacadeUtils.get_clients_stats()
+        assert new_stats['hits'] - stats['hits'] == 1
+        assert new_stats['misses'] - stats['misses'] == 3
+
+        # The clients share a single pool of connections sized to the number of workers
+        session = client._client._pipeline._transport.session
+        assert other_client._client._pipeline._transport.session is session
+        assert session.get_adapter('https://management.azure.com')._pool_maxsize == 32
+
+        # The clients share the tokens until they are about to expire
+        scope = 'https://management.core.windows.net/.default'
+        assert credentials.get_credentials().get_token(scope).token == 'some-token'
+        assert credentials.get_credentials().get_token(scope).token == 'some-token'
+        assert identity_credentials.get_token.call_count == 1
+        identity_credentials.get_token.return_value = AccessToken('new-token', int(time.time()) + 60)
+        credentials.cached_credentials.tokens[((scope,), None)] = AccessToken('some-token', int(time.time()) + 60)
+        assert credentials.get_credentials().get_token(scope).token == 'new-token'
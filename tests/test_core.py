@@ -1,8 +1,17 @@
 
+import asyncio
+import datetime
+import json
+import tempfile
 import unittest
+from ScoutSuite.core.checkpoint import FetchJournal
 from ScoutSuite.core.conditions import pass_condition
 from ScoutSuite.core.cli_parser import *
-from ScoutSuite.core.console import prompt, prompt_overwrite, prompt_value
+from ScoutSuite.core.console import print_exception, prompt, prompt_overwrite, prompt_value
+from ScoutSuite.core.ratelimiter import set_rate_limit_scope
+from ScoutSuite.core.recorder import ResponseStore
+from ScoutSuite.core.scheduler import FetchScheduler
+from ScoutSuite.core.telemetry import FetchTelemetry
 
 #
 # Test methods for ScoutSuite/core
@@ -36,3 +45,122 @@ class TestScoutCore(unittest.TestCase):
     def test_prompt_value(self):
         assert (prompt_value(question='', max_laps=1, test_input='test', is_question=True, choices=['test']) is None)
         assert (prompt_value(question='', max_laps=1, test_input='test', is_question=True, choices=['test'], no_confirm=True) == 'test')
+
+    ########################################
+    # recorder.py
+    ########################################
+
+    def test_response_store(self):
+        response = {'LaunchTime': datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc),
+                    'UserData': b'\x1f\x8b', 'Tags': [{'Key': 'Name', 'Value': 'test'}]}
+        with tempfile.TemporaryDirectory() as directory:
+            store = ResponseStore(directory)
+            key = ResponseStore.get_key('aws', 'ec2', 'us-east-1', 'DescribeInstances', {'MaxResults': 5})
+            assert key == ResponseStore.get_key('aws', 'ec2', 'us-east-1', 'DescribeInstances', {'MaxResults': 5})
+            assert key != ResponseStore.get_key('aws', 'ec2', 'us-east-2', 'DescribeInstances', {'MaxResults': 5})
+            assert store.load(key) is None
+            store.save(key, response)
+            assert store.load(key) == response
+            assert (store.hits, store.misses, store.saved) == (1, 1, 1)
+
+    ########################################
+    # checkpoint.py
+    ########################################
+
+    def test_fetch_journal(self):
+        fetched = []
+
+        async def fetch(resources, region, fail=False):
+            fetched.append(region)
+            resources['instances'] = {'i-1': {'LaunchTime': datetime.datetime(2020, 1, 1)}}
+            if fail:
+                print_exception('Expired credentials')
+
+        async def fetch_regions(journal, failed_region=None):
+            regions = {region: {} for region in ['us-east-1', 'us-east-2']}
+            for region, resources in regions.items():
+                await journal.fetch(resources, lambda: fetch(resources, region, region == failed_region),
+                                    'ec2', region)
+            return regions
+
+        with tempfile.TemporaryDirectory() as directory:
+            journal = FetchJournal(directory)
+            asyncio.run(fetch_regions(journal, failed_region='us-east-2'))
+            assert fetched == ['us-east-1', 'us-east-2']
+
+            # Only the region fetched without errors is restored
+            fetched.clear()
+            regions = asyncio.run(fetch_regions(journal))
+            assert fetched == ['us-east-2']
+            assert regions['us-east-1'] == {'instances': {'i-1': {'LaunchTime': '2020-01-01 00:00:00'}}}
+            assert (journal.restored, journal.saved) == (1, 2)
+
+            # Services journaled per region are not journaled again as a whole, the others are
+            async def fetch_service(resources):
+                resources['regions'] = regions
+            for service in ['ec2', 'iam']:
+                resources = {}
+                asyncio.run(journal.fetch(resources, lambda: fetch_service(resources), service))
+            assert journal.saved == 3
+            assert journal.load('ec2') is None
+            assert journal.load('iam')['regions']['us-east-1'] == regions['us-east-1']
+
+            journal.clear()
+            assert journal.load('ec2', 'us-east-1') is None
+
+    ########################################
+    # scheduler.py
+    ########################################
+
+    def test_fetch_scheduler(self):
+        scheduler = FetchScheduler('aws', max_workers=2)
+        scheduler.costs = {'slow': 10, 'fast': 1}
+        assert scheduler.sort_services(['fast', 'unknown', 'slow']) == ['slow', 'fast', 'unknown']
+        calls = []
+
+        async def call(service):
+            set_rate_limit_scope(service=service, region='us-east-1')
+            async with scheduler.worker():
+                calls.append(service)
+                await asyncio.sleep(0.01)
+
+        async def fetch():
+            for service in ['slow', 'fast']:
+                scheduler.start_service(service)
+            # The slow service queues its calls first, but only gets its share of the workers while both run
+            tasks = [asyncio.create_task(call(service)) for service in ['slow'] * 4 + ['fast'] * 2]
+            await asyncio.wait(tasks)
+            for service in ['slow', 'fast']:
+                scheduler.complete_service(service)
+
+        asyncio.run(fetch())
+        assert calls == ['slow', 'slow', 'fast', 'slow', 'fast', 'slow']
+        assert scheduler.workers == 0 and not scheduler.waiters
+        assert set(scheduler.durations) == {'slow', 'fast', 'slow/us-east-1', 'fast/us-east-1'}
+
+    ########################################
+    # telemetry.py
+    ########################################
+
+    def test_fetch_telemetry(self):
+        telemetry = FetchTelemetry('aws')
+        telemetry.record('ec2', 'DescribeInstances', 'us-east-1', 0.2, size=1000)
+        telemetry.record('ec2', 'DescribeInstances', 'us-east-1', 3.0, retries=1, throttles=1)
+        telemetry.record('iam', 'GetAccountAuthorizationDetails', None, 0.1, failed=True)
+        summary = telemetry.get_summary()
+        assert [s['operation'] for s in summary] == ['DescribeInstances', 'GetAccountAuthorizationDetails']
+        assert (summary[0]['calls'], summary[0]['bytes'], summary[0]['max_latency']) == (2, 1000, 3.0)
+
+        labels = 'provider="aws",service="ec2",operation="DescribeInstances",region="us-east-1"'
+        text = telemetry.get_prometheus_text()
+        assert f'scoutsuite_api_calls_total{{{labels}}} 2' in text
+        assert f'scoutsuite_api_call_errors_total{{{labels}}} 0' in text
+        assert f'scoutsuite_api_call_duration_seconds_bucket{{{labels},le="0.25"}} 1' in text
+        assert f'scoutsuite_api_call_duration_seconds_bucket{{{labels},le="+Inf"}} 2' in text
+
+        with tempfile.TemporaryDirectory() as directory:
+            telemetry.save(directory, 'aws-test')
+            with open(f'{directory}/aws-test.json') as f:
+                assert json.load(f) == summary
+            with open(f'{directory}/aws-test.prom') as f:
+                assert f.read() == text
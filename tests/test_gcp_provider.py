@@ -0,0 +1,261 @@
+import asyncio
+import collections
+import json
+import re
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+# httplib2shim, which the GCP facades use, still relies on collections.Callable
+collections.Callable = collections.abc.Callable
+
+import google_auth_httplib2
+import httplib2
+import pytest
+from asyncio_throttle import Throttler
+from googleapiclient import discovery
+from googleapiclient.errors import HttpError
+
+from ScoutSuite.providers.gcp.facade.basefacade import GCPBaseFacade, RecordedHttp
+from ScoutSuite.providers.gcp.facade.gce import GCEFacade
+from ScoutSuite.providers.gcp.facade.utils import GCPFacadeUtils
+
+
+def run(coroutine_function):
+    loop = asyncio.new_event_loop()
+    try:
+        loop.throttler = Throttler(rate_limit=999999, period=1)
+        return loop.run_until_complete(coroutine_function())
+    finally:
+        loop.close()
+
+
+class RolesHttp:
+    """
+    HTTP object answering the IAM role requests, sent alone or in batches
+    """
+
+    def __init__(self, batched_errors=None):
+        # Status and message of the errors returned for the roles in batches, keyed by role name
+        self.batched_errors = batched_errors or {}
+        self.batches = []
+        self.requests = []
+
+    def request(self, uri, method='GET', body=None, headers=None, **kwargs):
+        if not uri.endswith('/batch'):
+            role = re.search(r'/v1/roles/([\w-]+)', uri).group(1)
+            self.requests.append(role)
+            return httplib2.Response({'status': '200'}), json.dumps({'name': f'roles/{role}'}).encode()
+
+        parts = re.findall(r'Content-ID: <([^>]*)>\s+GET /v1/roles/([\w-]+)', body)
+        self.batches.append([role for _, role in parts])
+        content = ''
+        for content_id, role in parts:
+            status, message = self.batched_errors.get(role, (200, None))
+            part = {'error': {'code': status, 'message': message}} if message else {'name': f'roles/{role}'}
+            content += f'--batch\r\nContent-Type: application/http\r\nContent-ID: <response-{content_id}>\r\n\r\n' \
+                       f'HTTP/1.1 {status} Status\r\nContent-Type: application/json\r\n\r\n{json.dumps(part)}\r\n'
+        content += '--batch--'
+        return httplib2.Response({'status': '200', 'content-type': 'multipart/mixed; boundary=batch'}), \
+            content.encode()
+
+
+class Request:
+    """
+    Request of a page of resources
+    """
+
+    def __init__(self, pages, index, executed):
+        self.pages = pages
+        self.index = index
+        self.executed = executed
+        self.http = httplib2.Http()
+        self.methodId = 'compute.instances.aggregatedList'
+
+    def execute(self, http=None):
+        self.executed.append(self.index)
+        return self.pages[self.index]
+
+
+class ResourcesGroup:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def list_next(self, previous_request, previous_response):
+        index = previous_request.index + 1
+        return Request(self.pages, index, previous_request.executed) if index < len(self.pages) else None
+
+    aggregatedList_next = list_next
+
+
+# Test methods for GCP Provider
+class TestGCPProviderClass(unittest.TestCase):
+
+    def test_get_pages(self):
+        pages = [{'items': [1, 2]}, {'items': [3]}, {'items': [4]}]
+        executed = []
+
+        async def get_first_page():
+            pages_iterator = GCPFacadeUtils.get_pages('items', Request(pages, 0, executed), ResourcesGroup(pages))
+            page = await pages_iterator.__anext__()
+            # Let the caller process the first page
+            await asyncio.sleep(0.01)
+            await pages_iterator.aclose()
+            return page
+
+        # The next page is fetched while the caller processes the current one, but no further
+        assert run(get_first_page) == [1, 2]
+        assert executed == [0, 1]
+
+        executed.clear()
+        assert run(lambda: GCPFacadeUtils.get_all('items', Request(pages, 0, executed), ResourcesGroup(pages))) == \
+            [1, 2, 3, 4]
+        assert executed == [0, 1, 2]
+
+    def test_get_thread_http(self):
+        credentials = mock.MagicMock()
+        authorized_http = google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+        client_http = RecordedHttp(authorized_http)
+
+        thread_http = GCPFacadeUtils._get_thread_http(client_http)
+        assert GCPFacadeUtils._get_thread_http(client_http) is thread_http
+        # The copy is authorized with the same credentials and still records the responses
+        assert isinstance(thread_http, RecordedHttp)
+        assert thread_http._http is not authorized_http
+        assert thread_http._http.credentials is credentials
+
+        # Each thread uses its own copy
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(GCPFacadeUtils._get_thread_http, client_http).result() is not thread_http
+
+        # HTTP objects that cannot be copied are shared
+        http = httplib2.Http()
+        assert GCPFacadeUtils._get_thread_http(http) is http
+
+    def test_get_enabled_services(self):
+        # The GCP facade builds the clients of all the services, KMS included
+        pytest.importorskip('google.cloud.kms')
+        from ScoutSuite.providers.gcp.facade.base import GCPFacade
+
+        services = [{'name': 'projects/1/services/compute.googleapis.com'}]
+        fetches = []
+
+        async def get_all(resource_key, request, resources_group):
+            fetches.append(request)
+            await asyncio.sleep(0.01)
+            return services
+
+        facade = GCPFacade.__new__(GCPFacade)
+        facade.projects_services = {}
+        facade.projects_services_semaphore = asyncio.Semaphore(10)
+        facade._build_arbitrary_client = mock.MagicMock()
+
+        async def get_enabled_services():
+            tasks = [asyncio.ensure_future(facade.get_enabled_services('project')) for _ in range(5)]
+            await asyncio.sleep(0)
+            # A cancelled caller does not cancel the fetch awaited by the others
+            tasks[0].cancel()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        with mock.patch.object(GCPFacadeUtils, 'get_all', side_effect=get_all):
+            results = run(get_enabled_services)
+
+        assert isinstance(results[0], asyncio.CancelledError)
+        assert results[1:] == [services] * 4
+        assert len(fetches) == 1
+
+    def test_get_all_aggregated(self):
+        pages = [{'items': {'zones/us-east1-b': {'instances': [1]}, 'zones/us-east1-c': {'warning': {}}}},
+                 {'items': {'zones/us-east1-b': {'instances': [2]}, 'zones/us-west1-a': {'instances': [3]}}}]
+
+        instances = run(lambda: GCPFacadeUtils.get_all_aggregated('instances', Request(pages, 0, []),
+                                                                  ResourcesGroup(pages)))
+        # The scopes without resources are left out
+        assert instances == {'us-east1-b': [1, 2], 'us-west1-a': [3]}
+
+    def test_get_zonal_resources(self):
+        instance = {'name': 'instance', 'metadata': {'items': [{'key': 'enable-oslogin', 'value': 'TRUE'}]}}
+        disk = {'name': 'disk'}
+
+        async def get_all_aggregated(resource_key, request, resources_group):
+            return {'instances': {'us-east1-b': [instance]}, 'disks': {'us-east1-c': [disk]}}[resource_key]
+
+        async def get_project(project_id):
+            return {'commonInstanceMetadata': {'items': [{'key': 'block-project-ssh-keys', 'value': 'TRUE'}]}}
+
+        facade = GCEFacade()
+        facade._client = discovery.build('compute', 'v1', http=httplib2.Http(), static_discovery=True)
+        facade.get_project = mock.MagicMock(side_effect=get_project)
+
+        async def get_resources():
+            zones = ['us-east1-b', 'us-east1-c']
+            return await asyncio.gather(*[facade.get_instances('project', zone) for zone in zones],
+                                        *[facade.get_disks('project', zone) for zone in zones])
+
+        with mock.patch.object(GCPFacadeUtils, 'get_all_aggregated', side_effect=get_all_aggregated) as mock_get_all:
+            instances_b, instances_c, disks_b, disks_c = run(get_resources)
+
+        # The resources of all the zones are listed once per project and split by zone
+        assert mock_get_all.call_count == 2
+        assert (instances_b, instances_c, disks_b, disks_c) == ([instance], [], [], [disk])
+        # The project's metadata is fetched once
+        facade.get_project.assert_called_once_with('project')
+        assert instance['metadata'] == {'enable-oslogin': 'TRUE'}
+        assert instance['commonInstanceMetadata'] == {'block-project-ssh-keys': 'TRUE'}
+
+    def _get_roles_facade(self, http):
+        facade = GCPBaseFacade('iam', 'v1')
+        facade._client = discovery.build('iam', 'v1', http=http, static_discovery=True)
+        return facade
+
+    async def _get_role(self, facade, role):
+        return await facade._execute_batched(facade._get_client().roles().get(name=f'roles/{role}'))
+
+    def test_execute_batched(self):
+        http = RolesHttp({'missing': (404, 'Role not found'), 'throttled': (429, 'Quota exceeded for quota metric')})
+        facade = self._get_roles_facade(http)
+
+        async def get_roles():
+            return await asyncio.gather(*[self._get_role(facade, role)
+                                          for role in ['viewer', 'missing', 'throttled', 'editor']],
+                                        return_exceptions=True)
+
+        viewer, missing, throttled, editor = run(get_roles)
+        # The requests are sent in a single batch and each caller gets its own response
+        assert http.batches == [['viewer', 'missing', 'throttled', 'editor']]
+        assert (viewer, editor) == ({'name': 'roles/viewer'}, {'name': 'roles/editor'})
+        assert isinstance(missing, HttpError) and missing.resp.status == 404
+        # The throttled request is retried on its own
+        assert throttled == {'name': 'roles/throttled'}
+        assert http.requests == ['throttled']
+
+    def test_execute_batched_flush(self):
+        http = RolesHttp()
+        facade = self._get_roles_facade(http)
+
+        async def get_roles():
+            return await asyncio.gather(*[self._get_role(facade, f'role-{i}') for i in range(150)])
+
+        roles = run(get_roles)
+        # Full batches are sent at once, the remaining requests once the delay elapsed
+        assert sorted(len(batch) for batch in http.batches) == [50, 100]
+        assert roles == [{'name': f'roles/role-{i}'} for i in range(150)]
+        assert http.requests == []
+        # The batches are released once sent
+        assert not facade._batch_tasks
+
+    def test_execute_batched_cancelled_caller(self):
+        http = RolesHttp()
+        facade = self._get_roles_facade(http)
+
+        async def get_roles():
+            tasks = [asyncio.ensure_future(self._get_role(facade, role)) for role in ['viewer', 'editor']]
+            # Let the tasks add their requests to the batch
+            await asyncio.sleep(0)
+            tasks[0].cancel()
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        viewer, editor = run(get_roles)
+        assert isinstance(viewer, asyncio.CancelledError)
+        assert editor == {'name': 'roles/editor'}
+        assert http.batches == [['viewer', 'editor']]
@@ -5,7 +5,9 @@ import unittest
 
 from ScoutSuite.core.console import set_logger_configuration, print_error
 from ScoutSuite.core.processingengine import ProcessingEngine
+from ScoutSuite.core.profiler import RuleProfiler
 from ScoutSuite.core.ruleset import Ruleset
+from ScoutSuite.core.utils import build_rule_tree, recurse, recurse_rule_tree, walk
 
 
 class DummyObject(object):
@@ -40,6 +42,87 @@ class TestScoutRulesProcessingEngine(unittest.TestCase):
         print('Verified  rules: %d' % self.rule_counters['verified'])
 
 
+    def test_walk(self):
+        services = {'iam': {'users': {'alice': {'groups': ['admins', 'devs']}, 'bob': {'groups': 'none'}},
+                            'id': {'groups': [1]}}}
+        assert list(walk(services, 'iam.users.id.groups.id'.split('.'))) == [
+            (('iam', 'users', 'alice', 'groups', '0'), 'admins'),
+            (('iam', 'users', 'alice', 'groups', '1'), 'devs'),
+            (('iam', 'users', 'bob', 'groups'), 'none')]
+        # An existing key takes precedence over the `id` wildcard
+        assert list(walk(services['iam'], ['id', 'groups'], ['iam'])) == [(('iam', 'id', 'groups'), [1])]
+        assert list(walk(services, [])) == [((), services)]
+
+    def test_recurse_rule_tree(self):
+        services = {'ec2': {'regions': {'us-east-1': {'vpcs': {'vpc-1': {'security_groups': {
+            'sg-1': {'name': 'default', 'rules': ['a', 'b']},
+            'sg-2': {'name': 'web', 'rules': []}}}}}}},
+                    'iam': {'users': [{'name': 'alice'}, {'name': 'bob'}]}}
+        rules = []
+        sg_path = 'ec2.regions.id.vpcs.id.security_groups.id'
+        for path, conditions in [(sg_path, ['and', ['this', 'withKey', 'name']]),
+                                 (sg_path, ['and', [sg_path + '.name', 'equal', 'web']]),
+                                 (sg_path + '.rules.id', []),
+                                 ('iam.users.id', ['and', ['iam.users.id.name', 'match', 'a.*']])]:
+            rule = DummyObject()
+            rule.path = path
+            rule.conditions = conditions
+            rule.id_suffix = 'name'
+            rules.append(rule)
+
+        results = {rule: [] for rule in rules}
+        for rule in rules:
+            rule.checked_items = 0
+        recurse_rule_tree(services, services, build_rule_tree(rules), [], results, True)
+        checked_items = [rule.checked_items for rule in rules]
+        for rule in rules:
+            rule.checked_items = 0
+        assert [results[rule] for rule in rules] == \
+               [recurse(services, services, rule.path.split('.'), [], rule, True) for rule in rules]
+        assert checked_items == [rule.checked_items for rule in rules] == [2, 2, 2, 2]
+
+    def test_run_with_workers(self):
+        ruleset = self._generate_ec2_ruleset()
+        findings = [self._run_ec2_rules(ProcessingEngine(ruleset, workers=workers)) for workers in [1, 2]]
+        assert findings[0] == findings[1]
+        assert any(finding['flagged_items'] for finding in json.loads(findings[0]).values())
+
+    def test_run_with_profiler(self):
+        ruleset = self._generate_ec2_ruleset()
+        findings = self._run_ec2_rules(ProcessingEngine(ruleset))
+        for workers in [1, 2]:
+            profiler = RuleProfiler()
+            assert self._run_ec2_rules(ProcessingEngine(ruleset, workers=workers, profiler=profiler)) == findings
+            profile = profiler.get_profile()
+            assert len(profile['rules']) == len(json.loads(findings))
+            assert [rule['time'] for rule in profile['rules']] == \
+                   sorted([rule['time'] for rule in profile['rules']], reverse=True)
+            for rule in profile['rules']:
+                finding = json.loads(findings)[rule['key']]
+                assert rule['checked_items'] == finding['checked_items']
+                assert rule['flagged_items'] == finding['flagged_items']
+                assert rule['condition_evaluations'] <= rule['get_value_at_lookups']
+            assert any(rule['condition_evaluations'] for rule in profile['rules'])
+
+    def _generate_ec2_ruleset(self):
+        test_ruleset = {'rules': {}, 'about': 'regression test'}
+        with open(os.path.join(self.test_dir, '../ScoutSuite/providers/aws/rules/rulesets/default.json'), 'rt') as f:
+            for rule_file_name, rules in json.load(f)['rules'].items():
+                if rule_file_name.startswith('ec2-'):
+                    test_ruleset['rules'][rule_file_name] = rules
+        with tempfile.NamedTemporaryFile('wt', delete=False) as f:
+            f.write(json.dumps(test_ruleset, indent=4))
+        return Ruleset(cloud_provider='aws', filename=f.name)
+
+    def _run_ec2_rules(self, processing_engine):
+        dummy_provider = DummyObject()
+        with open(os.path.join(self.test_dir, 'data/rule-configs/ec2.json'), 'rt') as f:
+            for key, value in json.load(f).items():
+                setattr(dummy_provider, key, value)
+        dummy_provider.service_list = ['ec2']
+        processing_engine.run(dummy_provider)
+        return json.dumps(dummy_provider.services['ec2']['findings'], sort_keys=True)
+
     def _test_rule(self, ruleset_file_name, rule_file_name, rule):
         test_config_file_name = os.path.join(self.test_dir, 'data/rule-configs/%s' % rule_file_name)
         if not os.path.isfile(test_config_file_name):
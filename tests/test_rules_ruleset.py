@@ -1,4 +1,5 @@
 import os
+import tempfile
 
 from unittest import mock
 import unittest
@@ -105,3 +106,15 @@ class TestScoutRulesRuleset(unittest.TestCase):
 
     def test_search_ruleset(self):
         test201 = Ruleset(cloud_provider='aws').search_ruleset('test', no_prompt=True)
+
+    def test_rule_cache(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            rulesets = [Ruleset(cloud_provider='aws', filename='default.json', account_id=account_id,
+                                cache_dir=cache_dir) for account_id in ['123456789012', '123456789012', '210987654321']]
+            assert len(os.listdir(cache_dir)) == 2
+            uncached = Ruleset(cloud_provider='aws', filename='default.json', account_id='123456789012')
+            for ruleset in rulesets[:2]:
+                assert list(ruleset.rules) == list(uncached.rules)
+                for filename in uncached.rules:
+                    assert [vars(rule) for rule in ruleset.rules[filename]] == \
+                           [vars(rule) for rule in uncached.rules[filename]]
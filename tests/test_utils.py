@@ -8,7 +8,13 @@ from ScoutSuite.providers.aws.utils import (
     get_partition_name,
     snake_keys,
 )
+from ScoutSuite.core.ratelimiter import RateLimiter, TokenBucket, set_rate_limit_scope
+from ScoutSuite.core.telemetry import FetchTelemetry, add_response_bytes, set_fetch_telemetry
+from ScoutSuite.providers.utils import run_concurrently
 from ScoutSuite.utils import *
+from asyncio_throttle import Throttler
+from botocore.exceptions import ClientError
+import asyncio
 import collections
 import unittest
 from unittest import mock
@@ -83,6 +89,15 @@ class TestScoutUtilsClass(unittest.TestCase):
         ):
             assert get_partition_name("") == "b"
 
+    def test_get_caller_identity(self):
+        session = mock.MagicMock()
+        sts_client = session.client.return_value
+        sts_client.get_caller_identity.return_value = {"Arn": "arn:aws-cn:iam::123456789012:user/scout"}
+        assert get_aws_account_id(session) == "123456789012"
+        assert get_partition_name(session) == "aws-cn"
+        # STS is only called once per session
+        sts_client.get_caller_identity.assert_called_once_with()
+
     def test_snake_case(self):
         src = {
             "AttributeDefinitions": [
@@ -131,3 +146,72 @@ class TestScoutUtilsClass(unittest.TestCase):
         d = snake_keys(src)
         self.maxDiff = None
         self.assertEquals(d, dest)
+
+    def test_token_bucket(self):
+        bucket = TokenBucket()
+        for _ in range(10):
+            asyncio.run(bucket.acquire())
+        # Unlimited until throttled, then half the rate of the last second
+        assert bucket.rate is None
+        bucket.on_throttle()
+        assert bucket.rate == 5
+        bucket.on_throttle()
+        assert bucket.rate == 2.5
+        bucket.on_success()
+        assert bucket.rate == 2.9
+        for _ in range(100):
+            bucket.on_throttle()
+        assert bucket.rate == bucket.min_rate == bucket.lowest_rate
+        assert bucket.calls == 10 and bucket.throttles == 102
+
+        bucket = TokenBucket(rate=4, max_rate=4)
+        for _ in range(100):
+            bucket.on_success()
+        assert bucket.rate == 4
+
+    def test_run_concurrently(self):
+        throttling_error = ClientError({"Error": {"Code": "Throttling"}}, "DescribeInstances")
+        calls = []
+
+        def function():
+            calls.append(None)
+            add_response_bytes(10)
+            if len(calls) < 3:
+                raise throttling_error
+            return len(calls)
+
+        def failing_function():
+            raise ValueError()
+
+        async def fetch(service, region):
+            set_rate_limit_scope(service=service, region=region)
+            return await run_concurrently(function, backoff_seconds=0.01)
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.throttler = Throttler(rate_limit=999999, period=1)
+            loop.rate_limiter = RateLimiter("aws", max_rate=100)
+            telemetry = FetchTelemetry("aws")
+            set_fetch_telemetry(telemetry)
+            with mock.patch("ScoutSuite.providers.utils.print_warning"):
+                assert loop.run_until_complete(fetch("ec2", "us-east-1")) == 3
+                with self.assertRaises(ValueError):
+                    loop.run_until_complete(run_concurrently(failing_function))
+                calls.clear()
+                with self.assertRaises(ClientError):
+                    loop.run_until_complete(run_concurrently(function, backoff_seconds=0.01, max_retries=1))
+        finally:
+            set_fetch_telemetry(None)
+            loop.close()
+
+        stats = {(s["service"], s["region"]): s for s in loop.rate_limiter.get_stats()}
+        assert stats[("ec2", "us-east-1")]["calls"] == 3
+        assert stats[("ec2", "us-east-1")]["throttles"] == 2
+        assert stats[(None, None)]["calls"] == 3
+        assert stats[(None, None)]["throttles"] == 2
+
+        summary = {(s["service"], s["region"]): s for s in telemetry.get_summary()}
+        assert summary[("ec2", "us-east-1")]["operation"] == "TestScoutUtilsClass.test_run_concurrently"
+        assert [summary[("ec2", "us-east-1")][key] for key in ["calls", "errors", "retries", "throttles", "bytes"]] \
+            == [1, 0, 2, 2, 10]
+        assert [summary[("", "")][key] for key in ["calls", "errors", "retries", "throttles"]] == [2, 2, 1, 2]
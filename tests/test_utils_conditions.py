@@ -1,8 +1,12 @@
 # -*- coding: utf-8 -*-
+import copy
 import os
 import unittest
 
 
+from policyuniverse.expander_minimizer import _expand_wildcard_action
+
+from ScoutSuite import ERRORS_LIST
 from ScoutSuite.core.conditions import *
 
 class TestOpinelConditionClass(unittest.TestCase):
@@ -222,3 +226,114 @@ class TestOpinelConditionClass(unittest.TestCase):
             pass
 
         return
+
+    def test_compile_condition(self):
+        src_dir = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'data')
+        with open(os.path.join(src_dir, 'policy1.json')) as f:
+            statement = json.load(f)['Statement'][0]
+        date = datetime.datetime.now() - datetime.timedelta(hours=5)
+        testcases = [
+            ('a', 'equal', 'a'), (1, 'notEqual', 0), (1, 'lessThan', '2'), (2, 'moreOrEqual', 2),
+            ([None], 'empty', ''), ({'a': 'b'}, 'notEmpty', ''), ('None', 'null', ''), ('TrUE', 'true', ''),
+            (['a', 'b'], 'lengthMoreThan', 1), ({'A': 1}, 'withKeyCaseInsensitive', 'a'),
+            (123, 'containString', 2), (['a', {'b': 1}], 'containAtLeastOneOf', [{'b': 1}]),
+            ('d', 'containAtLeastOneDifferentFrom', ['a', 'b']), ('a', 'containNoneOf', []),
+            (['a', '*'], 'containAtLeastOneMatching', '.*[*].*'),
+            ('abcdefg', 'match', ['.*xyx.*', '.*cde.*']), ('abcdefg', 'notMatch', '.*cde.*'),
+            (['abcdefg'], 'matchInList', ['.*edc.*', '.*cba.*']),
+            ('2016-04-11 12:20:26.996000+00:00', 'priorToDate', '2017-04-11 12:20:26.996000+00:00'),
+            (date, 'olderThan', [90, 'minutes']), (date, 'newerThan', [6, 'hours']),
+            (date, 'olderThan', [6, 'unittest']),
+            ('192.168.0.1', 'inSubnets', '192.168.0.0/24'), ('192.168.1.1', 'notInSubnets', ['192.168.0.0/24']),
+            ('10.0.0.0/8', 'isSubnetRange', ''), ('10.0.0.0/8', 'isPrivateSubnet', ''),
+            (['0-1024', '8080'], 'portsInPortList', ['22', 8080]),
+            (statement, 'containAction', 'iam:GetUser'), (statement, 'notContainAction', 'iam:CreateUser'),
+            (statement, 'containAtLeastOneAction', ['iam:CreateUser', 'iam:GetUser']),
+            ([{'AWS': 'arn:aws:iam::123456789012:root'}], 'isCrossAccount', '123456789013'),
+            ('arn:aws:iam::123456789012:user/name', 'isSameAccount', '123456789012'),
+            ([{'AWS': 'arn:aws:iam::123456789012:root'}], 'isAccountRoot', '123456789012'),
+            ('foo', 'bar', 'baz'),
+        ]
+        for b, test, a in testcases:
+            try:
+                expected = pass_condition(b, test, a)
+            except Exception:
+                self.assertRaises(Exception, compile_condition(test, a), b)
+            else:
+                assert compile_condition(test, a)(b) == expected, (b, test, a)
+
+    def test_compile_conditions(self):
+        all_info = {'users': {'alice': {'name': 'alice', 'groups': ['admins'], 'max': '2'},
+                              'bob': {'name': 'bob', 'groups': [], 'max': '1'}}}
+        conditions = ['and',
+                      ['users.id.groups', 'notEmpty', ''],
+                      ['or',
+                       ['users.id.name', 'match', '^b.*'],
+                       ['users.id.groups', 'lengthLessThan', '_GET_VALUE_AT_(users.id.max)']]]
+        predicate = compile_conditions(conditions)
+        for user in all_info['users']:
+            current_path = ['users', user]
+            assert predicate(all_info, current_path) == pass_conditions(all_info, current_path, copy.deepcopy(conditions))
+        assert predicate(all_info, ['users', 'alice'])
+        assert not predicate(all_info, ['users', 'bob'])
+        assert compile_conditions([])(all_info, [])
+        assert not compile_conditions(['or'])(all_info, [])
+
+    def test_subnet_index(self):
+        subnets = ['10.0.0.0/8', '192.168.1.0/24', '192.168.2.0/24', '2001:db8::/32']
+        index = SubnetIndex(subnets)
+        for grant in ['10.1.2.3', '10.0.0.0/8', '10.0.0.0/7', '192.168.1.128/25', '192.168.0.0/22', '172.16.0.1',
+                      '2001:db8::1/64', '2001:db9::/32', '::ffff:10.0.0.1']:
+            grant = netaddr.IPNetwork(grant)
+            assert (grant in index) == any(grant in netaddr.IPNetwork(c) for c in subnets), grant
+        assert netaddr.IPNetwork('0.0.0.0/0') not in SubnetIndex([])
+
+    def test_regex_cache(self):
+        cache = LRUCache(re.compile, maxsize=2)
+        assert cache.get('a.*') is cache.get('a.*')
+        cache.get('b.*')
+        cache.get('c.*')
+        assert cache.stats() == {'hits': 1, 'misses': 3, 'evictions': 1, 'size': 2, 'maxsize': 2}
+        assert pass_condition('abc', 'match', 'a.*') and pass_condition(['abc'], 'matchInList', ['x', 'a.*'])
+        assert regex_cache.get('a.*').pattern == 'a.*'
+
+    def test_get_statement_actions(self):
+        statement = {'Effect': 'Allow', 'Action': ['iam:GetUser', 'iam:CreateUser'], 'Resource': '*'}
+        actions = get_statement_actions(statement)
+        assert actions == get_actions_from_statement(statement)
+        hits = statement_actions_cache.hits
+        assert get_statement_actions(json.dumps(statement)) is actions
+        assert statement_actions_cache.hits == hits + 1
+        assert get_rule_actions('iam:Get*') == frozenset(_expand_wildcard_action('iam:Get*'))
+        assert get_rule_actions(['iam:GetUser', 'iam:Create*']) == \
+            frozenset(_expand_wildcard_action(['iam:GetUser', 'iam:Create*']))
+
+    def test_compile_conditions_reordering(self):
+        created = str(datetime.datetime.now() - datetime.timedelta(days=2))
+        all_info = {'users': {name: {'name': name, 'created': created} for name in ['alice', 'bob', 'carol', 'dave']}}
+        conditions = ['and', ['users.id.created', 'olderThan', ['1', 'days']], ['users.id.name', 'equal', 'alice']]
+        stats = {}
+        predicate = compile_conditions(conditions, stats=stats)
+        for i in range(reorder_checkpoints[-1]):
+            for user in all_info['users']:
+                current_path = ['users', user]
+                assert predicate(all_info, current_path) == \
+                       pass_conditions(all_info, current_path, copy.deepcopy(conditions))
+        # The selective equality test now runs first and short-circuits the date test
+        evaluations = stats['condition_evaluations']
+        assert not predicate(all_info, ['users', 'bob'])
+        assert stats['condition_evaluations'] == evaluations + 1
+        assert predicate(all_info, ['users', 'alice'])
+
+    def test_compile_conditions_reordering_errors(self):
+        # One user out of ten has no key, so the length test is only valid after the notNull test
+        all_info = {'users': {str(i): {'key': None if i % 10 == 0 else 'x' * (i % 9)} for i in range(200)}}
+        conditions = ['and', ['users.id.key', 'notNull', ''], ['users.id.key', 'lengthMoreThan', '5']]
+        predicate = compile_conditions(conditions)
+        errors = len(ERRORS_LIST)
+        for user in all_info['users']:
+            current_path = ['users', user]
+            assert predicate(all_info, current_path) == \
+                   pass_conditions(all_info, current_path, copy.deepcopy(conditions))
+        # The errors of the reordered length test are not reported, as it would not have run
+        assert len(ERRORS_LIST) == errors
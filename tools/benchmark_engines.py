@@ -0,0 +1,596 @@
+#!/usr/bin/env python3
+
+import argparse
+import asyncio
+import datetime
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+
+from ScoutSuite import ERRORS_LIST  # noqa: E402
+from ScoutSuite.core.console import logger, set_logger_configuration  # noqa: E402
+from ScoutSuite.core.processingengine import ProcessingEngine  # noqa: E402
+from ScoutSuite.core.ruleset import Ruleset  # noqa: E402
+from ScoutSuite.output.html import ScoutReport  # noqa: E402
+from ScoutSuite.output.result_encoder import ScoutJsonEncoder  # noqa: E402
+from ScoutSuite.providers.aws.provider import AWSProvider  # noqa: E402
+from ScoutSuite.providers.aws.resources.iam.base import IAM  # noqa: E402
+from ScoutSuite.providers.base.provider import BaseProvider  # noqa: E402
+
+ACCOUNT_ID = '123456789012'
+PROVIDERS_PATH = os.path.join(os.path.dirname(os.path.realpath(__file__)), '..', 'ScoutSuite', 'providers')
+
+# Share of the AWS resources generated for each resource type
+AWS_SHARES = {
+    'instances': 0.35,
+    'security_groups': 0.15,
+    'subnets': 0.05,
+    'network_acls': 0.02,
+    'users': 0.15,
+    'roles': 0.10,
+    'policies': 0.08,
+    'groups': 0.02,
+    'buckets': 0.08
+}
+# Managed policies are matched to their entities by a scan of all the entities, only attach the first ones
+ATTACHED_POLICIES = 50
+# Policies granting all the actions on all the resources are matched with every bucket, only the first ones do
+ADMIN_POLICIES = 10
+OLD_DATE = '2000-01-01 00:00:00+00:00'
+NEW_DATE = datetime.datetime.now(datetime.timezone.utc).strftime('%Y-%m-%d %H:%M:%S+00:00')
+INGRESS_PORTS = [('TCP', '22'), ('TCP', '443'), ('TCP', '3389'), ('TCP', '8000-8100'), ('UDP', '53'), ('ALL', 'N/A')]
+INGRESS_CIDRS = ['0.0.0.0/0', '10.0.0.0/8', '192.168.1.0/24', '203.0.113.7/32', '::/0']
+POLICY_ACTIONS = [['s3:GetObject', 's3:PutObject'], ['ec2:Describe*'], ['iam:PassRole', 'sts:AssumeRole'],
+                  ['s3:*'], ['kms:Decrypt', 'kms:Encrypt'], ['ec2:*', 'elasticloadbalancing:*']]
+
+
+def split_resources(resources, shares):
+    return {resource_type: max(1, int(resources * share)) for resource_type, share in shares.items()}
+
+
+def generate_aws_services(resources, regions, vpcs, sg_rules):
+    """
+    Generate AWS-shaped EC2, VPC, IAM and S3 results, as returned by the resources' fetch_all and finalize
+    """
+    counts = split_resources(resources, AWS_SHARES)
+    region_names = [f'region-{r}' for r in range(regions)]
+    scopes = [(region, f'vpc-{r:04x}{v:04x}') for r, region in enumerate(region_names) for v in range(vpcs)]
+
+    def spread(total):
+        """Split a count over the (region, VPC) scopes"""
+        return [total // len(scopes) + (1 if i < total % len(scopes) else 0) for i in range(len(scopes))]
+
+    iam = generate_aws_iam(counts)
+    instance_profiles = [profile_id for role in iam['roles'].values() for profile_id in role['instance_profiles']]
+
+    ec2 = {'regions': {region: {'region': region, 'vpcs': {}, 'volumes': {}, 'volumes_count': 0, 'snapshots': {},
+                                'snapshots_count': 0, 'images': {}, 'images_count': 0,
+                                'regional_settings': {'0': {'ebs_encryption_default': r % 2 == 0,
+                                                            'ebs_default_encryption_key_id': 'alias/aws/ebs'}}}
+                       for r, region in enumerate(region_names)}}
+    vpc = {'regions': {region: {'region': region, 'vpcs': {}, 'flow_logs': {}, 'flow_logs_count': 0,
+                                'peering_connections': {}, 'peering_connections_count': 0}
+                       for region in region_names}}
+    instance_index = sg_index = subnet_index = acl_index = 0
+    for (region, vpc_id), instances_count, sgs_count, subnets_count, acls_count in zip(
+            scopes, spread(counts['instances']), spread(counts['security_groups']), spread(counts['subnets']),
+            spread(counts['network_acls'])):
+        subnet_ids = [f'subnet-{subnet_index + s:08x}' for s in range(max(1, subnets_count))]
+        subnets = {subnet_id: {'id': subnet_id, 'name': subnet_id,
+                               'arn': f'arn:aws:ec2:{region}:{ACCOUNT_ID}:subnet/{subnet_id}', 'VpcId': vpc_id,
+                               'CidrBlock': f'10.{s % 256}.{s // 256 % 256}.0/24',
+                               'CidrBlockv6': None, 'MapPublicIpOnLaunch': s % 2 == 0}
+                   for s, subnet_id in enumerate(subnet_ids)}
+        subnet_index += len(subnet_ids)
+
+        network_acls = {}
+        for a in range(max(1, acls_count)):
+            acl_id = f'acl-{acl_index:08x}'
+            acl_index += 1
+            network_acls[acl_id] = {
+                'id': acl_id, 'name': acl_id, 'VpcId': vpc_id, 'IsDefault': a == 0,
+                'arn': f'arn:aws:ec2:{region}:{ACCOUNT_ID}:network-acl/{acl_id}',
+                'Associations': [{'SubnetId': subnet_id} for subnet_id in subnet_ids[a::max(1, acls_count)]],
+                'rules': {direction: {'100': {'RuleAction': 'allow', 'CidrBlock': '0.0.0.0/0', 'protocol': 'ALL',
+                                              'port_range': '1-65535'},
+                                      '32767': {'RuleAction': 'deny', 'CidrBlock': '0.0.0.0/0', 'protocol': 'ALL',
+                                                'port_range': '1-65535'}}
+                          for direction in ['ingress', 'egress']}
+            }
+
+        sg_ids = [f'sg-{sg_index + s:08x}' for s in range(max(1, sgs_count))]
+        security_groups = {sg_id: generate_aws_security_group(sg_id, s, sg_ids, vpc_id, sg_rules)
+                           for s, sg_id in enumerate(sg_ids)}
+        sg_index += len(sg_ids)
+
+        instances = {}
+        network_interfaces = {}
+        for _ in range(instances_count):
+            instance_id = f'i-{instance_index:017x}'
+            eni_id = f'eni-{instance_index:017x}'
+            subnet_id = subnet_ids[instance_index % len(subnet_ids)]
+            groups = [{'GroupId': sg_ids[instance_index % len(sg_ids)], 'GroupName': 'default'}]
+            private_ips = [{'PrivateIpAddress': f'10.0.{instance_index // 256 % 256}.{instance_index % 256}',
+                            'Primary': True}]
+            if instance_index % 4 == 0:
+                private_ips[0]['Association'] = {
+                    'PublicIp': f'198.51.{instance_index // 256 % 256}.{instance_index % 256}',
+                    'PublicDnsName': f'ec2-{instance_index}.compute.amazonaws.com'}
+            profile_id = instance_profiles[instance_index % len(instance_profiles)] \
+                if instance_profiles and instance_index % 2 == 0 else None
+            instances[instance_id] = {
+                'id': instance_id, 'name': instance_id,
+                'arn': f'arn:aws:ec2:{region}:{ACCOUNT_ID}:instance/{instance_id}',
+                'reservation_id': f'r-{instance_index:017x}',
+                'availability_zone': f'{region}{"abc"[instance_index % 3]}',
+                'monitoring_enabled': instance_index % 3 == 0,
+                'user_data': None, 'user_data_secrets': {},
+                'KeyName': 'key' if instance_index % 2 else None, 'LaunchTime': OLD_DATE, 'InstanceType': 't3.micro',
+                'State': {'Code': 16, 'Name': 'running'},
+                'IamInstanceProfile': {'Id': profile_id,
+                                       'Arn': f'arn:aws:iam::{ACCOUNT_ID}:instance-profile/{profile_id}'}
+                if profile_id else None,
+                'SubnetId': subnet_id, 'Tags': [{'Key': 'Name', 'Value': instance_id}],
+                'network_interfaces': {eni_id: {'Association': private_ips[0].get('Association'), 'Groups': groups,
+                                                'PrivateIpAddresses': private_ips, 'SubnetId': subnet_id,
+                                                'Ipv6Addresses': []}},
+                'metadata_options': {'HttpTokens': 'required' if instance_index % 2 else 'optional',
+                                     'HttpEndpoint': 'enabled'},
+                'iam_role': profile_id
+            }
+            if profile_id:
+                instances[instance_id]['iam_instance_profile_id'] = profile_id
+                instances[instance_id]['iam_instance_profile_arn'] = \
+                    instances[instance_id]['IamInstanceProfile']['Arn']
+            network_interfaces[eni_id] = {'NetworkInterfaceId': eni_id, 'name': eni_id, 'Groups': groups,
+                                          'SubnetId': subnet_id, 'VpcId': vpc_id, 'Status': 'in-use',
+                                          'PrivateIpAddresses': private_ips,
+                                          'Attachment': {'InstanceId': instance_id}}
+            instance_index += 1
+
+        ec2['regions'][region]['vpcs'][vpc_id] = {
+            'id': vpc_id, 'name': vpc_id,
+            'instances': instances, 'instances_count': len(instances),
+            'security_groups': security_groups, 'security_groups_count': len(security_groups),
+            'network_interfaces': network_interfaces, 'network_interfaces_count': len(network_interfaces)
+        }
+        vpc['regions'][region]['vpcs'][vpc_id] = {
+            'id': vpc_id, 'name': vpc_id, 'arn': f'arn:aws:ec2:{region}:{ACCOUNT_ID}:vpc/{vpc_id}',
+            'cidr_block': '10.0.0.0/16', 'default': False, 'state': 'available',
+            'subnets': subnets, 'subnets_count': len(subnets),
+            'network_acls': network_acls, 'network_acls_count': len(network_acls)
+        }
+
+    add_counts(ec2, ['instances', 'security_groups', 'network_interfaces'])
+    add_counts(vpc, ['subnets', 'network_acls'])
+
+    buckets = {}
+    for b in range(counts['buckets']):
+        name = f'bucket-{b:08x}'
+        buckets[name] = {
+            'id': name, 'name': name, 'arn': f'arn:aws:s3:::{name}', 'CreationDate': OLD_DATE,
+            'region': region_names[b % len(region_names)],
+            'logging': 'Disabled' if b % 2 else f'logs-{name}',
+            'versioning_status_enabled': b % 2 == 0, 'version_mfa_delete_enabled': b % 3 == 0,
+            'web_hosting_enabled': b % 5 == 0, 'default_encryption_enabled': b % 2 == 0,
+            'default_encryption_algorithm': 'AES256' if b % 2 == 0 else None, 'default_encryption_key': None,
+            'secure_transport_enabled': b % 3 != 0, 'public_access_block_configuration': {},
+            'grantees': {'owner': {'DisplayName': 'owner', 'URI': None, 'permissions': {'read': True,
+                                                                                       'write': True}}}
+            if b % 4 else
+            {'all-users': {'URI': 'http://acs.amazonaws.com/groups/global/AllUsers',
+                           'permissions': {'read': True, 'write': False, 'read_acp': False, 'write_acp': False}}},
+            'policy': {'Version': '2012-10-17', 'Statement': [
+                {'Effect': 'Allow', 'Principal': '*' if b % 6 == 0 else {'AWS': f'arn:aws:iam::{ACCOUNT_ID}:root'},
+                 'Action': ['s3:GetObject'], 'Resource': [f'arn:aws:s3:::{name}/*']}]}
+        }
+
+    return {'ec2': ec2, 'vpc': vpc, 'iam': iam,
+            's3': {'buckets': buckets, 'buckets_count': len(buckets)}}
+
+
+def generate_aws_security_group(sg_id, index, sg_ids, vpc_id, rules):
+    protocols = {}
+    for r in range(rules):
+        protocol, port = INGRESS_PORTS[(index + r) % len(INGRESS_PORTS)]
+        grants = protocols.setdefault(protocol, {'ports': {}})['ports'].setdefault(port, {})
+        if r % 3 == 2:
+            grants.setdefault('security_groups', []).append(
+                {'GroupId': sg_ids[(index + r) % len(sg_ids)], 'UserId': ACCOUNT_ID, 'VpcId': vpc_id})
+        else:
+            grants.setdefault('cidrs', []).append({'CIDR': INGRESS_CIDRS[(index + r) % len(INGRESS_CIDRS)]})
+    return {
+        'name': 'default' if index == 0 else f'group-{sg_id}', 'id': sg_id,
+        'arn': f'arn:aws:ec2::{ACCOUNT_ID}:security-group/{sg_id}',
+        'description': 'default VPC security group' if index == 0 else sg_id, 'owner_id': ACCOUNT_ID,
+        'rules': {'ingress': {'protocols': protocols, 'count': rules},
+                  'egress': {'protocols': {'ALL': {'ports': {'N/A': {'cidrs': [{'CIDR': '0.0.0.0/0'}]}}}},
+                             'count': 1}},
+        'is_default_configuration': index == 0
+    }
+
+
+def generate_aws_policy_document(index, statements=2):
+    document = {'Version': '2012-10-17', 'Statement': []}
+    for s in range(statements):
+        actions = POLICY_ACTIONS[(index + s) % len(POLICY_ACTIONS)]
+        document['Statement'].append({
+            'Effect': 'Deny' if (index + s) % 7 == 6 else 'Allow',
+            'Action' if (index + s) % 5 else 'NotAction': actions,
+            'Resource': [f'arn:aws:s3:::bucket-{index:08x}/*'] if actions[0].startswith('s3:') else ['*']
+        })
+    if index < ADMIN_POLICIES:
+        document['Statement'][0].update({'Effect': 'Allow', 'Action': ['*'], 'Resource': ['*']})
+        document['Statement'][0].pop('NotAction', None)
+    return document
+
+
+def generate_aws_iam(counts):
+    """
+    Generate IAM users, groups, roles and policies then compute their permissions with the IAM finalize
+    """
+    users = {}
+    for u in range(counts['users']):
+        user_id = f'AIDA{u:016X}'
+        users[user_id] = {
+            'id': user_id, 'name': f'user-{u}', 'arn': f'arn:aws:iam::{ACCOUNT_ID}:user/user-{u}', 'Path': '/',
+            'CreateDate': OLD_DATE, 'PasswordLastUsed': NEW_DATE if u % 2 else OLD_DATE,
+            'groups': [f'group-{u % counts["groups"]}'] if u % 3 else [],
+            'AccessKeys': [{'AccessKeyId': f'AKIA{u:016X}', 'Status': 'Active',
+                            'CreateDate': OLD_DATE if u % 2 else NEW_DATE}],
+            'MFADevices': [] if u % 2 else [{'SerialNumber': f'arn:aws:iam::{ACCOUNT_ID}:mfa/user-{u}'}],
+            'inline_policies': {f'user-policy-{u}': {'name': f'user-policy-{u}',
+                                                     'PolicyDocument': generate_aws_policy_document(u)}}
+            if u % 4 == 0 else {},
+            'inline_policies_count': 1 if u % 4 == 0 else 0
+        }
+        if u % 2:
+            users[user_id]['LoginProfile'] = {'UserName': f'user-{u}', 'CreateDate': OLD_DATE}
+
+    groups = {}
+    for g in range(counts['groups']):
+        group_id = f'AGPA{g:016X}'
+        groups[group_id] = {
+            'id': group_id, 'name': f'group-{g}', 'arn': f'arn:aws:iam::{ACCOUNT_ID}:group/group-{g}',
+            'users': [], 'inline_policies': {}, 'inline_policies_count': 0
+        }
+    group_ids = list(groups)
+    for u, user_id in enumerate(users):
+        if u % 3:
+            groups[group_ids[u % len(group_ids)]]['users'].append(user_id)
+
+    roles = {}
+    for r in range(counts['roles']):
+        role_id = f'AROA{r:016X}'
+        principal = {'Service': 'ec2.amazonaws.com'} if r % 2 else {'AWS': 'arn:aws:iam::999999999999:root'}
+        roles[role_id] = {
+            'id': role_id, 'name': f'role-{r}', 'arn': f'arn:aws:iam::{ACCOUNT_ID}:role/role-{r}', 'path': '/',
+            'description': None, 'create_date': OLD_DATE, 'max_session_duration': 3600,
+            'instance_profiles': {f'AIPA{r:016X}': {'arn': f'arn:aws:iam::{ACCOUNT_ID}:instance-profile/role-{r}',
+                                                    'name': f'role-{r}'}} if r % 2 else {},
+            'instances_count': 0,
+            'inline_policies': {f'role-policy-{r}': {'name': f'role-policy-{r}',
+                                                     'PolicyDocument': generate_aws_policy_document(r)}}
+            if r % 3 == 0 else {},
+            'inline_policies_count': 1 if r % 3 == 0 else 0,
+            'assume_role_policy': {'PolicyDocument': {'Version': '2012-10-17', 'Statement': [
+                {'Effect': 'Allow', 'Principal': principal, 'Action': 'sts:AssumeRole'}]}}
+        }
+
+    policies = {}
+    entities = [('users', user['name']) for user in users.values()] + \
+               [('roles', role['name']) for role in roles.values()]
+    for p in range(counts['policies']):
+        policy_id = f'ANPA{p:016X}'
+        attached_to = {}
+        if p < ATTACHED_POLICIES:
+            entity_type, entity_name = entities[p % len(entities)]
+            attached_to[entity_type] = [{'name': entity_name}]
+        policies[policy_id] = {
+            'id': policy_id, 'name': f'policy-{p}', 'arn': f'arn:aws:iam::{ACCOUNT_ID}:policy/policy-{p}',
+            'PolicyDocument': generate_aws_policy_document(p, statements=3), 'attached_to': attached_to
+        }
+
+    iam = IAM(None)
+    iam.update({
+        'users': users, 'users_count': len(users), 'groups': groups, 'groups_count': len(groups),
+        'roles': roles, 'roles_count': len(roles), 'policies': policies, 'policies_count': len(policies),
+        'credential_reports': {
+            name: {'id': name, 'name': name, 'password_enabled': u % 2 == 1,
+                   'password_last_used': OLD_DATE if u % 2 else None, 'mfa_active': u % 2 == 0,
+                   'access_key_1_active': True, 'access_key_1_last_used_date': OLD_DATE,
+                   'access_key_2_active': False, 'access_key_2_last_used_date': None,
+                   'cert_1_active': False, 'cert_2_active': False, 'partition': 'aws'}
+            for u, name in enumerate(['<root_account>'] + [user['name'] for user in users.values()])},
+        'password_policy': {'MinimumPasswordLength': 8, 'RequireUppercaseCharacters': False,
+                            'RequireLowercaseCharacters': True, 'RequireSymbols': False, 'RequireNumbers': True,
+                            'PasswordReusePrevention': False, 'ExpirePasswords': False},
+        'password_policy_count': 0
+    })
+    asyncio.run(iam.finalize())
+    return dict(iam)
+
+
+def add_counts(service, resource_types):
+    """
+    Add the counts set by the composite resources to the regions and the service
+    """
+    for resource_type in resource_types:
+        for region in service['regions'].values():
+            region[f'{resource_type}_count'] = sum(vpc[f'{resource_type}_count'] for vpc in region['vpcs'].values())
+        service[f'{resource_type}_count'] = sum(region[f'{resource_type}_count']
+                                                for region in service['regions'].values())
+
+
+def generate_generic_services(provider_code, resources, scopes, children):
+    """
+    Generate a resource tree holding the attributes tested by the provider's default ruleset, every other item of a
+    resource type passing the tests
+    """
+    ruleset = Ruleset(cloud_provider=provider_code, filename='default.json', account_id=ACCOUNT_ID)
+    schema = new_node()
+    targets = []
+    for rules in ruleset.rules.values():
+        for rule in rules:
+            path = rule.path.split('.')
+            target = add_path(schema, path)
+            targets.append(target)
+            for condition_path, test, value in iter_conditions(rule.conditions):
+                # Paths without a dot are relative to the rule's path
+                if '.' not in condition_path and condition_path != 'this':
+                    add_path(target, [condition_path])['tests'].append((test, value))
+                elif condition_path.split('.')[0] == path[0]:
+                    add_path(schema, condition_path.split('.'))['tests'].append((test, value))
+    for target in targets:
+        target['target'] = True
+
+    # Top-level resources get the budget left by the scopes (projects, subscriptions, regions...) above them
+    multiplicities = []
+    count_top_level_targets(schema, scopes, 1, multiplicities)
+    fan_outs = {'scopes': scopes, 'children': children,
+                'resources': max(1, resources // max(1, sum(multiplicities)))}
+    return build_node(schema, None, 0, fan_outs, False)
+
+
+def new_node():
+    return {'children': {}, 'tests': [], 'target': False}
+
+
+def add_path(node, path):
+    for attribute in path:
+        # Conditions on the resource itself end with a dot
+        if attribute:
+            node = node['children'].setdefault(attribute, new_node())
+    return node
+
+
+def iter_conditions(conditions):
+    if len(conditions) == 3 and isinstance(conditions[0], str) and conditions[0] not in ['and', 'or'] and \
+            isinstance(conditions[1], str):
+        yield conditions
+        return
+    for condition in conditions:
+        if isinstance(condition, list):
+            yield from iter_conditions(condition)
+
+
+def has_target(node):
+    return node['target'] or any(has_target(child) for child in node['children'].values())
+
+
+def count_top_level_targets(node, scopes, multiplicity, multiplicities):
+    for name, child in node['children'].items():
+        if name == 'id' and child['target']:
+            multiplicities.append(multiplicity)
+        elif name == 'id' and has_target(child):
+            count_top_level_targets(child, scopes, multiplicity * scopes, multiplicities)
+        elif name != 'id':
+            count_top_level_targets(child, scopes, multiplicity, multiplicities)
+
+
+def build_node(node, name, index, fan_outs, in_resource):
+    children = node['children']
+    if 'id' in children:
+        child = children['id']
+        if in_resource or not has_target(child):
+            count = fan_outs['children']
+        elif child['target']:
+            count = fan_outs['resources']
+        else:
+            count = fan_outs['scopes']
+        return {f'{name}-{i}': build_node(child, f'{name}-{i}', i, fan_outs, in_resource or child['target'])
+                for i in range(count)}
+    if children or node['target']:
+        value = {child_name: build_node(child, child_name, index, fan_outs, in_resource)
+                 for child_name, child in children.items()}
+        for test, key in node['tests']:
+            if test in ['withKey', 'withoutKey'] and (test == 'withKey') == (index % 2 == 0):
+                value.setdefault(key, 'value')
+        return value
+    return leaf_value(node['tests'], index % 2 == 0)
+
+
+def leaf_value(tests, passing):
+    """
+    :param tests:                       (test, value) of the conditions on the attribute
+    :param passing:                     Whether the value should pass the first test
+    :return:                            The attribute's value
+    """
+    if not tests:
+        return 'value'
+    test, value = tests[0]
+    first = value[0] if isinstance(value, list) and value else value
+    if test in ['true', 'notTrue', 'false']:
+        return passing == (test == 'true')
+    if test in ['null', 'notNull']:
+        return None if passing == (test == 'null') else 'value'
+    if test in ['empty', 'notEmpty']:
+        return [] if passing == (test == 'empty') else ['value']
+    if test in ['equal', 'notEqual']:
+        if passing == (test == 'equal'):
+            return first
+        return int(first) + 1 if str(first).isdigit() else f'not-{first}'
+    if test in ['lessThan', 'lessOrEqual', 'moreThan', 'moreOrEqual']:
+        try:
+            threshold = int(first)
+        except (TypeError, ValueError):
+            threshold = 0
+        return threshold - 1 if passing == (test in ['lessThan', 'lessOrEqual']) else threshold + 1
+    if test in ['withKey', 'withoutKey']:
+        return {first: 'value'} if passing == (test == 'withKey') else {}
+    if test in ['containString', 'notContainString']:
+        return f'-{first}-' if passing == (test == 'containString') else 'value'
+    if test in ['containAtLeastOneOf', 'containNoneOf']:
+        return [first] if passing == (test == 'containAtLeastOneOf') else ['value']
+    if test == 'containAtLeastOneDifferentFrom':
+        return ['value'] if passing else list(value) if isinstance(value, list) else [value]
+    if test in ['olderThan', 'newerThan', 'priorToDate']:
+        return OLD_DATE if passing == (test != 'newerThan') else NEW_DATE
+    if test in ['isSubnetRange', 'isPublicSubnet', 'isPrivateSubnet', 'inSubnets', 'notInSubnets']:
+        return '0.0.0.0/0' if passing == (test in ['isSubnetRange', 'isPublicSubnet', 'notInSubnets']) \
+            else '10.0.0.1/32'
+    if test == 'portsInPortList':
+        return [str(first)] if passing else ['1']
+    return 'value'
+
+
+def get_provider(provider_code, services):
+    """
+    Build a provider holding the generated results, without credentials nor facades
+    """
+    cls = AWSProvider if provider_code == 'aws' else BaseProvider
+    provider = cls.__new__(cls)
+    provider.metadata_path = os.path.join(PROVIDERS_PATH, provider_code, 'metadata.json')
+    provider.provider_code = provider_code
+    provider.provider_name = provider_code
+    provider.profile = None
+    provider.environment = 'benchmark'
+    provider.result_format = 'json'
+    provider.account_id = ACCOUNT_ID
+    provider.partition = 'aws'
+    provider.sg_map = {}
+    provider.subnet_map = {}
+    provider.last_run = None
+    provider._load_metadata()
+    provider.services = services
+    provider.service_list = list(services)
+    return provider
+
+
+def count_resources(services):
+    return sum(value for service in services.values() if isinstance(service, dict)
+               for key, value in service.items() if key.endswith('_count') and isinstance(value, int))
+
+
+def get_peak_rss():
+    """
+    :return:                            Peak resident set size of the process, in MiB
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def measure(results, stage, function):
+    errors = len(ERRORS_LIST)
+    start = time.perf_counter()
+    try:
+        function()
+        error = None
+    except Exception as e:
+        error = f'{type(e).__name__}: {e}'
+    results['stages'][stage] = {'time': time.perf_counter() - start, 'peak_rss_mib': get_peak_rss(),
+                                'logged_errors': len(ERRORS_LIST) - errors}
+    if error:
+        results['stages'][stage]['error'] = error
+    print(f'{stage:<20} {results["stages"][stage]["time"]:>10.3f}s {get_peak_rss():>10.1f} MiB peak RSS '
+          f'{results["stages"][stage]["logged_errors"]:>8} logged errors{"  " + error if error else ""}')
+
+
+def run(args):
+    results = {'provider': args.provider, 'resources': args.resources, 'rule_workers': args.rule_workers,
+               'stages': {}}
+    services = {}
+
+    def generate():
+        if args.provider == 'aws':
+            services.update(generate_aws_services(args.resources, args.regions, args.vpcs, args.sg_rules))
+        else:
+            services.update(generate_generic_services(args.provider, args.resources, args.scopes, args.children))
+    measure(results, 'generate', generate)
+    provider = get_provider(args.provider, services)
+    if args.provider == 'aws':
+        results['generated_resources'] = count_resources(services)
+
+    def preprocessing():
+        # The provider-specific preprocessing of the other providers relies on the fetched shapes
+        if args.provider != 'aws':
+            return BaseProvider.preprocessing(provider)
+        callbacks = provider._process_metadata_callbacks
+
+        provider._process_metadata_callbacks = lambda: measure(results, 'metadata_callbacks', callbacks)
+        try:
+            provider.preprocessing()
+        finally:
+            del provider._process_metadata_callbacks
+    measure(results, 'preprocessing', preprocessing)
+
+    def rules():
+        ruleset = Ruleset(cloud_provider=args.provider, environment_name=provider.environment,
+                          filename='default.json', account_id=ACCOUNT_ID)
+        ProcessingEngine(ruleset, workers=args.rule_workers).run(provider)
+    measure(results, 'rules', rules)
+    findings = [finding for service in services.values() for finding in service.get('findings', {}).values()]
+    results['checked_items'] = sum(finding.get('checked_items', 0) for finding in findings)
+    results['flagged_items'] = sum(finding.get('flagged_items', 0) for finding in findings)
+    print(f'{len(findings)} findings, {results["checked_items"]} checked items, '
+          f'{results["flagged_items"]} flagged items')
+
+    serialized = {}
+
+    def serialization():
+        serialized['size'] = len(json.dumps(provider, separators=(',', ': '), cls=ScoutJsonEncoder))
+    measure(results, 'serialization', serialization)
+    results['serialized_bytes'] = serialized.get('size')
+
+    with tempfile.TemporaryDirectory() as report_dir:
+        def report():
+            ScoutReport(args.provider, 'benchmark', report_dir, timestamp=False).save(provider, {}, force_write=True)
+        measure(results, 'report', report)
+
+    results['peak_rss_mib'] = get_peak_rss()
+    return results
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Tool to benchmark the rule and preprocessing engines on synthetic '
+                                                 'results.')
+    parser.add_argument('--provider', choices=['aws', 'azure', 'gcp', 'kubernetes'], default='aws',
+                        help='Provider whose results are generated')
+    parser.add_argument('--resources', type=int, default=1000, help='Approximate number of generated resources')
+    parser.add_argument('--rule-workers', type=int, default=1, help='Number of processes running the rules')
+    parser.add_argument('--regions', type=int, default=4, help='Number of AWS regions')
+    parser.add_argument('--vpcs', type=int, default=2, help='Number of VPCs per AWS region')
+    parser.add_argument('--sg-rules', type=int, default=10, help='Number of ingress rules per AWS security group')
+    parser.add_argument('--scopes', type=int, default=3,
+                        help='Number of scopes (projects, subscriptions, regions...) at each level for other '
+                             'providers')
+    parser.add_argument('--children', type=int, default=4,
+                        help='Number of items in the lists nested in resources for other providers')
+    parser.add_argument('--output', help='Path of a JSON file where the results are saved')
+    parser.add_argument('--debug', action='store_true', help='Print the messages logged by the engines')
+    args = parser.parse_args()
+
+    # The synthetic results do not hold every attribute tested by the rules, only count the errors by default
+    set_logger_configuration(is_debug=args.debug)
+    logger.disabled = not args.debug
+    results = run(args)
+    if args.output:
+        with open(args.output, 'wt') as f:
+            json.dump(results, f, indent=4)
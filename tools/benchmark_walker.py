@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+import argparse
+import copy
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.realpath(__file__)), '..'))
+
+from ScoutSuite.core.utils import walk  # noqa: E402
+
+
+def generate_services(regions, vpcs, security_groups, rules):
+    """
+    Generate an EC2-shaped resource tree with regions * vpcs * security_groups * rules leaves.
+    """
+    services = {'ec2': {'regions': {}}}
+    for r in range(regions):
+        region = services['ec2']['regions'][f'region-{r}'] = {'vpcs': {}}
+        for v in range(vpcs):
+            vpc = region['vpcs'][f'vpc-{v}'] = {'security_groups': {}}
+            for s in range(security_groups):
+                vpc['security_groups'][f'sg-{s}'] = {
+                    'name': f'sg-{s}',
+                    'rules': [{'IpProtocol': 'tcp', 'FromPort': i, 'ToPort': i} for i in range(rules)]
+                }
+    return services
+
+
+def copying_walk(current_info, target_path, current_path):
+    """
+    Reference walk copying the paths at every level, as the processing engine used to.
+    """
+    if len(target_path) == 0:
+        yield current_path, current_info
+        return
+    target_path = copy.deepcopy(target_path)
+    current_path = copy.deepcopy(current_path)
+    attribute = target_path.pop(0)
+    if type(current_info) == dict:
+        if attribute in current_info:
+            split_path = copy.deepcopy(current_path)
+            split_path.append(attribute)
+            yield from copying_walk(current_info[attribute], target_path, split_path)
+        elif attribute == 'id':
+            for key in current_info:
+                split_current_path = copy.deepcopy(current_path)
+                split_current_path.append(key)
+                yield from copying_walk(current_info[key], copy.deepcopy(target_path), split_current_path)
+    elif type(current_info) == list:
+        for index, split_current_info in enumerate(current_info):
+            split_current_path = copy.deepcopy(current_path)
+            split_current_path.append(str(index))
+            yield from copying_walk(split_current_info, copy.deepcopy(target_path), split_current_path)
+    elif isinstance(current_info, str):
+        yield current_path, current_info
+
+
+def measure(name, walker, services, target_path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    leaves = sum(1 for _ in walker(services, target_path, []))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f'{name:<10} {leaves:>10} leaves {elapsed:>10.3f}s {peak / 1024:>12.1f} KiB peak')
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Tool to compare the resource walkers of the processing engine.')
+    parser.add_argument('--regions', type=int, default=16, help='Number of regions')
+    parser.add_argument('--vpcs', type=int, default=8, help='Number of VPCs per region')
+    parser.add_argument('--security-groups', type=int, default=50, help='Number of security groups per VPC')
+    parser.add_argument('--rules', type=int, default=10, help='Number of rules per security group')
+    args = parser.parse_args()
+
+    services = generate_services(args.regions, args.vpcs, args.security_groups, args.rules)
+    path = 'ec2.regions.id.vpcs.id.security_groups.id.rules.id'.split('.')
+    measure('copying', copying_walk, services, path)
+    measure('walk', walk, services, path)